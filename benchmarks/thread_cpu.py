@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+"""
+Measures the CPU time that a _PyQtThread object takes to deliver frames
+at various frame rates. A producer thread stands in for the GenTL
+Producer and the worker stands in for the one that fetches the buffers:
+
+  fixed    Polls the frames and waits 1 us in between as the acquisition
+           threads used to do.
+  blocking Waits up to 1 ms for a frame as Harvester's worker does by
+           default.
+  waiting  Waits up to 50 ms for a frame as Harvester's worker does in
+           the GUI.
+  backoff  Polls the frames and backs off up to 20 ms while there are
+           none.
+
+    python benchmarks/thread_cpu.py --duration 5 --rates 0 10 100 1000
+"""
+
+# Standard library imports
+import argparse
+import queue
+import statistics
+import threading
+import time
+
+# Related third party imports
+from PyQt5.QtCore import QMutex
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.pyqt5.thread import _PyQtThread, \
+    report_activity
+
+
+# Name: (update_cycle_us, max_backoff_us, timeout_s of the worker):
+_modes = {
+    'fixed': (1, None, None),
+    'blocking': (0, None, 0.001),
+    'waiting': (0, None, 0.05),
+    'backoff': (0, 20000, None),
+}
+
+
+def _produce(frames, rate, stop_event):
+    if rate <= 0:
+        stop_event.wait()
+        return
+    interval = 1. / rate
+    next_time = time.perf_counter()
+    while not stop_event.is_set():
+        next_time += interval
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            stop_event.wait(delay)
+        frames.put(time.perf_counter())
+
+
+def run(mode, rate, duration_s):
+    """
+    Returns (CPU usage in %, delivered frames per second, median delay of
+    the frames in ms).
+    """
+    update_cycle_us, max_backoff_us, timeout_s = _modes[mode]
+    frames = queue.Queue()
+    delays = []
+
+    def worker():
+        try:
+            if timeout_s is None:
+                produced = frames.get_nowait()
+            else:
+                produced = frames.get(timeout=timeout_s)
+        except queue.Empty:
+            return
+        delays.append(time.perf_counter() - produced)
+        report_activity()
+
+    #
+    thread = _PyQtThread(
+        mutex=QMutex(), worker=worker, update_cycle_us=update_cycle_us,
+        max_backoff_us=max_backoff_us
+    )
+    stop_event = threading.Event()
+    producer = threading.Thread(
+        target=_produce, args=(frames, rate, stop_event), daemon=True
+    )
+
+    # The producer takes next to no CPU time so it's counted in:
+    cpu_time = time.process_time()
+    started = time.perf_counter()
+    thread.start()
+    producer.start()
+    time.sleep(duration_s)
+    stop_event.set()
+    thread.stop()
+    producer.join()
+    elapsed = time.perf_counter() - started
+    cpu_time = time.process_time() - cpu_time
+
+    #
+    delay_ms = statistics.median(delays) * 1e3 if delays else float('nan')
+    return 100. * cpu_time / elapsed, len(delays) / elapsed, delay_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Measures the CPU usage of the acquisition threads.'
+    )
+    parser.add_argument(
+        '--duration', type=float, default=5.,
+        help='Seconds to run every combination'
+    )
+    parser.add_argument(
+        '--rates', type=float, nargs='+', default=[0., 10., 100., 1000.],
+        help='Frame rates to deliver; 0 means idle'
+    )
+    parser.add_argument(
+        '--modes', nargs='+', default=list(_modes), choices=list(_modes)
+    )
+    args = parser.parse_args(argv)
+
+    #
+    print('{0:>9} {1:>9} {2:>7} {3:>9} {4:>10}'.format(
+        'mode', 'rate', 'CPU %', 'fps', 'delay ms'
+    ))
+    for rate in args.rates:
+        for mode in args.modes:
+            cpu, fps, delay_ms = run(mode, rate, args.duration)
+            print('{0:>9} {1:>9.0f} {2:>7.1f} {3:>9.1f} {4:>10.3f}'.format(
+                mode, rate, cpu, fps, delay_ms
+            ))
+
+
+if __name__ == '__main__':
+    main()
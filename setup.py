@@ -75,6 +75,13 @@ setuptools.setup(
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ),
+    # The commands that are installed with the package:
+    entry_points={
+        'console_scripts': [
+            'harvesters-export = '
+            'harvesters_gui._private.frontend.export:main',
+        ],
+    },
     # A short, on-sentence summary of the package:
     description=description,
     # Location where the package may be downloaded:
@@ -27,13 +27,24 @@ import numpy as np
 from vispy import gloo
 from vispy import app
 from vispy.gloo import Program
-from vispy.util.transforms import ortho
+from vispy.util.transforms import ortho, perspective, rotate, translate
 
 from genicam.gentl import PAYLOADTYPE_INFO_IDS
-from genicam.gentl import TimeoutException
 
 # Local application/library specific imports
 from harvesters._private.core.helper.system import is_running_on_macos
+from harvesters_gui._private.frontend.color import get_bayer_pattern, \
+    get_planar_bits_per_pixel, is_color_format
+from harvesters_gui._private.frontend.colormap import make_lut
+from harvesters_gui._private.frontend.depth import compute_auto_range, \
+    get_texture_formats, is_float_format, is_point_cloud_format, \
+    reshape_float_image, reshape_point_cloud
+from harvesters_gui._private.frontend.jpeg import get_compressed_data, \
+    JpegDecoder
+from harvesters_gui._private.frontend.polarization import \
+    get_polarization_layout, get_polarized_bits_per_pixel, \
+    layout_angles, layout_mosaic, polarization_views
+from harvesters_gui._private.frontend.recording import get_timestamp_ns
 from harvesters.util.pfnc import is_custom, get_bits_per_pixel, \
     bgr_formats
 from harvesters.util.pfnc import mono_location_formats, \
@@ -42,7 +53,27 @@ from harvesters.util.pfnc import mono_location_formats, \
     bayer_location_formats
 
 
+# Each orientation maps a position on the displayed image to the texture
+# coordinate system as (s, t) = M (u, v, 1) where (u, v) is normalized and
+# starts from the top left corner; swapping the axes swaps the width and
+# the height of the displayed image:
+orientations = {
+    'Normal': ((1, 0, 0), (0, 1, 0)),
+    'Rotate 90': ((0, 1, 0), (-1, 0, 1)),
+    'Rotate 180': ((-1, 0, 1), (0, -1, 1)),
+    'Rotate 270': ((0, -1, 1), (1, 0, 0)),
+    'Flip Horizontal': ((-1, 0, 1), (0, 1, 0)),
+    'Flip Vertical': ((1, 0, 0), (0, -1, 1)),
+    'Transpose': ((0, 1, 0), (1, 0, 0)),
+    'Transverse': ((0, -1, 1), (-1, 0, 1)),
+}
+
+
 class CanvasBase(app.Canvas):
+    # The payloads that are decoded on other threads before they're
+    # uploaded:
+    _compressed_payloads = []
+
     def __init__(
             self, *,
             image_acquirer=None,
@@ -71,9 +102,19 @@ class CanvasBase(app.Canvas):
         self._has_filled_texture = False
         self._width, self._height = width, height
 
+        # The factors to stretch the image with; it's used to keep the
+        # displayed size while the device reduces the resolution:
+        self._display_scale = (1., 1.)
+
         #
         self._is_dragging = False
 
+        # If it's not None, the canvas is waiting for the user to drag a
+        # rectangle; the handler is called with the rectangle in the image
+        # coordinate system once the mouse button is released:
+        self._selection_handler = None
+        self._selection = None
+
         # If it's True, the canvas keeps image acquisition but do not
         # draw images on the canvas:
         self._pause_drawing = False
@@ -90,6 +131,38 @@ class CanvasBase(app.Canvas):
         #
         self._buffers = []
 
+        # The content of the latest buffer before it's converted for the
+        # texture; it's valid while the buffer is kept in self._buffers:
+        self._latest_content = None
+        self._latest_data_format = None
+
+        #
+        self._latency_monitor = None
+
+    @property
+    def latency_monitor(self):
+        return self._latency_monitor
+
+    @latency_monitor.setter
+    def latency_monitor(self, monitor):
+        """
+        Lets the monitor know when a frame has been uploaded and when it's
+        on the screen; the native widget must have been created. Setting
+        None stops measuring, which saves flushing the commands on every
+        frame.
+        """
+        previous, self._latency_monitor = self._latency_monitor, monitor
+        if previous is monitor:
+            return
+
+        # A QOpenGLWidget tells when it has swapped the buffers:
+        frame_swapped = getattr(self.native, 'frameSwapped', None)
+        if frame_swapped:
+            if previous:
+                frame_swapped.disconnect(previous.on_swapped)
+            if monitor:
+                frame_swapped.connect(monitor.on_swapped)
+
     @property
     def display_rate(self):
         return self._display_rate
@@ -100,6 +173,15 @@ class CanvasBase(app.Canvas):
         self._timer.stop()
         self._timer.start(interval=1./self._display_rate)
 
+    @property
+    def display_scale(self):
+        return self._display_scale
+
+    @display_scale.setter
+    def display_scale(self, value):
+        self._display_scale = (float(value[0]), float(value[1]))
+        self.apply_magnification()
+
     def set_canvas_size(self, width, height):
         #
         self._has_filled_texture = False
@@ -132,43 +214,70 @@ class CanvasBase(app.Canvas):
         drew = False
         try:
             if not self._pause_drawing:
-                # Fetch a buffer.
-                buffer = self.ia.fetch(timeout=0.0001)
-
-                # Prepare a texture to draw:
-                self._prepare_texture(buffer)
-
-                # Draw the texture until the buffer object exists
-                # within this scope:
-                # (We keep the buffer until the next one is delivered to
-                # keep the current chunk data alive but it depends on the
-                # application; we just want to tell you that the texture
-                # must be overdrawn until the content is alive:)
-                self._draw()
-
-                # Release the buffers that we've kept holding so far:
-                self.release_buffers()
-
-                # We have drawn the latest image on the canvas:
-                drew = True
-
-                # Keep the buffer alive to keep the chunk data alive until
-                # the next one is delivered:
-                self._buffers.append(buffer)
+                # Take the latest buffer; nothing has been delivered since
+                # the last round if it's None:
+                buffer = self.ia.try_fetch(timeout=0.0001)
+                if buffer:
+                    # Prepare a texture to draw; the buffer must be queued
+                    # again if it can't be kept:
+                    try:
+                        self._prepare_texture(buffer)
+                    except Exception:  # We know it's too broad:
+                        buffer.queue()
+                        raise
+
+                    # The texture is uploaded once the commands have been
+                    # flushed; a compressed image is uploaded once it has
+                    # been decoded, see _upload_decoded_image:
+                    if self._latency_monitor and buffer.payload_type not in \
+                            self._compressed_payloads:
+                        self.context.flush_commands()
+                        self._latency_monitor.on_uploaded(buffer)
+
+                    # Draw the texture until the buffer object exists
+                    # within this scope:
+                    # (We keep the buffer until the next one is delivered
+                    # to keep the current chunk data alive but it depends
+                    # on the application; we just want to tell you that
+                    # the texture must be overdrawn until the content is
+                    # alive:)
+                    self._draw()
+
+                    # Release the buffers that we've kept holding so far:
+                    self.release_buffers()
+
+                    # We have drawn the latest image on the canvas:
+                    drew = True
+
+                    # Keep the buffer alive to keep the chunk data alive
+                    # until the next one is delivered:
+                    self._buffers.append(buffer)
 
         except AttributeError:
-            # Calling fetch_buffer() raises AttributeError because
+            # Calling try_fetch() raises AttributeError because
             # the ImageAcquirer object is None.
             pass
-        except TimeoutException:
-            # We have an ImageAcquirer object but nothing has
-            # been fetched, wait for the next round:
-            pass
 
         # Draw the latest texture again if needed:
         if not drew:
             self._draw()
 
+        # The buffers will be swapped right after this; it's as close as
+        # it gets if the native widget does not tell when it has swapped:
+        if self._latency_monitor and \
+                not hasattr(self.native, 'frameSwapped'):
+            self._latency_monitor.on_swapped()
+
+    def get_latest_content(self):
+        """
+        Returns the latest image and its pixel format. The image is a view
+        of the buffer that is being displayed so it must be copied if it's
+        used after the next frame is drawn.
+        """
+        if not self._buffers or self._latest_content is None:
+            return None, None
+        return self._latest_content, self._latest_data_format
+
     def release_buffers(self):
         for _buffer in self._buffers:
             if _buffer:
@@ -190,13 +299,51 @@ class CanvasBase(app.Canvas):
     def on_mouse_press(self, event):
         self._is_dragging = True
         self._origin = event.pos
+        if self.is_selecting():
+            self._selection = [event.pos, event.pos]
+            self._update_selection()
 
     def on_mouse_release(self, event):
         self._is_dragging = False
+        if self.is_selecting() and self._selection:
+            handler = self._selection_handler
+            rectangle = self._map_selection_to_image(
+                self._selection[0], event.pos
+            )
+            self.cancel_selection()
+            if rectangle:
+                handler(*rectangle)
 
     def on_mouse_move(self, event):
         raise NotImplementedError
 
+    def begin_selection(self, handler):
+        """
+        Lets the user drag a rectangle on the canvas instead of panning the
+        image. Once the mouse button is released, the handler is called as
+        handler(x, y, width, height) in the image coordinate system.
+        """
+        self._selection_handler = handler
+        self._selection = None
+
+    def cancel_selection(self):
+        self._selection_handler = None
+        self._selection = None
+        self._update_selection()
+
+    def is_selecting(self):
+        return True if self._selection_handler else False
+
+    @property
+    def selection_handler(self):
+        return self._selection_handler
+
+    def _update_selection(self):
+        pass
+
+    def _map_selection_to_image(self, start, end):
+        raise NotImplementedError
+
     def pause_drawing(self, pause=True):
         self._pause_drawing = pause
 
@@ -230,11 +377,15 @@ class CanvasBase(app.Canvas):
 
 
 class Canvas2D(CanvasBase):
+    _compressed_payloads = [
+        PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_JPEG,
+        PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_JPEG2000,
+    ]
     _visible_payloads = [
         PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_IMAGE,
         PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_CHUNK_DATA,
         PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_MULTI_PART,
-    ]
+    ] + _compressed_payloads
 
     def __init__(
             self, *,
@@ -277,9 +428,206 @@ class Canvas2D(CanvasBase):
         self._fragment_shader = """
             varying vec2 v_texcoord;
             uniform sampler2D texture;
+            uniform vec2 u_texture_size;
+
+            // The color of the top left pixel of every 2x2 cell;
+            // 0: Not a Bayer image, 1: RG, 2: GR, 3: GB, 4: BG:
+            uniform int u_bayer_pattern;
+
+            // The white balance gains and the color correction matrix;
+            // they are applied only to color images:
+            uniform bool u_is_color;
+            uniform vec3 u_gains;
+            uniform mat3 u_ccm;
+
+            // The lookup table that maps the intensity of a mono image
+            // to a false color:
+            uniform bool u_use_lut;
+            uniform sampler2D u_lut;
+
+            // Pixels that are at or beyond the thresholds are tinted:
+            uniform bool u_highlight_clipping;
+            uniform vec2 u_clipping_thresholds;
+            uniform vec3 u_low_color;
+            uniform vec3 u_high_color;
+
+            // The green and blue planes of a planar image; the red one
+            // is given as the texture:
+            uniform bool u_planar;
+            uniform sampler2D u_plane_g;
+            uniform sampler2D u_plane_b;
+
+            // A float image such as a depth map; the selector picks the
+            // component to display, which is mapped from the range to the
+            // depth colormap unless another colormap is selected:
+            uniform bool u_float;
+            uniform sampler2D u_float_texture;
+            uniform vec4 u_float_selector;
+            uniform vec2 u_float_range;
+            uniform sampler2D u_depth_lut;
+
+            // NaN is always masked; another value can be masked too:
+            uniform bool u_mask_invalid_value;
+            uniform float u_invalid_value;
+
+            // The layout of a polarized image; 0: Not polarized,
+            // 1: 2x2 mosaic, 2: four angles in every pixel:
+            uniform int u_polarization;
+
+            // 0: Raw, 1-4: 0, 45, 90 and 135 degrees, 5: Intensity,
+            // 6: DoLP, 7: AoLP:
+            uniform int u_polarization_view;
+
+            vec4 sample_cell(vec2 texcoord)
+            {
+                // Sample the four pixels of the 2x2 cell that the
+                // fragment belongs to; they are returned in the order of
+                // top left, top right, bottom left and bottom right:
+                vec2 texel = 1.0 / u_texture_size;
+                vec2 cell = floor(texcoord * u_texture_size / 2.0) * 2.0;
+                return vec4(
+                    texture2D(texture, (cell + vec2(0.5, 0.5)) * texel).r,
+                    texture2D(texture, (cell + vec2(1.5, 0.5)) * texel).r,
+                    texture2D(texture, (cell + vec2(0.5, 1.5)) * texel).r,
+                    texture2D(texture, (cell + vec2(1.5, 1.5)) * texel).r
+                );
+            }
+
+            vec3 demosaic(vec2 texcoord)
+            {
+                vec4 p = sample_cell(texcoord);
+                if (u_bayer_pattern == 1)
+                    return vec3(p.x, (p.y + p.z) / 2.0, p.w);
+                else if (u_bayer_pattern == 2)
+                    return vec3(p.y, (p.x + p.w) / 2.0, p.z);
+                else if (u_bayer_pattern == 3)
+                    return vec3(p.z, (p.x + p.w) / 2.0, p.y);
+                else
+                    return vec3(p.w, (p.y + p.z) / 2.0, p.x);
+            }
+
+            vec3 hue_to_rgb(float hue)
+            {
+                return clamp(
+                    abs(mod(hue * 6.0 + vec3(0.0, 4.0, 2.0), 6.0) - 3.0) - 1.0,
+                    0.0, 1.0
+                );
+            }
+
+            vec4 polarization(vec2 texcoord)
+            {
+                if (u_polarization == 1 && u_polarization_view == 0)
+                    return texture2D(texture, texcoord);
+
+                // Collect the intensities at 0, 45, 90 and 135 degrees;
+                // the mosaic has 90 and 45 on the top and 135 and 0 on
+                // the bottom as Sony's polarized sensors have:
+                vec4 i;
+                if (u_polarization == 1) {
+                    vec4 p = sample_cell(texcoord);
+                    i = vec4(p.w, p.y, p.x, p.z);
+                } else {
+                    i = texture2D(texture, texcoord);
+                }
+
+                // Pick one of the angles:
+                if (u_polarization_view >= 1 && u_polarization_view <= 4) {
+                    vec4 selector = vec4(equal(
+                        vec4(float(u_polarization_view)),
+                        vec4(1.0, 2.0, 3.0, 4.0)
+                    ));
+                    return vec4(vec3(dot(i, selector)), 1.0);
+                }
+
+                // Compute the linear Stokes parameters:
+                float s0 = (i.x + i.y + i.z + i.w) / 2.0;
+                float s1 = i.x - i.z;
+                float s2 = i.y - i.w;
+                if (u_polarization_view == 6) {
+                    float dolp = s0 > 0.0 ? sqrt(s1 * s1 + s2 * s2) / s0 : 0.0;
+                    return vec4(vec3(clamp(dolp, 0.0, 1.0)), 1.0);
+                } else if (u_polarization_view == 7) {
+                    // The angle is cyclic so it's mapped to the hue:
+                    float aolp = 0.5 * atan(s2, s1);
+                    return vec4(hue_to_rgb(aolp / 3.14159265 + 0.5), 1.0);
+                } else {
+                    return vec4(vec3(s0 / 2.0), 1.0);
+                }
+            }
+
             void main()
             {
-                gl_FragColor = texture2D(texture, v_texcoord);
+                vec4 color;
+                bool is_invalid = false;
+                if (u_float) {
+                    float value = dot(
+                        texture2D(u_float_texture, v_texcoord), u_float_selector
+                    );
+                    // NaN is neither less than, greater than nor equal
+                    // to anything:
+                    is_invalid = !(value < 0.0 || value > 0.0 || value == 0.0) ||
+                        (u_mask_invalid_value && value == u_invalid_value);
+                    value = (value - u_float_range.x) /
+                        (u_float_range.y - u_float_range.x);
+                    color = vec4(vec3(clamp(value, 0.0, 1.0)), 1.0);
+                } else if (u_polarization > 0)
+                    color = polarization(v_texcoord);
+                else if (u_bayer_pattern > 0)
+                    color = vec4(demosaic(v_texcoord), 1.0);
+                else if (u_planar)
+                    color = vec4(
+                        texture2D(texture, v_texcoord).r,
+                        texture2D(u_plane_g, v_texcoord).r,
+                        texture2D(u_plane_b, v_texcoord).r,
+                        1.0
+                    );
+                else
+                    color = texture2D(texture, v_texcoord);
+                bool is_aolp = u_polarization > 0 && u_polarization_view == 7;
+
+                // Check the clipping before any correction so that it
+                // tells what the sensor delivered:
+                float high = max(color.r, max(color.g, color.b));
+                float low = u_is_color ? min(color.r, min(color.g, color.b)) : high;
+
+                if (u_is_color) {
+                    // The matrix is uploaded in the row-major order so
+                    // GLSL sees its transpose; multiply it from the left:
+                    color.rgb = clamp((color.rgb * u_gains) * u_ccm, 0.0, 1.0);
+                } else if (u_use_lut && !is_aolp) {
+                    color.rgb = texture2D(u_lut, vec2(color.r, 0.5)).rgb;
+                } else if (u_float) {
+                    color.rgb = texture2D(u_depth_lut, vec2(color.r, 0.5)).rgb;
+                }
+
+                if (u_highlight_clipping) {
+                    if (high >= u_clipping_thresholds.y)
+                        color.rgb = mix(color.rgb, u_high_color, 0.75);
+                    else if (low <= u_clipping_thresholds.x)
+                        color.rgb = mix(color.rgb, u_low_color, 0.75);
+                }
+
+                if (is_invalid)
+                    color = vec4(0.0, 0.0, 0.0, 1.0);
+                gl_FragColor = color;
+            }
+        """
+
+        # The rubber band that is drawn while selecting a region:
+        self._selection_vertex_shader = """
+            uniform mat4 u_projection;
+            attribute vec2 a_position;
+            void main (void)
+            {
+                gl_Position = u_projection * vec4(a_position, 0.0, 1.0);
+            }
+        """
+
+        self._selection_fragment_shader = """
+            uniform vec4 u_color;
+            void main()
+            {
+                gl_FragColor = u_color;
             }
         """
 
@@ -290,11 +638,19 @@ class Canvas2D(CanvasBase):
         self._translate = 0.
         self._latest_translate = self._translate
         self._magnification = 1.
+        self._image_origin = (0, 0)
+        self._image_size = (self._width, self._height)
+        self._orientation = 'Normal'
 
         # Apply shaders.
         self._program = Program(
             self._vertex_shader, self._fragment_shader, count=4
         )
+        self._program_selection = Program(
+            self._selection_vertex_shader, self._selection_fragment_shader,
+            count=4
+        )
+        self._program_selection['u_color'] = (1., 1., 0., 1.)
 
         #
         self._data = np.zeros(
@@ -305,9 +661,7 @@ class Canvas2D(CanvasBase):
         )
 
         #
-        self._data['a_texcoord'] = np.array(
-            [[0., 1.], [1., 1.], [0., 0.], [1., 0.]]
-        )
+        self._apply_orientation()
 
         #
         self._program['u_model'] = np.eye(4, dtype=np.float32)
@@ -321,11 +675,273 @@ class Canvas2D(CanvasBase):
         self._program['texture'] = np.zeros(
             (self._height, self._width), dtype='uint8'
         )
+        self._program['u_texture_size'] = (self._width, self._height)
+        self._program['u_bayer_pattern'] = 0
+        self._program['u_is_color'] = False
+        self._program['u_planar'] = False
+        self._program['u_plane_g'] = np.zeros((1, 1), dtype='uint8')
+        self._program['u_plane_b'] = np.zeros((1, 1), dtype='uint8')
+
+        #
+        self._white_balance_gains = (1., 1., 1.)
+        self._color_correction_matrix = np.eye(3, dtype=np.float32)
+        self._program['u_gains'] = self._white_balance_gains
+        self._program['u_ccm'] = self._color_correction_matrix
+
+        #
+        self._colormap = None
+        self._program['u_use_lut'] = False
+        self._program['u_lut'] = gloo.Texture2D(
+            make_lut('Gray'), interpolation='linear'
+        )
+
+        # The thresholds are given in the normalized range; they hit 0 and
+        # 255 of the 8 bit texture:
+        self._highlight_clipping = False
+        self._clipping_thresholds = (.5 / 255., 254.5 / 255.)
+        self._program['u_highlight_clipping'] = False
+        self._program['u_clipping_thresholds'] = self._clipping_thresholds
+        self._program['u_low_color'] = (0., 0., 1.)
+        self._program['u_high_color'] = (1., 0., 0.)
+
+        #
+        self._polarization_view = polarization_views[0]
+        self._program['u_polarization'] = 0
+        self._program['u_polarization_view'] = 0
+
+        # Custom pixel formats are identified by the names that the device
+        # gives them; the value is the key:
+        self._custom_data_formats = {}
+
+        # The float texture is created when the first float image arrives
+        # because its format depends on the number of components:
+        self._float_texture = None
+        self._float_range = None
+        self._auto_float_range = (0., 1.)
+        self._invalid_value = None
+        self._program['u_float'] = False
+        self._program['u_float_texture'] = gloo.Texture2D(
+            np.zeros((1, 1), dtype=np.float32), internalformat='r32f'
+        )
+        self._program['u_float_selector'] = (1., 0., 0., 0.)
+        self._program['u_float_range'] = self._auto_float_range
+        self._program['u_depth_lut'] = gloo.Texture2D(
+            make_lut('Viridis'), interpolation='linear'
+        )
+        self._program['u_mask_invalid_value'] = False
+        self._program['u_invalid_value'] = 0.
+
+        # Compressed images are decoded on other threads; the decoder is
+        # created when the first one arrives:
+        self._decoder = None
 
         #
         self.apply_magnification()
 
+    @property
+    def white_balance_gains(self):
+        return self._white_balance_gains
+
+    @white_balance_gains.setter
+    def white_balance_gains(self, value):
+        self._white_balance_gains = tuple(float(v) for v in value)
+        self._program['u_gains'] = self._white_balance_gains
+
+    @property
+    def color_correction_matrix(self):
+        return self._color_correction_matrix
+
+    @color_correction_matrix.setter
+    def color_correction_matrix(self, value):
+        # A 3x3 matrix that is applied to every white balanced RGB pixel as
+        # a column vector; None disables color correction:
+        if value is None:
+            value = np.eye(3)
+        self._color_correction_matrix = np.array(
+            value, dtype=np.float32
+        ).reshape(3, 3)
+        self._program['u_ccm'] = self._color_correction_matrix
+
+    @property
+    def orientation(self):
+        return self._orientation
+
+    @orientation.setter
+    def orientation(self, value):
+        # One of the names in orientations; it just rearranges the texture
+        # coordinates so it does not cost anything per frame:
+        self._orientation = value
+        self._apply_orientation()
+        self.apply_magnification()
+
+    def _is_transposed(self):
+        return orientations[self._orientation][0][1] != 0
+
+    def _map_to_texture(self, u, v):
+        (a, b, c), (d, e, f) = orientations[self._orientation]
+        return a * u + b * v + c, d * u + e * v + f
+
+    def _apply_orientation(self):
+        # The vertices are placed in the order of bottom left, bottom
+        # right, top left and top right:
+        self._data['a_texcoord'] = np.array([
+            self._map_to_texture(u, v)
+            for u, v in [(0, 1), (1, 1), (0, 0), (1, 0)]
+        ])
+
+    @property
+    def polarization_view(self):
+        return self._polarization_view
+
+    @polarization_view.setter
+    def polarization_view(self, value):
+        # One of the names in polarization_views; it's applied only to
+        # polarized images:
+        self._polarization_view = value
+        self._program['u_polarization_view'] = \
+            polarization_views.index(value)
+
+    @property
+    def custom_data_formats(self):
+        return self._custom_data_formats
+
+    @custom_data_formats.setter
+    def custom_data_formats(self, value):
+        self._custom_data_formats = value
+
+    @property
+    def float_range(self):
+        return self._float_range
+
+    @float_range.setter
+    def float_range(self, value):
+        # The (low, high) range of float images that is mapped to the
+        # colormap; None estimates it from every frame:
+        self._float_range = None if value is None else \
+            (float(value[0]), float(value[1]))
+        if self._float_range:
+            self._program['u_float_range'] = self._float_range
+
+    @property
+    def invalid_value(self):
+        return self._invalid_value
+
+    @invalid_value.setter
+    def invalid_value(self, value):
+        # A value that marks invalid pixels of float images such as 0 of
+        # a depth map; NaN is always taken as invalid:
+        self._invalid_value = value
+        self._program['u_mask_invalid_value'] = value is not None
+        if value is not None:
+            self._program['u_invalid_value'] = float(value)
+
+    def _upload_float_texture(self, content, index):
+        content = content.astype(np.float32, copy=False)
+        if self._float_texture is None or \
+                self._float_texture.shape[:content.ndim] != content.shape:
+            internalformat, texture_format = get_texture_formats(content)
+            self._float_texture = gloo.Texture2D(
+                content, internalformat=internalformat,
+                format=texture_format
+            )
+            self._program['u_float_texture'] = self._float_texture
+        else:
+            self._float_texture.set_data(content)
+
+        #
+        self._program['u_float_selector'] = np.eye(4, dtype=np.float32)[index]
+        if self._float_range is None:
+            auto_range = compute_auto_range(
+                content, index, self._invalid_value
+            )
+            if auto_range:
+                self._auto_float_range = auto_range
+            self._program['u_float_range'] = self._auto_float_range
+
+    @property
+    def colormap(self):
+        return self._colormap
+
+    @colormap.setter
+    def colormap(self, value):
+        # A name in colormaps, an array of RGB colors or None to display
+        # mono images as they are:
+        self._colormap = value
+        if value is None:
+            self._program['u_use_lut'] = False
+        else:
+            self._program['u_lut'].set_data(make_lut(value))
+            self._program['u_use_lut'] = True
+
+    @property
+    def highlight_clipping(self):
+        return self._highlight_clipping
+
+    @highlight_clipping.setter
+    def highlight_clipping(self, value):
+        self._highlight_clipping = True if value else False
+        self._program['u_highlight_clipping'] = self._highlight_clipping
+
+    @property
+    def clipping_thresholds(self):
+        return self._clipping_thresholds
+
+    @clipping_thresholds.setter
+    def clipping_thresholds(self, value):
+        # (low, high) in the normalized range [0, 1]:
+        self._clipping_thresholds = (float(value[0]), float(value[1]))
+        self._program['u_clipping_thresholds'] = self._clipping_thresholds
+
+    @property
+    def decoder(self):
+        return self._decoder
+
+    def _submit_compressed_image(self, buffer):
+        if self._decoder is None:
+            self._decoder = JpegDecoder()
+
+        # Copy the compressed image because the buffer will be queued
+        # before it's decoded; it's much smaller than the decoded one. The
+        # timestamp tells the latency monitor which frame it is:
+        self._decoder.submit(
+            get_compressed_data(buffer), jpeg2000=buffer.payload_type ==
+            PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_JPEG2000,
+            tag=get_timestamp_ns(buffer)
+        )
+
+    def _upload_decoded_image(self):
+        content, timestamp_ns = self._decoder.take_tagged() \
+            if self._decoder else (None, None)
+        if content is None:
+            return
+
+        #
+        height, width = content.shape[:2]
+        self.set_canvas_size(width, height)
+        is_color = content.ndim == 3
+        self._latest_content = content
+        self._latest_data_format = 'RGB8' if is_color else 'Mono8'
+
+        #
+        self._program['texture'] = content
+        self._program['u_planar'] = False
+        self._program['u_float'] = False
+        self._program['u_texture_size'] = (width, height)
+        self._program['u_bayer_pattern'] = 0
+        self._program['u_is_color'] = is_color
+        self._program['u_polarization'] = 0
+
+        # The texture is uploaded once the commands have been flushed:
+        if self._latency_monitor and timestamp_ns:
+            self.context.flush_commands()
+            self._latency_monitor.on_frame_uploaded(timestamp_ns)
+
     def _prepare_texture(self, buffer):
+        if buffer and buffer.payload_type in self._compressed_payloads:
+            self._submit_compressed_image(buffer)
+            return
+
+        #
         update = True
         if buffer.payload_type not in self._visible_payloads:
             update = False
@@ -348,19 +964,50 @@ class Canvas2D(CanvasBase):
             #
             data_format_value = component.data_format_value
             if is_custom(data_format_value):
-                update = False
+                data_format = self._custom_data_formats.get(
+                    data_format_value
+                )
+                bpp = get_polarized_bits_per_pixel(data_format)
+            elif is_float_format(component.data_format):
+                # Float images are not scaled to 8 bits; the shader maps
+                # them from a range instead:
+                data_format = component.data_format
+                bpp = 8
             else:
                 data_format = component.data_format
-                bpp = get_bits_per_pixel(data_format)
-                if bpp is not None:
-                    exponent = bpp - 8
-                else:
-                    update = False
+                bpp = get_polarized_bits_per_pixel(data_format) or \
+                    get_planar_bits_per_pixel(data_format) or \
+                    get_bits_per_pixel(data_format)
+            if bpp is not None:
+                exponent = bpp - 8
+            else:
+                update = False
+
+            #
+            polarization = get_polarization_layout(data_format)
+            planar = get_planar_bits_per_pixel(data_format) is not None
+            is_float = is_float_format(data_format)
+            index = 0
 
             if update:
                 # Reshape the image so that it can be drawn on the
                 # VisPy canvas:
-                if data_format in mono_location_formats or \
+                if is_float:
+                    content, index = reshape_float_image(
+                        component.data, width, height, data_format
+                    )
+                elif polarization == layout_mosaic:
+                    # The shader splits the 2x2 cells:
+                    content = component.data.reshape(height, width)
+                elif polarization == layout_angles:
+                    # Every pixel carries four angles so VisPy takes it
+                    # as an RGBA image:
+                    content = component.data.reshape(height, width, 4)
+                elif planar:
+                    # Keep the planes as they are; interleaving them would
+                    # cost a copy of the whole image:
+                    content = component.data.reshape(3, height, width)
+                elif data_format in mono_location_formats or \
                         data_format in bayer_location_formats:
                     # Reshape the 1D NumPy array into a 2D so that VisPy
                     # can display it as a mono image:
@@ -386,6 +1033,11 @@ class Canvas2D(CanvasBase):
                     else:
                         return
 
+                #
+                self._latest_content = np.moveaxis(content, 0, -1) \
+                    if planar else content
+                self._latest_data_format = data_format
+
                 # Convert each data to an 8bit.
                 if exponent > 0:
                     # The following code may affect to the rendering
@@ -395,10 +1047,30 @@ class Canvas2D(CanvasBase):
                     # Then cast each array element to an uint8:
                     content = content.astype(np.uint8)
 
-                self._program['texture'] = content
+                if is_float:
+                    self._upload_float_texture(content, index)
+                elif planar:
+                    # Each plane is contiguous so it can be uploaded as is:
+                    self._program['texture'] = content[0]
+                    self._program['u_plane_g'] = content[1]
+                    self._program['u_plane_b'] = content[2]
+                else:
+                    self._program['texture'] = content
+                self._program['u_planar'] = planar
+                self._program['u_float'] = is_float
+                self._program['u_texture_size'] = (width, height)
+                self._program['u_bayer_pattern'] = get_bayer_pattern(
+                    data_format
+                )
+                self._program['u_is_color'] = is_color_format(data_format)
+                self._program['u_polarization'] = polarization
 
     def _draw(self):
+        # Pick up the image that has been decoded since the last frame:
+        self._upload_decoded_image()
         self._program.draw('triangle_strip')
+        if self._selection:
+            self._program_selection.draw('line_loop')
 
     def apply_magnification(self):
         #
@@ -407,17 +1079,24 @@ class Canvas2D(CanvasBase):
 
         #
         ratio = self._magnification
-        w, h = self._width, self._height
+        w = self._width * self._display_scale[0]
+        h = self._height * self._display_scale[1]
+        if self._is_transposed():
+            w, h = h, w
+        self._image_size = (w, h)
 
-        self._program['u_projection'] = ortho(
+        projection = ortho(
             self._coordinate[0],
             canvas_w * ratio + self._coordinate[0],
             self._coordinate[1],
             canvas_h * ratio + self._coordinate[1],
             -1, 1
         )
+        self._program['u_projection'] = projection
+        self._program_selection['u_projection'] = projection
 
         x, y = int((canvas_w * ratio - w) / 2), int((canvas_h * ratio - h) / 2)  # centering x & y
+        self._image_origin = (x, y)
 
         #
         self._data['a_position'] = np.array(
@@ -440,8 +1119,53 @@ class Canvas2D(CanvasBase):
             self.apply_magnification()
             self._latest_translate = self._translate
 
+    def _map_to_world(self, pos):
+        # Convert a position on the canvas, which is given in logical
+        # pixels from the top left corner, to the world coordinate system
+        # that the projection matrix defines:
+        canvas_w, canvas_h = self.physical_size
+        scale = canvas_w / self.size[0] if self.size[0] else 1.
+        ratio = self._magnification
+        return (
+            self._coordinate[0] + pos[0] * scale * ratio,
+            self._coordinate[1] + (canvas_h - pos[1] * scale) * ratio
+        )
+
+    def _map_to_image(self, pos):
+        # Normalize the position on the displayed image so that it starts
+        # from the top left corner and then undo the orientation:
+        x, y = self._map_to_world(pos)
+        w, h = self._image_size
+        u = (x - self._image_origin[0]) / w
+        v = (self._image_origin[1] + h - y) / h
+        s, t = self._map_to_texture(u, v)
+        return s * self._width, t * self._height
+
+    def _map_selection_to_image(self, start, end):
+        x0, y0 = self._map_to_image(start)
+        x1, y1 = self._map_to_image(end)
+        left = int(max(0, min(x0, x1)))
+        top = int(max(0, min(y0, y1)))
+        right = int(min(self._width, max(x0, x1)))
+        bottom = int(min(self._height, max(y0, y1)))
+        if right - left < 1 or bottom - top < 1:
+            return None
+        return left, top, right - left, bottom - top
+
+    def _update_selection(self):
+        if not self._selection:
+            return
+        x0, y0 = self._map_to_world(self._selection[0])
+        x1, y1 = self._map_to_world(self._selection[1])
+        self._program_selection['a_position'] = np.array(
+            [[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float32
+        )
+
     def on_mouse_move(self, event):
-        if self._is_dragging:
+        if self._is_dragging and self._selection:
+            self._selection[1] = event.pos
+            self._update_selection()
+        elif self._is_dragging:
             adjustment = 2. if is_running_on_macos() else 1.
             ratio = self._magnification * adjustment
             delta = event.pos - self._origin
@@ -449,3 +1173,228 @@ class Canvas2D(CanvasBase):
             self._coordinate[0] -= (delta[0] * ratio)
             self._coordinate[1] += (delta[1] * ratio)
             self.apply_magnification()
+
+
+class CanvasPointCloud(CanvasBase):
+    """
+    Renders Coord3D_ABC images as a point cloud. The image is decimated
+    so that the number of points does not exceed the point budget; it
+    keeps huge clouds interactive even on a software OpenGL stack.
+    """
+    _visible_payloads = [
+        PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_IMAGE,
+        PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_CHUNK_DATA,
+        PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_MULTI_PART,
+    ]
+
+    def __init__(
+            self, *,
+            image_acquirer=None,
+            width=640, height=480,
+            background_color='black',
+            vsync=True, display_rate=30.,
+            point_budget=250000
+    ):
+        #
+        super().__init__(
+            image_acquirer=image_acquirer,
+            width=width, height=height,
+            display_rate=display_rate,
+            background_color=background_color,
+            vsync=vsync
+        )
+
+        #
+        self._vertex_shader = """
+            uniform mat4 u_model;
+            uniform mat4 u_view;
+            uniform mat4 u_projection;
+            uniform vec2 u_depth_range;
+            uniform float u_point_size;
+
+            attribute vec3 a_position;
+
+            varying float v_depth;
+            varying float v_valid;
+
+            void main (void)
+            {
+                // Devices fill missing points with 0 or NaN; neither of
+                // them is less or greater than 0:
+                v_valid = (a_position.z < 0.0 || a_position.z > 0.0) ? 1.0 : 0.0;
+                v_depth = (a_position.z - u_depth_range.x) /
+                    (u_depth_range.y - u_depth_range.x);
+                gl_Position = u_projection * u_view * u_model * vec4(a_position, 1.0);
+                if (v_valid < 0.5)
+                    gl_Position = vec4(2.0, 2.0, 2.0, 1.0);
+                gl_PointSize = u_point_size;
+            }
+        """
+
+        self._fragment_shader = """
+            uniform sampler2D u_lut;
+
+            varying float v_depth;
+            varying float v_valid;
+
+            void main()
+            {
+                if (v_valid < 0.5)
+                    discard;
+                gl_FragColor = texture2D(u_lut, vec2(clamp(v_depth, 0.0, 1.0), 0.5));
+            }
+        """
+
+        #
+        self._point_budget = point_budget
+        self._points = None
+        self._vertex_buffer = None
+        self._decimated_shape = None
+
+        # The camera orbits around the center of the cloud:
+        self._azimuth = 0.
+        self._elevation = 0.
+        self._distance = 1.
+        self._center = np.zeros(3, dtype=np.float32)
+        self._has_camera = False
+        self._depth_range = (0., 1.)
+
+        #
+        self._colormap = None
+        self._program = Program(self._vertex_shader, self._fragment_shader)
+        self._program['u_lut'] = gloo.Texture2D(
+            make_lut('Viridis'), interpolation='linear'
+        )
+        self._program['u_depth_range'] = self._depth_range
+        self._program['u_point_size'] = 2.
+        self._program['u_model'] = np.eye(4, dtype=np.float32)
+        self._program['u_view'] = np.eye(4, dtype=np.float32)
+
+        #
+        self.apply_magnification()
+
+    @property
+    def point_budget(self):
+        return self._point_budget
+
+    @point_budget.setter
+    def point_budget(self, value):
+        self._point_budget = int(value)
+
+    @property
+    def colormap(self):
+        return self._colormap
+
+    @colormap.setter
+    def colormap(self, value):
+        # The cloud is always colored by depth; None means viridis:
+        self._colormap = value
+        self._program['u_lut'].set_data(
+            make_lut('Viridis' if value is None else value)
+        )
+
+    def reset_camera(self):
+        self._has_camera = False
+
+    def _prepare_texture(self, buffer):
+        if buffer.payload_type not in self._visible_payloads:
+            return
+
+        #
+        component = buffer.payload.components[0]
+        if is_custom(component.data_format_value):
+            return
+        data_format = component.data_format
+        if not is_point_cloud_format(data_format):
+            return
+
+        # Decimate the cloud to the budget:
+        width, height = component.width, component.height
+        cloud = reshape_point_cloud(
+            component.data, width, height, data_format
+        )
+        step = max(1, int(np.ceil(
+            np.sqrt(width * height / self._point_budget)
+        )))
+        cloud = cloud[::step, ::step]
+
+        # Allocate the vertex buffer only if the decimated shape changes;
+        # otherwise the buffer on the GPU is updated in place:
+        if self._decimated_shape != cloud.shape:
+            self._decimated_shape = cloud.shape
+            self._points = np.empty(
+                (cloud.shape[0] * cloud.shape[1], 3), dtype=np.float32
+            )
+            self._vertex_buffer = gloo.VertexBuffer(self._points)
+            self._program['a_position'] = self._vertex_buffer
+            self._has_camera = False
+        np.copyto(self._points.reshape(cloud.shape), cloud, casting='unsafe')
+        self._vertex_buffer.set_data(self._points)
+
+        #
+        self._latest_content = cloud
+        self._latest_data_format = data_format
+
+        #
+        depth_range = compute_auto_range(
+            self._points.reshape(cloud.shape), 2, 0.
+        )
+        if depth_range:
+            self._depth_range = depth_range
+            self._program['u_depth_range'] = self._depth_range
+        if not self._has_camera:
+            self._frame_cloud()
+
+    def _frame_cloud(self):
+        # Look at the whole cloud from the front:
+        valid = np.isfinite(self._points).all(axis=1) & \
+            (self._points[:, 2] != 0.)
+        if not valid.any():
+            return
+        points = self._points[valid]
+        self._center = (points.min(axis=0) + points.max(axis=0)) / 2.
+        extent = float(np.max(points.max(axis=0) - points.min(axis=0)))
+        self._distance = max(extent, 1e-3) * 1.5
+        self._azimuth, self._elevation = 0., 0.
+        self._has_camera = True
+        self.apply_magnification()
+
+    def _draw(self):
+        if self._vertex_buffer is None:
+            return
+        gloo.set_state(depth_test=True)
+        self._program.draw('points')
+        gloo.set_state(depth_test=False)
+
+    def apply_magnification(self):
+        #
+        canvas_w, canvas_h = self.physical_size
+        gloo.set_viewport(0, 0, canvas_w, canvas_h)
+
+        #
+        aspect = canvas_w / float(max(canvas_h, 1))
+        self._program['u_projection'] = perspective(
+            45., aspect, self._distance / 100., self._distance * 100.
+        )
+
+        # The coordinate system of the device has its Y axis pointing down
+        # and its Z axis pointing away from the camera:
+        model = np.dot(translate(-self._center), rotate(180., (1, 0, 0)))
+        model = np.dot(model, rotate(self._azimuth, (0, 1, 0)))
+        model = np.dot(model, rotate(self._elevation, (1, 0, 0)))
+        self._program['u_model'] = model
+        self._program['u_view'] = translate((0, 0, -self._distance))
+
+    def on_mouse_wheel(self, event):
+        self._distance *= 0.9 ** event.delta[1]
+        self.apply_magnification()
+
+    def on_mouse_move(self, event):
+        if self._is_dragging:
+            delta = event.pos - self._origin
+            self._origin = event.pos
+            self._azimuth += delta[0] * 0.5
+            self._elevation = min(max(
+                self._elevation + delta[1] * 0.5, -90.
+            ), 90.)
+            self.apply_magnification()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+
+# Related third party imports
+import numpy as np
+
+from harvesters.util.pfnc import bayer_location_formats, \
+    rgb_formats, rgba_formats, bgr_formats, bgra_formats
+
+# Local application/library specific imports
+
+
+# The index of each pattern is passed to the fragment shader; it tells
+# the color of the top left pixel of every 2x2 cell:
+bayer_patterns = {'RG': 1, 'GR': 2, 'GB': 3, 'BG': 4}
+
+# Name: bits per pixel; each plane of a planar image is uploaded as its
+# own texture:
+planar_formats = {
+    'RGB8_Planar': 8,
+    'RGB10_Planar': 10,
+    'RGB12_Planar': 12,
+    'RGB16_Planar': 16,
+}
+
+
+def get_bayer_pattern(data_format):
+    if data_format not in bayer_location_formats:
+        return 0
+    return bayer_patterns.get(data_format[5:7], 0)
+
+
+def get_planar_bits_per_pixel(data_format):
+    return planar_formats.get(data_format)
+
+
+def is_color_format(data_format):
+    return data_format in bayer_location_formats or \
+        data_format in planar_formats or \
+        data_format in rgb_formats or data_format in rgba_formats or \
+        data_format in bgr_formats or data_format in bgra_formats
+
+
+def sample_region(content, data_format, x, y, width, height,
+                  max_samples=4096):
+    """
+    Returns a decimated copy of the region so that it can be passed to
+    another thread; the content is a view of a buffer that will be queued
+    again soon. The region is given in the image coordinate system.
+    """
+    if not is_color_format(data_format):
+        return None
+
+    # Keep the phase of the Bayer pattern:
+    x, y = x & ~1, y & ~1
+    region = content[y:y + height, x:x + width]
+    if region.size == 0:
+        return None
+
+    # Decimate the region by whole 2x2 cells:
+    step = max(1, int(np.sqrt(region.shape[0] * region.shape[1] / max_samples)))
+    if data_format in bayer_location_formats:
+        cells = region[
+            :region.shape[0] & ~1, :region.shape[1] & ~1
+        ].reshape(region.shape[0] // 2, 2, region.shape[1] // 2, 2)
+        return np.array(cells[::step, :, ::step, :])
+    else:
+        return np.array(region[::step, ::step])
+
+
+def compute_white_balance(sample, data_format):
+    """
+    Returns the gains (red, green, blue) that turn the average color of
+    the sample, which should show a gray card, into gray.
+    """
+    if sample is None:
+        return 1., 1., 1.
+
+    #
+    if data_format in bayer_location_formats:
+        cells = sample.astype(np.float64)
+        pixels = [cells[:, 0, :, 0], cells[:, 0, :, 1],
+                  cells[:, 1, :, 0], cells[:, 1, :, 1]]
+        means = [p.mean() for p in pixels]
+
+        # The indices of the red, green and blue pixels in a cell:
+        order = {
+            'RG': (0, (1, 2), 3), 'GR': (1, (0, 3), 2),
+            'GB': (2, (0, 3), 1), 'BG': (3, (1, 2), 0),
+        }[data_format[5:7]]
+        red = means[order[0]]
+        green = (means[order[1][0]] + means[order[1][1]]) / 2.
+        blue = means[order[2]]
+    else:
+        # The canvas has already swapped the channels of BGR images:
+        means = sample[..., :3].reshape(-1, 3).astype(np.float64).mean(axis=0)
+        red, green, blue = means
+
+    #
+    if min(red, green, blue) <= 0.:
+        return 1., 1., 1.
+    return green / red, 1., green / blue
+
+
+def _convolve_3x3(image, kernel):
+    # The image has been padded by a pixel on each side:
+    height, width = image.shape[0] - 2, image.shape[1] - 2
+    result = np.zeros((height, width), dtype=image.dtype)
+    for y in range(3):
+        for x in range(3):
+            if kernel[y][x]:
+                result += kernel[y][x] * image[y:y + height, x:x + width]
+    return result
+
+
+def demosaic(raw, data_format):
+    """
+    Returns the (height, width, 3) RGB image of a Bayer image; the missing
+    colors are bilinearly interpolated from the neighbours. The type of
+    the pixels is kept.
+    """
+    cell = {
+        'RG': 'RGGB', 'GR': 'GRBG', 'GB': 'GBRG', 'BG': 'BGGR'
+    }[data_format[5:7]]
+    height, width = raw.shape
+
+    # The reflection keeps the phase of the pattern at the border:
+    image = raw.astype(np.float32)
+    padded = np.pad(image, 1, mode='reflect')
+    kernel = [[1, 2, 1], [2, 4, 2], [1, 2, 1]]
+
+    #
+    rgb = np.empty((height, width, 3), dtype=raw.dtype)
+    for channel, color in enumerate('RGB'):
+        mask = np.zeros((height, width), dtype=np.float32)
+        for i, c in enumerate(cell):
+            if c == color:
+                mask[i // 2::2, i % 2::2] = 1.
+        padded_mask = np.pad(mask, 1, mode='reflect')
+
+        # Average the neighbours of the color, weighted by the distance:
+        interpolated = _convolve_3x3(padded * padded_mask, kernel) / \
+            np.maximum(_convolve_3x3(padded_mask, kernel), 1.)
+        values = np.where(mask > 0., image, interpolated)
+        if np.issubdtype(raw.dtype, np.integer):
+            values = np.rint(values)
+        rgb[..., channel] = values
+    return rgb
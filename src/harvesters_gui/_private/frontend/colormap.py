@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+
+# Related third party imports
+import numpy as np
+
+# Local application/library specific imports
+
+
+lut_size = 256
+
+
+def _gray(t):
+    return np.stack([t, t, t], axis=-1)
+
+
+def _viridis(t):
+    # A polynomial fit of viridis that is accurate enough for display
+    # purposes; see https://www.shadertoy.com/view/WlfXRN:
+    coefficients = np.array([
+        [0.2777273272234177, 0.005407344544966578, 0.3340998053353061],
+        [0.1050930431085774, 1.404613529898575, 1.384590162594685],
+        [-0.3308618287255563, 0.214847559468213, 0.09509516302823659],
+        [-4.634230498983486, -5.799100973351585, -19.33244095627987],
+        [6.228269936347081, 14.17993336680509, 56.69055260068105],
+        [4.776384997670288, -13.74514537774601, -65.35303263337234],
+        [-5.435455855934631, 4.645852612178535, 26.3124352495832],
+    ])
+    t = t[:, np.newaxis]
+    color = np.zeros((t.shape[0], 3))
+    for c in coefficients[::-1]:
+        color = color * t + c
+    return color
+
+
+def _jet(t):
+    return np.stack([
+        1.5 - np.abs(4. * t - 3.),
+        1.5 - np.abs(4. * t - 2.),
+        1.5 - np.abs(4. * t - 1.),
+    ], axis=-1)
+
+
+colormaps = {
+    'Gray': _gray,
+    'Viridis': _viridis,
+    'Jet': _jet,
+}
+
+
+def make_lut(colormap):
+    """
+    Returns a lookup table that can be uploaded as a texture: a uint8 array
+    of shape (1, lut_size, 3). The colormap is either a name in colormaps
+    or an array of RGB colors in [0, 1] that are evenly spaced from the
+    lowest to the highest value.
+    """
+    t = np.linspace(0., 1., lut_size)
+    if isinstance(colormap, str):
+        lut = colormaps[colormap](t)
+    else:
+        colors = np.asarray(colormap, dtype=np.float64).reshape(-1, 3)
+        positions = np.linspace(0., 1., colors.shape[0])
+        lut = np.stack(
+            [np.interp(t, positions, colors[:, i]) for i in range(3)],
+            axis=-1
+        )
+    lut = np.clip(lut, 0., 1.) * 255. + .5
+    return lut.astype(np.uint8).reshape(1, lut_size, 3)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import zlib
+
+# Related third party imports
+try:
+    # It's optional but it compresses several times faster than zlib:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# Local application/library specific imports
+
+
+class Codec:
+    """
+    Compresses the frames of a recording one by one so that every frame
+    can still be read alone. The functions should release the GIL so that
+    several frames can be compressed at once on a thread pool.
+    """
+    def __init__(self, name, compress, decompress):
+        #
+        if len(name.encode()) > 8:
+            raise ValueError('The name of a codec takes up to 8 bytes.')
+        self._name = name
+        self._compress = compress
+        self._decompress = decompress
+
+    @property
+    def name(self):
+        return self._name
+
+    def compress(self, data):
+        return self._compress(data)
+
+    def decompress(self, data):
+        return self._decompress(data)
+
+
+# Name: codec; the name is recorded with every compressed frame:
+_codecs = {}
+
+
+def register_codec(codec):
+    _codecs[codec.name] = codec
+
+
+def get_codec(name):
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(
+            '{0} is not a registered codec.'.format(name)
+        ) from None
+
+
+def get_codec_names():
+    return list(_codecs.keys())
+
+
+#
+register_codec(Codec(
+    'zlib', lambda data: zlib.compress(data, 1), zlib.decompress
+))
+if lz4:
+    register_codec(Codec('lz4', lz4.frame.compress, lz4.frame.decompress))
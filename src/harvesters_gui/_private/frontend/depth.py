@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+
+# Related third party imports
+import numpy as np
+
+# Local application/library specific imports
+
+
+# Name: (number of components, index of the component to display,
+# whether the components are stored in planes):
+_float_formats = {
+    'Coord3D_A32f': (1, 0, False),
+    'Coord3D_B32f': (1, 0, False),
+    'Coord3D_C32f': (1, 0, False),
+    'Confidence32f': (1, 0, False),
+    'Coord3D_ABC32f': (3, 2, False),
+    'Coord3D_ABC32f_Planar': (3, 2, True),
+}
+
+# The texture formats for each number of components:
+_texture_formats = {
+    1: ('r32f', 'luminance'),
+    3: ('rgb32f', 'rgb'),
+}
+
+
+def is_float_format(data_format):
+    return data_format in _float_formats
+
+
+def reshape_float_image(data, width, height, data_format):
+    """
+    Returns a view of the data that can be uploaded as a float texture
+    and the index of the channel that the shader should display.
+    """
+    components, index, planar = _float_formats[data_format]
+    if planar:
+        # The plane is contiguous so it's uploaded alone:
+        return data.reshape(components, height, width)[index], 0
+    elif components == 1:
+        return data.reshape(height, width), 0
+    else:
+        return data.reshape(height, width, components), index
+
+
+def is_point_cloud_format(data_format):
+    return data_format in _float_formats and \
+        _float_formats[data_format][0] == 3
+
+
+def reshape_point_cloud(data, width, height, data_format):
+    """
+    Returns a (height, width, 3) view of the coordinates.
+    """
+    if _float_formats[data_format][2]:
+        return np.moveaxis(data.reshape(3, height, width), 0, -1)
+    return data.reshape(height, width, 3)
+
+
+def get_texture_formats(content):
+    """
+    Returns the internal format and the format of the texture.
+    """
+    components = 1 if content.ndim == 2 else content.shape[2]
+    return _texture_formats[components]
+
+
+def compute_auto_range(content, index, invalid_value=None,
+                       percentiles=(1., 99.), max_samples=16384):
+    """
+    Estimates the range to map to the colormap from a decimated view of
+    the image so that it's cheap enough to run for every frame; invalid
+    values are ignored.
+    """
+    plane = content if content.ndim == 2 else content[:, :, index]
+    step = max(1, int(np.sqrt(plane.size / max_samples)))
+    sample = plane[::step, ::step]
+
+    #
+    valid = np.isfinite(sample)
+    if invalid_value is not None:
+        valid &= sample != invalid_value
+    sample = sample[valid]
+    if sample.size == 0:
+        return None
+
+    #
+    low, high = np.percentile(sample, percentiles)
+    if high <= low:
+        high = low + 1.
+    return float(low), float(high)
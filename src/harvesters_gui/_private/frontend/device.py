@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import threading
+
+# Related third party imports
+from genicam.genapi import EAccessMode, ECallbackType, GenericException, \
+    deregister, register
+
+# Local application/library specific imports
+
+
+roi_feature_names = ['OffsetX', 'OffsetY', 'Width', 'Height']
+
+# The features that the status bar shows:
+image_format_feature_names = ['Width', 'Height', 'PixelFormat']
+
+
+def has_features(node_map, names):
+    for name in names:
+        try:
+            _ = getattr(node_map, name).node
+        except AttributeError:
+            return False
+    return True
+
+
+def is_writable(node_map, names):
+    """
+    Returns True if every feature can be written now. Most devices lock
+    the features that affect the payload size while they are streaming.
+    """
+    for name in names:
+        try:
+            access_mode = getattr(node_map, name).node.get_access_mode()
+        except AttributeError:
+            return False
+        if access_mode not in [EAccessMode.RW, EAccessMode.WO]:
+            return False
+    return True
+
+
+def align(value, feature):
+    # Round the value down to the nearest valid value of an integer
+    # feature so that the device does not reject it:
+    minimum, maximum, increment = feature.min, feature.max, feature.inc
+    value = min(max(int(value), minimum), maximum)
+    return value - (value - minimum) % increment
+
+
+def get_roi(node_map):
+    return tuple(
+        getattr(node_map, name).value for name in roi_feature_names
+    )
+
+
+def set_roi(node_map, x, y, width, height):
+    """
+    Writes the region of interest to the device. The given rectangle is
+    aligned to the increments of each feature and the resulting rectangle
+    is returned as (x, y, width, height).
+    """
+    for offset, size, start, length in [
+        (node_map.OffsetX, node_map.Width, x, width),
+        (node_map.OffsetY, node_map.Height, y, height)
+    ]:
+        # The maximum of the offset depends on the size and vice versa so
+        # reset the offset first; then the size can take the whole range:
+        offset.value = offset.min
+        size.value = align(length, size)
+        offset.value = align(start, offset)
+    return get_roi(node_map)
+
+
+def restore_full_frame(node_map):
+    for offset, size in [
+        (node_map.OffsetX, node_map.Width),
+        (node_map.OffsetY, node_map.Height)
+    ]:
+        offset.value = offset.min
+        size.value = size.max
+    return get_roi(node_map)
+
+
+class ReducedResolutionPreview:
+    """
+    Puts the device into binning, or decimation if the device does not
+    support binning, to reduce the transport and display load during live
+    preview. The original settings are kept so that they can be restored
+    before capturing images at the full resolution.
+    """
+    _candidates = [
+        ['BinningHorizontal', 'BinningVertical'],
+        ['DecimationHorizontal', 'DecimationVertical'],
+    ]
+
+    def __init__(self, factor=2):
+        #
+        self._factor = factor
+        self._names = None
+        self._saved_values = None
+        self._saved_roi = None
+
+    @property
+    def factor(self):
+        return self._factor
+
+    @factor.setter
+    def factor(self, value):
+        self._factor = value
+
+    def is_active(self):
+        return True if self._saved_values else False
+
+    @classmethod
+    def get_feature_names(cls, node_map):
+        for names in cls._candidates:
+            if has_features(node_map, names):
+                return names
+        return None
+
+    def enter(self, node_map):
+        """
+        Returns the actual factors (horizontal, vertical) that the device
+        accepted.
+        """
+        names = self.get_feature_names(node_map)
+        if not names or self.is_active():
+            return 1, 1
+
+        #
+        self._names = names
+        self._saved_values = [getattr(node_map, n).value for n in names]
+        if has_features(node_map, roi_feature_names):
+            self._saved_roi = get_roi(node_map)
+
+        #
+        for name in names:
+            feature = getattr(node_map, name)
+            feature.value = align(self._factor, feature)
+        return tuple(getattr(node_map, n).value for n in names)
+
+    def leave(self, node_map):
+        if not self.is_active():
+            return
+
+        # The size of the image depends on the factors so restore the
+        # factors first and then the region of interest:
+        for name, value in zip(self._names, self._saved_values):
+            getattr(node_map, name).value = value
+        if self._saved_roi:
+            set_roi(node_map, *self._saved_roi)
+
+        #
+        self._names = None
+        self._saved_values = None
+        self._saved_roi = None
+
+
+class FeatureCache:
+    """
+    Keeps the values of features so that they can be read over and over
+    without a round trip to the device. A value is read again only after
+    its node has notified a change, including a change of a feature that
+    it depends on, or after the cache has been invalidated.
+    """
+    def __init__(self, node_map, names=None):
+        #
+        self._node_map = node_map
+        self._names = list(names or image_format_feature_names)
+
+        #
+        self._lock = threading.Lock()
+        self._values = {}
+        self._stale = set(self._names)
+
+        # GenApi calls them back on the thread that has written the node:
+        self._tokens = []
+        for name in self._names:
+            try:
+                node = getattr(node_map, name).node
+                self._tokens.append(register(
+                    node, lambda _, name=name: self.invalidate(name),
+                    ECallbackType.cbPostOutsideLock
+                ))
+            except (AttributeError, GenericException):
+                pass
+
+    def invalidate(self, *names):
+        """
+        Marks the given features, or all of them, to be read again.
+        """
+        with self._lock:
+            self._stale.update(names or self._names)
+
+    def refresh(self, *names):
+        """
+        Reads the given features, or all of them, now so that the
+        following gets don't have to.
+        """
+        self.invalidate(*names)
+        for name in names or self._names:
+            self.get(name)
+
+    def get(self, name):
+        """
+        Returns the value of the feature; it's None if the feature is not
+        available.
+        """
+        with self._lock:
+            if name not in self._stale:
+                return self._values.get(name)
+            self._stale.discard(name)
+
+        #
+        try:
+            value = getattr(self._node_map, name).value
+        except (AttributeError, GenericException):
+            value = None
+        with self._lock:
+            self._values[name] = value
+        return value
+
+    def peek(self, name):
+        """
+        Returns the value that has been read last without reading the
+        feature; it's None if it has not been read yet.
+        """
+        with self._lock:
+            return self._values.get(name)
+
+    def destroy(self):
+        for token in self._tokens:
+            try:
+                deregister(token)
+            except GenericException:
+                pass
+        self._tokens.clear()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import threading
+
+# Related third party imports
+from genicam.gentl import TimeoutException
+
+# Local application/library specific imports
+from harvesters.util.logging import get_logger
+from harvesters_gui._private.frontend.scheduling import set_cpu_affinity
+
+
+class Dispatcher:
+    """
+    Fetches every buffer that the image acquirer delivers on its own
+    thread and passes it to the sinks, e.g. a recorder. A sink must copy
+    what it needs because the buffer is queued again soon.
+
+    Only the latest buffer is kept for the canvas; it takes the place of
+    the image acquirer for the canvas so the canvas draws at its own pace
+    while no buffer is missed.
+    """
+    def __init__(
+            self, image_acquirer, *, timeout_s=0.05, settings=None,
+            logger=None
+    ):
+        #
+        self._logger = logger or get_logger(name='harvesters')
+
+        #
+        self._ia = image_acquirer
+        self._timeout_s = timeout_s
+
+        # Only the CPU affinity applies to a Python thread:
+        self._settings = settings
+
+        # The tuple is replaced as a whole so that the fetch thread can
+        # iterate over it without holding the lock:
+        self._sinks = ()
+
+        # It's held while the fetch thread passes a buffer to the sinks:
+        self._pass_lock = threading.Lock()
+
+        #
+        self._lock = threading.Lock()
+        self._latest = None
+        self._thread = None
+        self._is_running = False
+
+        # The number of buffers that have been queued again before the
+        # canvas took them:
+        self._num_skipped = 0
+
+    @property
+    def ia(self):
+        return self._ia
+
+    @property
+    def num_skipped(self):
+        return self._num_skipped
+
+    def add_sink(self, sink):
+        with self._lock:
+            self._sinks = self._sinks + (sink,)
+
+    def remove_sink(self, sink):
+        """
+        Removes the sink; once it returns, the sink is not going to be
+        called anymore unless it's called on the fetch thread.
+        """
+        with self._lock:
+            self._sinks = tuple(s for s in self._sinks if s != sink)
+
+        # Let the fetch thread finish the pass that may still call it:
+        if threading.current_thread() is not self._thread:
+            with self._pass_lock:
+                pass
+
+    def is_running(self):
+        return self._is_running
+
+    def start(self):
+        if self._is_running:
+            return
+        self._num_skipped = 0
+        self._is_running = True
+        self._thread = threading.Thread(
+            target=self._run, name='Dispatcher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if not self._is_running:
+            return
+        self._is_running = False
+        self._thread.join()
+        self._thread = None
+
+        # Nobody is going to take it:
+        with self._lock:
+            latest, self._latest = self._latest, None
+        if latest:
+            latest.queue()
+
+    def _run(self):
+        set_cpu_affinity(
+            self._settings.cpus if self._settings else None, self._logger
+        )
+
+        #
+        while self._is_running:
+            try:
+                buffer = self._ia.fetch(timeout=self._timeout_s)
+            except TimeoutException:
+                continue
+
+            #
+            with self._pass_lock:
+                for sink in self._sinks:
+                    try:
+                        sink(buffer)
+                    except Exception as e:
+                        # A broken sink must not stop the others:
+                        self._logger.error(e, exc_info=True)
+
+            # Keep the latest one and give the older one back to the
+            # producer right away:
+            with self._lock:
+                older, self._latest = self._latest, buffer
+            if older:
+                self._num_skipped += 1
+                older.queue()
+
+    def try_fetch(self, timeout=0):
+        """
+        Returns the latest buffer that has not been taken yet, otherwise
+        None. The caller has to queue the buffer once it's done with it.
+        The timeout is ignored because the buffer is taken from memory.
+        """
+        with self._lock:
+            buffer, self._latest = self._latest, None
+        return buffer
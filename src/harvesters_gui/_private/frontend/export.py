@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import argparse
+import multiprocessing
+import os
+import sys
+
+# Related third party imports
+import numpy as np
+
+from harvesters.util.pfnc import bayer_location_formats, \
+    bgr_formats, bgra_formats
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.color import demosaic, planar_formats
+from harvesters_gui._private.frontend.depth import is_float_format, \
+    is_point_cloud_format, reshape_point_cloud
+from harvesters_gui._private.frontend.recording import get_data_type, \
+    Recording
+from harvesters_gui._private.frontend.scheduling import get_default_cpus, \
+    set_cpu_affinity
+from harvesters_gui._private.frontend.snapshot import get_significant_bits, \
+    png_extensions, save_image, tiff_extensions
+
+
+export_extensions = ['.tiff', '.png']
+
+# The number of consecutive frames that a worker exports per task; the
+# frames of a task are close to each other in the file:
+_frames_per_task = 16
+
+
+def to_image(data, record, debayer=False):
+    """
+    Returns the image of a recorded frame so that it can be saved; the
+    colors are in RGB order and the planes of a planar image are
+    interleaved. Bayer images are demosaiced if debayer is True.
+    """
+    width, height = int(record['width']), int(record['height'])
+    data_format = record['data_format'].decode()
+    data = data.view(get_data_type(data_format))
+
+    #
+    if is_point_cloud_format(data_format):
+        return reshape_point_cloud(data, width, height, data_format)
+    if is_float_format(data_format):
+        return data.reshape(height, width)
+    if data_format in planar_formats:
+        return np.moveaxis(data.reshape(3, height, width), 0, -1)
+
+    #
+    components = data.size // max(width * height, 1)
+    image = data.reshape(height, width) if components == 1 else \
+        data.reshape(height, width, components)
+    if data_format in bgr_formats:
+        image = image[..., [2, 1, 0]]
+    elif data_format in bgra_formats:
+        image = image[..., [2, 1, 0, 3]]
+    elif debayer and data_format in bayer_location_formats:
+        image = demosaic(image, data_format)
+    return image
+
+
+def get_file_path(directory, prefix, frame, extension):
+    return os.path.join(
+        directory, '{0}_{1:06d}{2}'.format(prefix, frame, extension)
+    )
+
+
+# Every worker process opens the recording by itself so that the frames
+# are read from its own mapping of the file; only the frame numbers are
+# passed between the processes:
+_recording = None
+_options = None
+
+
+def _initialize_worker(file_path, options, cpus):
+    global _recording, _options
+    set_cpu_affinity(cpus)
+    _recording = Recording(file_path)
+    _options = options
+
+
+def _export_frames(frames):
+    directory, prefix, extension, debayer = _options
+    for frame in frames:
+        record = _recording.index[frame]
+        image = to_image(_recording.get_data(frame), record, debayer)
+        save_image(
+            get_file_path(directory, prefix, frame, extension), image,
+            get_significant_bits(record['data_format'].decode())
+        )
+    return len(frames)
+
+
+def export_recording(
+        file_path, directory, *, extension='.tiff', debayer=False,
+        prefix=None, frames=None, processes=None, on_progress=None,
+        is_cancelled=None
+):
+    """
+    Saves the frames of a recording as a sequence of images in the
+    directory using a pool of processes; each file is named after the
+    prefix and the frame number. If frames is given, only those frames
+    are exported.
+
+    on_progress is called with (done, total) as the frames are exported.
+    If is_cancelled returns True the export stops as soon as possible.
+    Returns the number of exported frames.
+    """
+    extension = extension.lower()
+    if extension not in png_extensions + tiff_extensions:
+        raise ValueError(
+            '{0} is not a supported extension.'.format(extension)
+        )
+    if prefix is None:
+        prefix = os.path.splitext(os.path.basename(file_path))[0]
+    os.makedirs(directory, exist_ok=True)
+
+    #
+    if frames is None:
+        recording = Recording(file_path)
+        frames = range(len(recording))
+        recording.close()
+    frames = list(frames)
+    tasks = [
+        frames[i:i + _frames_per_task]
+        for i in range(0, len(frames), _frames_per_task)
+    ]
+
+    #
+    done = 0
+    if on_progress:
+        on_progress(done, len(frames))
+    # Forking a process that runs threads, such as the GUI, may deadlock
+    # the children. They would also inherit the CPUs of the calling
+    # thread, which may have been pinned:
+    pool = multiprocessing.get_context('spawn').Pool(
+        processes=processes, initializer=_initialize_worker, initargs=(
+            file_path, (directory, prefix, extension, debayer),
+            get_default_cpus()
+        )
+    )
+    try:
+        for num_frames in pool.imap_unordered(_export_frames, tasks):
+            done += num_frames
+            if on_progress:
+                on_progress(done, len(frames))
+            if is_cancelled and is_cancelled():
+                pool.terminate()
+                break
+        else:
+            pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Exports a recording as a sequence of images.'
+    )
+    parser.add_argument('recording', help='the recording to export')
+    parser.add_argument('directory', help='where the images are saved')
+    parser.add_argument(
+        '--format', choices=['tiff', 'png'], default='tiff',
+        help='the file format of the images'
+    )
+    parser.add_argument(
+        '--debayer', action='store_true',
+        help='save Bayer images as RGB images'
+    )
+    parser.add_argument(
+        '--prefix', help='the file name prefix; '
+                         'it is the name of the recording by default'
+    )
+    parser.add_argument(
+        '--first', type=int, default=0, help='the first frame to export'
+    )
+    parser.add_argument(
+        '--last', type=int, help='the last frame to export'
+    )
+    parser.add_argument(
+        '--processes', type=int,
+        help='the number of worker processes; '
+             'it is the number of CPUs by default'
+    )
+    args = parser.parse_args(argv)
+
+    #
+    try:
+        recording = Recording(args.recording)
+    except (OSError, ValueError) as e:
+        parser.error(e)
+    last = len(recording) - 1 if args.last is None else \
+        min(args.last, len(recording) - 1)
+    recording.close()
+
+    #
+    def on_progress(done, total):
+        sys.stderr.write('\r{0} / {1}'.format(done, total))
+        sys.stderr.flush()
+
+    #
+    num_frames = export_recording(
+        args.recording, args.directory, extension='.' + args.format,
+        debayer=args.debayer, prefix=args.prefix,
+        frames=range(args.first, last + 1), processes=args.processes,
+        on_progress=on_progress
+    )
+    sys.stderr.write('\n')
+    return 0 if num_frames == max(last + 1 - args.first, 0) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
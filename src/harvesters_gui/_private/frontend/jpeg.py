@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+# Related third party imports
+import numpy as np
+
+from PyQt5.QtGui import QImage
+
+from genicam.gentl import GenericException
+
+try:
+    # It's optional but it decodes JPEG several times faster than Qt:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.scheduling import unpinned
+
+
+def get_compressed_data(buffer):
+    """
+    Returns a copy of the compressed image of the buffer. Harvester does
+    not wrap a JPEG or JPEG 2000 payload in components so it's taken from
+    the GenTL buffer.
+    """
+    # Harvester has renamed the GenTL buffer that it wraps:
+    raw_buffer = getattr(buffer, 'module', None) or buffer._buffer
+    data = raw_buffer.raw_buffer
+    try:
+        size = raw_buffer.size_filled or len(data)
+    except GenericException:
+        size = len(data)
+    return bytes(data[:size])
+
+
+def _decode_with_qt(data):
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+
+    #
+    if image.format() == QImage.Format_Grayscale8:
+        channels = 1
+    else:
+        image = image.convertToFormat(QImage.Format_RGB888)
+        channels = 3
+
+    # Every line of a QImage is aligned to 4 bytes:
+    width, height = image.width(), image.height()
+    bits = image.constBits()
+    bits.setsize(height * image.bytesPerLine())
+    lines = np.frombuffer(bits, dtype=np.uint8).reshape(
+        height, image.bytesPerLine()
+    )
+    content = np.array(lines[:, :width * channels])
+    return content.reshape(height, width) if channels == 1 else \
+        content.reshape(height, width, channels)
+
+
+def decode(data, jpeg2000=False):
+    """
+    Returns the decoded image as a (height, width) or (height, width, 3)
+    uint8 array, or None if the data could not be decoded.
+    """
+    if simplejpeg and not jpeg2000:
+        try:
+            colorspace = simplejpeg.decode_jpeg_header(data)[2]
+            return simplejpeg.decode_jpeg(
+                data, colorspace='GRAY' if colorspace == 'Gray' else 'RGB',
+                fastdct=True, fastupsample=True
+            )
+        except ValueError:
+            pass
+    return _decode_with_qt(data)
+
+
+class JpegDecoder:
+    """
+    Decodes compressed images on a pool of worker threads. At most one
+    image waits for a free worker; a newer image replaces it so that the
+    preview does not fall behind the device. The latest decoded image is
+    kept in a mailbox and an image never replaces a newer one there, even
+    if the workers finish them out of order.
+
+    An image can be tagged, e.g. with its timestamp, so that the tag comes
+    back with the decoded image.
+    """
+    def __init__(self, max_workers=2):
+        #
+        self._max_in_flight = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        #
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._num_in_flight = 0
+        self._pending = None
+        self._latest = None
+        self._latest_tag = None
+        self._latest_sequence = 0
+        self._num_skipped = 0
+
+    @property
+    def num_skipped(self):
+        return self._num_skipped
+
+    def submit(self, data, jpeg2000=False, tag=None):
+        """
+        Queues the data for decoding; the data must not be a view of a
+        buffer because the buffer is queued again before it's decoded.
+        """
+        with self._lock:
+            self._sequence += 1
+            job = (self._sequence, data, jpeg2000, tag)
+            if self._num_in_flight >= self._max_in_flight:
+                if self._pending:
+                    self._num_skipped += 1
+                self._pending = job
+                return
+            self._num_in_flight += 1
+        self._executor.submit(unpinned(self._work), *job)
+
+    def _work(self, sequence, data, jpeg2000, tag):
+        while True:
+            try:
+                content = decode(data, jpeg2000)
+            except Exception:
+                # A corrupted image must not take the worker down; the
+                # count of the images in flight would never go down:
+                content = None
+
+            #
+            with self._lock:
+                if content is not None:
+                    if sequence > self._latest_sequence:
+                        self._latest = content
+                        self._latest_tag = tag
+                        self._latest_sequence = sequence
+                    else:
+                        self._num_skipped += 1
+
+                # Take over the waiting image instead of returning the
+                # worker to the pool:
+                if self._pending is None:
+                    self._num_in_flight -= 1
+                    return
+                sequence, data, jpeg2000, tag = self._pending
+                self._pending = None
+
+    def take(self):
+        """
+        Returns the latest decoded image if there's any that has not been
+        taken yet, otherwise None.
+        """
+        return self.take_tagged()[0]
+
+    def take_tagged(self):
+        """
+        Does what take does but returns (image, tag of the image).
+        """
+        with self._lock:
+            content, self._latest = self._latest, None
+            tag, self._latest_tag = self._latest_tag, None
+        return content, tag
+
+    def reset(self):
+        """
+        Forgets the waiting image and the latest decoded one; the images
+        that are being decoded now are discarded once they're done.
+        """
+        with self._lock:
+            self._pending = None
+            self._latest = None
+            self._latest_tag = None
+            self._latest_sequence = self._sequence
+
+    def shutdown(self):
+        self.reset()
+        self._executor.shutdown(wait=False)
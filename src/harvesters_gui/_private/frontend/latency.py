@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+from collections import OrderedDict
+import threading
+import time
+
+# Related third party imports
+import numpy as np
+
+from genicam.genapi import GenericException
+
+# Local application/library specific imports
+from harvesters.util.logging import get_logger
+from harvesters_gui._private.frontend.recording import get_timestamp_ns
+from harvesters_gui._private.frontend.scheduling import set_cpu_affinity
+
+
+# The stages of a frame from the device timestamp on; the host times are
+# taken when the buffer has been fetched, when the texture has been
+# uploaded and when the canvas has been swapped onto the screen:
+stage_fetch = 'fetch'
+stage_upload = 'upload'
+stage_display = 'display'
+stages = [stage_fetch, stage_upload, stage_display]
+
+
+class ClockFit:
+    """
+    Maps the device clock to the host clock with a linear fit over the
+    latest pairs of (device timestamp, host time); the host time is given
+    in seconds of time.perf_counter.
+
+    If the pairs are taken when the buffers are fetched rather than by
+    latching the device clock, the host times are late by the transport
+    time; lower_envelope shifts the fit onto the earliest delivery so the
+    latency is measured from the fastest frame in the window.
+    """
+    def __init__(self, window=64, lower_envelope=False):
+        #
+        self._devices = np.zeros(window, dtype=np.float64)
+        self._hosts = np.zeros(window, dtype=np.float64)
+        self._num_samples = 0
+        self._lower_envelope = lower_envelope
+
+        #
+        self._lock = threading.Lock()
+        self._origin = None
+        self._slope = 1e-9
+        self._intercept = 0.
+
+    @property
+    def num_samples(self):
+        return self._num_samples
+
+    def reset(self):
+        with self._lock:
+            self._num_samples = 0
+            self._origin = None
+
+    def add(self, device_ns, host_s):
+        with self._lock:
+            # Keep the values small so that the fit does not lose precision:
+            if self._origin is None:
+                self._origin = (float(device_ns), host_s)
+            slot = self._num_samples % self._devices.size
+            self._devices[slot] = float(device_ns) - self._origin[0]
+            self._hosts[slot] = host_s - self._origin[1]
+            self._num_samples += 1
+
+            # Once the window is full, it's enough to refit now and then:
+            n = min(self._num_samples, self._devices.size)
+            if n == self._devices.size and self._num_samples % 8:
+                return
+            x, y = self._devices[:n], self._hosts[:n]
+            if n > 1 and np.ptp(x) > 0.:
+                self._slope, self._intercept = np.polyfit(x, y, 1)
+            else:
+                # Assume that the device clock ticks in nanoseconds:
+                self._slope = 1e-9
+                self._intercept = float(np.mean(y - self._slope * x))
+            if self._lower_envelope:
+                self._intercept += float(
+                    np.min(y - (self._slope * x + self._intercept))
+                )
+
+    def to_host(self, device_ns):
+        """
+        Returns the host time of the device timestamp; it's None until a
+        pair has been added.
+        """
+        with self._lock:
+            if self._origin is None:
+                return None
+            return self._origin[1] + self._intercept + \
+                self._slope * (float(device_ns) - self._origin[0])
+
+
+class LatencyMonitor:
+    """
+    Measures how long it takes a frame from its device timestamp until
+    it's fetched, uploaded and on the screen. The latest latencies of
+    every stage are kept in milliseconds.
+
+    If the device supports TimestampLatch, the device clock is latched on
+    a thread once in a while to map it to the host clock; otherwise the
+    fetch times are used, see ClockFit.
+    """
+    def __init__(self, *, capacity=4096, latch_interval_s=1., logger=None):
+        #
+        self._logger = logger or get_logger(name='harvesters')
+
+        #
+        self._capacity = capacity
+        self._latch_interval_s = latch_interval_s
+        self._clock = ClockFit(lower_envelope=True)
+        self._is_latching = False
+
+        # Device timestamp: host times of the frames that have not been
+        # displayed yet:
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._uploaded = []
+
+        #
+        self._latencies = {
+            stage: np.full(capacity, np.nan) for stage in stages
+        }
+        self._num_samples = 0
+
+        #
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_latching(self):
+        """
+        True if the device clock is latched; otherwise the latencies do
+        not include the time that the fastest frame has taken to reach
+        the host.
+        """
+        return self._is_latching
+
+    @property
+    def num_samples(self):
+        return self._num_samples
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._uploaded.clear()
+            for latencies in self._latencies.values():
+                latencies.fill(np.nan)
+            self._num_samples = 0
+
+    def start_latching(self, node_map):
+        """
+        Starts latching the device clock if the device supports it;
+        returns False otherwise.
+        """
+        self.stop_latching()
+        try:
+            latch = node_map.TimestampLatch
+            value = node_map.TimestampLatchValue
+            latch.execute()
+            int(value.value)
+        except (AttributeError, GenericException):
+            return False
+
+        #
+        self._clock = ClockFit()
+        self._is_latching = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run_latching, args=(latch, value),
+            name='TimestampLatch', daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop_latching(self):
+        if self._thread:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if self._is_latching:
+            self._is_latching = False
+            self._clock = ClockFit(lower_envelope=True)
+
+    def _run_latching(self, latch, value):
+        set_cpu_affinity(None, self._logger)
+        while not self._stop_event.is_set():
+            try:
+                # The device has latched its clock somewhere in between:
+                before = time.perf_counter()
+                latch.execute()
+                after = time.perf_counter()
+                self._clock.add(int(value.value), (before + after) / 2.)
+            except GenericException as e:
+                self._logger.warning(e)
+            self._stop_event.wait(self._latch_interval_s)
+
+    def write(self, buffer):
+        """
+        Takes the fetch time of the buffer; it's called on the fetch
+        thread.
+        """
+        now = time.perf_counter()
+        timestamp_ns = get_timestamp_ns(buffer)
+        if not timestamp_ns:
+            return
+        if not self._is_latching:
+            self._clock.add(timestamp_ns, now)
+
+        #
+        with self._lock:
+            self._pending[timestamp_ns] = now
+            while len(self._pending) > 64:
+                self._pending.popitem(last=False)
+
+    def on_uploaded(self, buffer):
+        """
+        Is called by the canvas once the texture of the buffer has been
+        uploaded.
+        """
+        self.on_frame_uploaded(get_timestamp_ns(buffer))
+
+    def on_frame_uploaded(self, timestamp_ns):
+        """
+        Does what on_uploaded does for the frame of the device timestamp,
+        e.g. a compressed one that has been decoded after its buffer has
+        been queued.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            fetched = self._pending.pop(timestamp_ns, None)
+            if fetched is not None:
+                self._uploaded.append((timestamp_ns, fetched, now))
+
+    def on_swapped(self):
+        """
+        Is called once the canvas has been swapped onto the screen; the
+        frames that have been uploaded since the last swap are displayed.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            uploaded, self._uploaded = self._uploaded, []
+        for timestamp_ns, fetched, uploaded_at in uploaded:
+            exposed = self._clock.to_host(timestamp_ns)
+            if exposed is None:
+                continue
+            slot = self._num_samples % self._capacity
+            for stage, host_time in zip(stages, [fetched, uploaded_at, now]):
+                self._latencies[stage][slot] = (host_time - exposed) * 1e3
+            self._num_samples += 1
+
+    def get_latencies(self, stage=stage_display, start=None, stop=None):
+        """
+        Returns the latest latencies of the stage in milliseconds; they're
+        not in order. If start or stop is given, only the samples that
+        have been numbered from start to stop are returned, as far as
+        they're still kept; the next sample is numbered num_samples.
+        """
+        if start is None and stop is None:
+            latencies = self._latencies[stage][:min(
+                self._num_samples, self._capacity
+            )]
+        else:
+            stop = self._num_samples if stop is None else stop
+            start = max(start or 0, stop - self._capacity, 0)
+            latencies = self._latencies[stage][
+                np.arange(start, stop) % self._capacity
+            ]
+        return latencies[np.isfinite(latencies)]
+
+    def get_histogram(self, stage=stage_display, bin_ms=2., max_ms=100.):
+        """
+        Returns (counts, edges) of the latencies of the stage; the last bin
+        also counts the latencies beyond max_ms.
+        """
+        latencies = np.minimum(self.get_latencies(stage), max_ms)
+        edges = np.arange(0., max_ms + bin_ms, bin_ms)
+        counts, edges = np.histogram(latencies, bins=edges)
+        return counts, edges
+
+    def get_percentiles(
+            self, stage=stage_display, q=(50., 99.), start=None, stop=None
+    ):
+        latencies = self.get_latencies(stage, start, stop)
+        if latencies.size == 0:
+            return [np.nan] * len(q)
+        return list(np.percentile(latencies, q))
+
+    def get_ratio_below(self, limit_ms, stage=stage_display):
+        latencies = self.get_latencies(stage)
+        if latencies.size == 0:
+            return np.nan
+        return float(np.count_nonzero(latencies < limit_ms)) / \
+            latencies.size
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+from collections import namedtuple
+import time
+
+# Related third party imports
+from genicam.gentl import GenericException
+
+try:
+    from harvesters.core import Callback
+except ImportError:
+    # Older versions of Harvester do not notify incomplete buffers:
+    Callback = object
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.recording import get_frame_id, \
+    unknown_frame_id
+
+
+# A backward jump of the frame ID larger than this is taken as a wrap
+# around or a restart of the counter rather than a resend:
+_max_resend_distance = 2 ** 15
+
+
+class FrameLossSnapshot(namedtuple('FrameLossSnapshot', [
+        'num_received', 'num_bytes', 'num_lost', 'num_resent',
+        'num_incomplete', 'num_bursts', 'longest_burst',
+        'num_discarded'])):
+    """
+    The counters of a FrameLossCounter object at a moment.
+    """
+    __slots__ = ()
+
+    @property
+    def num_not_delivered(self):
+        # A buffer that has been discarded leaves a gap in the frame IDs
+        # too; the discarded buffers are all that is known if the device
+        # does not deliver frame IDs:
+        return max(self.num_lost, self.num_discarded)
+
+    @property
+    def num_missing(self):
+        """
+        The frames that have not been delivered plus the ones that have
+        been delivered incomplete.
+        """
+        return self.num_not_delivered + self.num_incomplete
+
+    @property
+    def drop_rate(self):
+        """
+        The ratio of the missing frames to all the frames that the device
+        has sent.
+        """
+        total = self.num_received + self.num_not_delivered
+        return self.num_missing / total if total else 0.
+
+
+class FrameLossCounter:
+    """
+    Tells the frames that the transport layer has lost apart from the ones
+    that the canvas has skipped. Every counter has a single writer so no
+    lock is needed: the frame IDs and the incomplete buffers that have been
+    delivered are counted on the fetch thread while the buffers that
+    Harvester has discarded are counted on the thread that it notifies
+    them on.
+
+    The fetch thread bumps a sequence number before and after it updates
+    the counters of a buffer, seqlock-style, so snapshot takes them as a
+    whole without ever making the fetch thread wait. num_discarded is not
+    covered by the sequence number because it has another writer; it's
+    taken as it is.
+    """
+    __slots__ = (
+        'num_received', 'num_bytes', 'num_lost', 'num_resent', 'num_incomplete',
+        'num_bursts', 'longest_burst', 'num_discarded', 'last_frame_id',
+        '_sequence', '_sample_time', '_sample_lost',
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._sequence = 0
+        self.num_received = 0
+        self.num_bytes = 0
+        self.num_lost = 0
+        self.num_resent = 0
+        self.num_incomplete = 0
+        self.num_bursts = 0
+        self.longest_burst = 0
+        self.num_discarded = 0
+        self.last_frame_id = unknown_frame_id
+        self._sample_time = time.perf_counter()
+        self._sample_lost = 0
+
+    def write(self, buffer):
+        """
+        Checks the frame ID of the buffer against the previous one; it's
+        called on the fetch thread.
+        """
+        # It's odd while the counters are being updated:
+        self._sequence += 1
+        try:
+            self._count(buffer)
+        finally:
+            self._sequence += 1
+
+    def _count(self, buffer):
+        try:
+            # The producer may deliver incomplete buffers as they are:
+            raw_buffer = getattr(buffer, 'module', None) or buffer._buffer
+            if not raw_buffer.is_complete():
+                self.num_incomplete += 1
+        except (AttributeError, GenericException):
+            pass
+
+        #
+        self.num_received += 1
+        if buffer.payload:
+            self.num_bytes += sum(
+                c.data.nbytes for c in buffer.payload.components
+            )
+        frame_id = get_frame_id(buffer)
+        if frame_id == unknown_frame_id:
+            return
+        last = self.last_frame_id
+        self.last_frame_id = frame_id
+        if last == unknown_frame_id:
+            return
+
+        #
+        gap = frame_id - last - 1
+        if gap > 0:
+            self.num_lost += gap
+            self.num_bursts += 1
+            if gap > self.longest_burst:
+                self.longest_burst = gap
+        elif gap < 0 and last - frame_id < _max_resend_distance:
+            # It's been delivered again or out of order; don't let it
+            # hide the frames that follow it:
+            self.num_resent += 1
+            self.last_frame_id = last
+
+    def count_discarded(self):
+        self.num_discarded += 1
+
+    def snapshot(self):
+        """
+        Returns a FrameLossSnapshot of the counters that the fetch thread
+        has updated for the same buffer; num_discarded may be a notification
+        ahead of or behind them.
+        """
+        num_discarded = self.num_discarded
+        while True:
+            sequence = self._sequence
+            if sequence & 1:
+                # Let the fetch thread finish the buffer:
+                time.sleep(0)
+                continue
+            snapshot = FrameLossSnapshot(
+                self.num_received, self.num_bytes, self.num_lost,
+                self.num_resent, self.num_incomplete, self.num_bursts,
+                self.longest_burst, num_discarded
+            )
+            if self._sequence == sequence:
+                return snapshot
+
+    @property
+    def num_missing(self):
+        return self.snapshot().num_missing
+
+    @property
+    def drop_rate(self):
+        return self.snapshot().drop_rate
+
+    def sample_loss_rate(self):
+        """
+        Returns the number of lost frames per second since the previous
+        call; it should be called on a single thread.
+        """
+        now = time.perf_counter()
+        num_lost = self.snapshot().num_missing
+        elapsed = now - self._sample_time
+        rate = (num_lost - self._sample_lost) / elapsed if elapsed > 0. \
+            else 0.
+        self._sample_time = now
+        self._sample_lost = num_lost
+        return rate
+
+
+class IncompleteBufferCallback(Callback):
+    """
+    Counts the incomplete buffers that Harvester discards before they
+    can be fetched.
+    """
+    def __init__(self, counter):
+        #
+        super().__init__()
+
+        #
+        self._counter = counter
+
+    def emit(self, context=None):
+        self._counter.count_discarded()
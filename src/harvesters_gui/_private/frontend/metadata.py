@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import io
+import os
+import queue
+import threading
+import time
+import zipfile
+
+# Related third party imports
+import numpy as np
+
+from genicam.genapi import GenericException
+
+# Local application/library specific imports
+from harvesters.util.logging import get_logger
+from harvesters_gui._private.frontend.recording import get_frame_id, \
+    get_timestamp_ns
+from harvesters_gui._private.frontend.scheduling import set_cpu_affinity
+
+
+# The chunk values are read from the nodes named Chunk + name; a value is
+# NaN if the device has not delivered it:
+default_chunk_names = ['ExposureTime', 'Gain', 'LineStatusAll']
+
+metadata_extensions = ['.csv', '.npz']
+
+# The columns that every table has:
+_base_columns = [
+    ('frame_id', '<i8'),
+    ('timestamp_ns', '<u8'),
+    ('host_time_ns', '<u8'),
+    ('payload_size', '<u8'),
+]
+
+
+def _get_chunk_nodes(node_map, chunk_names):
+    nodes = []
+    for name in chunk_names:
+        try:
+            nodes.append(getattr(node_map, 'Chunk' + name))
+        except (AttributeError, GenericException):
+            nodes.append(None)
+    return nodes
+
+
+class MetadataTable:
+    """
+    Collects the metadata of every buffer, including chunk values, into
+    preallocated columns. Once the columns are full or the flush interval
+    has passed, they're handed over to a thread that appends them to a
+    CSV or NPZ file while another set of columns takes the new rows. A
+    row is dropped if no set of columns is free.
+
+    An NPZ file holds the rows as parts named part000000 and so on; see
+    load_metadata.
+    """
+    def __init__(
+            self, file_path, *, node_map=None, chunk_names=None,
+            capacity=4096, flush_interval_s=1., num_sets=3, logger=None
+    ):
+        #
+        self._logger = logger or get_logger(name='harvesters')
+
+        #
+        self._file_path = file_path
+        self._extension = os.path.splitext(file_path)[1].lower()
+        if self._extension not in metadata_extensions:
+            raise ValueError(
+                '{0} is not a supported extension.'.format(self._extension)
+            )
+
+        #
+        if chunk_names is None:
+            chunk_names = default_chunk_names
+        self._chunk_names = list(chunk_names)
+        self._chunk_nodes = _get_chunk_nodes(node_map, self._chunk_names) \
+            if node_map else [None] * len(self._chunk_names)
+        self._dtype = np.dtype(
+            _base_columns + [(name, '<f8') for name in self._chunk_names]
+        )
+
+        #
+        self._capacity = capacity
+        self._flush_interval_s = flush_interval_s
+        self._free_sets = queue.Queue()
+        for _ in range(num_sets):
+            self._free_sets.put({
+                name: np.empty(capacity, dtype=self._dtype[name])
+                for name in self._dtype.names
+            })
+        self._columns = self._free_sets.get()
+        self._num_rows = 0
+
+        # The rows are written on the fetch thread and flushed on it or on
+        # the thread that closes the table:
+        self._lock = threading.Lock()
+        self._last_flush = time.perf_counter()
+
+        #
+        self._num_written = 0
+        self._num_dropped = 0
+        self._num_parts = 0
+        self._error = None
+
+        # The file is truncated here so that it's only appended later:
+        if self._extension == '.npz':
+            zipfile.ZipFile(file_path, 'w').close()
+        else:
+            with open(file_path, 'w') as file:
+                file.write(','.join(self._dtype.names) + '\n')
+
+        #
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name='MetadataTable', daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    @property
+    def chunk_names(self):
+        return self._chunk_names
+
+    @property
+    def num_written(self):
+        return self._num_written
+
+    @property
+    def num_dropped(self):
+        return self._num_dropped
+
+    @property
+    def error(self):
+        return self._error
+
+    def write(self, buffer):
+        """
+        Appends a row for the buffer; it's called on the fetch thread
+        right after the chunk data of the buffer has been updated.
+        """
+        with self._lock:
+            self._write(buffer)
+
+    def _write(self, buffer):
+        if self._thread is None:
+            # It has been closed:
+            return
+        if self._columns is None:
+            try:
+                self._columns = self._free_sets.get_nowait()
+            except queue.Empty:
+                self._num_dropped += 1
+                return
+
+        #
+        row = self._num_rows
+        columns = self._columns
+        columns['frame_id'][row] = get_frame_id(buffer)
+        columns['timestamp_ns'][row] = get_timestamp_ns(buffer)
+        columns['host_time_ns'][row] = int(time.time() * 1e9)
+        columns['payload_size'][row] = sum(
+            c.data.nbytes for c in buffer.payload.components
+        ) if buffer.payload else 0
+        for name, node in zip(self._chunk_names, self._chunk_nodes):
+            value = np.nan
+            if node is not None:
+                try:
+                    value = float(node.value)
+                except (AttributeError, TypeError, ValueError,
+                        GenericException):
+                    pass
+            columns[name][row] = value
+        self._num_rows = row + 1
+
+        #
+        if self._num_rows == self._capacity or \
+                time.perf_counter() - self._last_flush > \
+                self._flush_interval_s:
+            self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._num_rows:
+            return
+        self._queue.put((self._columns, self._num_rows))
+        self._num_rows = 0
+        self._last_flush = time.perf_counter()
+        try:
+            self._columns = self._free_sets.get_nowait()
+        except queue.Empty:
+            self._columns = None
+
+    def _run(self):
+        set_cpu_affinity(None, self._logger)
+
+        #
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            #
+            columns, num_rows = item
+            rows = np.empty(num_rows, dtype=self._dtype)
+            for name in self._dtype.names:
+                rows[name] = columns[name][:num_rows]
+            self._free_sets.put(columns)
+            if self._error:
+                continue
+
+            #
+            try:
+                if self._extension == '.npz':
+                    self._append_part(rows)
+                else:
+                    self._append_csv(rows)
+            except OSError as e:
+                self._logger.error(e, exc_info=True)
+                self._error = e
+            else:
+                self._num_written += num_rows
+
+    def _append_part(self, rows):
+        file = io.BytesIO()
+        np.lib.format.write_array(file, rows)
+        with zipfile.ZipFile(self._file_path, 'a', allowZip64=True) \
+                as archive:
+            archive.writestr(
+                'part{0:06d}.npy'.format(self._num_parts), file.getvalue()
+            )
+        self._num_parts += 1
+
+    def _append_csv(self, rows):
+        formats = ['%d' if rows.dtype[name].kind in 'iu' else '%.9g'
+                   for name in rows.dtype.names]
+        with open(self._file_path, 'a') as file:
+            np.savetxt(file, rows, fmt=formats, delimiter=',')
+
+    def close(self):
+        """
+        Writes the rows that have not been written yet.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._flush()
+            self._queue.put(None)
+        thread.join()
+
+
+def load_metadata(file_path):
+    """
+    Returns the rows of a CSV or NPZ file that a MetadataTable object has
+    written as a structured array.
+    """
+    if os.path.splitext(file_path)[1].lower() == '.npz':
+        with np.load(file_path) as archive:
+            parts = [archive[name] for name in sorted(archive.files)]
+        return np.concatenate(parts) if parts else np.zeros(0)
+
+    # The chunk values are always floating point numbers:
+    with open(file_path) as file:
+        names = file.readline().strip().split(',')
+    base_columns = dict(_base_columns)
+    dtype = np.dtype([(name, base_columns.get(name, '<f8')) for name in names])
+    return np.loadtxt(
+        file_path, delimiter=',', skiprows=1, dtype=dtype, ndmin=1
+    )
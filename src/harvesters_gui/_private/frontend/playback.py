@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import mmap
+import threading
+import time
+
+# Related third party imports
+import numpy as np
+
+from genicam.gentl import PAYLOADTYPE_INFO_IDS, TimeoutException
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.recording import get_data_type
+from harvesters_gui._private.frontend.scheduling import set_cpu_affinity
+
+
+pacing_real_time = 'Real Time'
+pacing_as_fast_as_possible = 'As Fast As Possible'
+pacings = [pacing_real_time, pacing_as_fast_as_possible]
+
+
+class _PlaybackComponent:
+    def __init__(self, data, record):
+        #
+        self._width = int(record['width'])
+        self._height = int(record['height'])
+        self._data_format = record['data_format'].decode()
+        self._data_format_value = int(record['data_format_value'])
+
+        #
+        self._data = data.view(get_data_type(self._data_format))
+        self._num_components_per_pixel = \
+            self._data.size / max(self._width * self._height, 1)
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def data_format(self):
+        return self._data_format
+
+    @property
+    def data_format_value(self):
+        return self._data_format_value
+
+    @property
+    def num_components_per_pixel(self):
+        return self._num_components_per_pixel
+
+
+class _PlaybackPayload:
+    def __init__(self, component):
+        self._components = [component]
+
+    @property
+    def components(self):
+        return self._components
+
+
+class PlaybackBuffer:
+    """
+    Carries a recorded frame in the same way as a Buffer object of
+    Harvester does; the data is a view of the recording.
+    """
+    def __init__(self, index, data, record):
+        #
+        self._index = index
+        self._record = record
+        self._payload = _PlaybackPayload(_PlaybackComponent(data, record))
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def frame_id(self):
+        return int(self._record['frame_id'])
+
+    @property
+    def timestamp_ns(self):
+        return int(self._record['timestamp_ns'])
+
+    @property
+    def payload_type(self):
+        return PAYLOADTYPE_INFO_IDS.PAYLOAD_TYPE_IMAGE
+
+    @property
+    def payload(self):
+        return self._payload
+
+    def queue(self):
+        # The data belongs to the recording so there's nothing to give back:
+        pass
+
+
+class PlaybackAcquirer:
+    """
+    Replays a recording in place of an ImageAcquirer object. The frames
+    are delivered at the pace that they were recorded, or one per call as
+    fast as the caller takes them. A thread touches the frames that are
+    coming next so that the caller does not wait for the storage.
+    """
+    def __init__(
+            self, recording, *,
+            pacing=pacing_real_time, speed=1., loop=True,
+            read_ahead=8, nominal_fps=30.
+    ):
+        #
+        self._recording = recording
+        self._pacing = pacing
+        self._speed = speed
+        self._loop = loop
+        self._read_ahead = read_ahead
+
+        # Use the timestamps if the device has delivered them; otherwise
+        # pretend the frames were delivered at the nominal frame rate:
+        timestamps = recording.index['timestamp_ns'].astype(np.float64)
+        if timestamps.size > 1 and np.all(np.diff(timestamps) > 0):
+            self._times = (timestamps - timestamps[0]) * 1e-9
+        else:
+            self._times = np.arange(len(recording)) / nominal_fps
+
+        # The last frame is displayed as long as the others on average:
+        self._interval = self._times[-1] / (self._times.size - 1) \
+            if self._times.size > 1 else 1. / nominal_fps
+
+        #
+        self._lock = threading.Lock()
+        self._is_acquiring = False
+        self._position = -1
+        self._seek = None
+        self._clock_origin = 0.
+        self._time_origin = 0.
+
+        #
+        self._wake_up = threading.Event()
+        self._is_reading_ahead = True
+        self._thread = threading.Thread(
+            target=self._run_read_ahead, name='ReadAhead', daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def recording(self):
+        return self._recording
+
+    @property
+    def num_frames(self):
+        return len(self._recording)
+
+    @property
+    def position(self):
+        """
+        The index of the frame that has been delivered last; it's -1 if
+        nothing has been delivered yet.
+        """
+        return self._position
+
+    @property
+    def pacing(self):
+        return self._pacing
+
+    @pacing.setter
+    def pacing(self, value):
+        with self._lock:
+            self._pacing = value
+            self._restart_clock(max(self._position, 0))
+
+    @property
+    def speed(self):
+        return self._speed
+
+    @speed.setter
+    def speed(self, value):
+        with self._lock:
+            self._speed = value
+            self._restart_clock(max(self._position, 0))
+
+    @property
+    def loop(self):
+        return self._loop
+
+    @loop.setter
+    def loop(self, value):
+        self._loop = value
+
+    def is_acquiring(self):
+        return self._is_acquiring
+
+    def start(self):
+        with self._lock:
+            if self._position >= self.num_frames - 1:
+                self._position = -1
+            self._restart_clock(max(self._position, 0))
+            self._is_acquiring = True
+
+    def stop(self):
+        self._is_acquiring = False
+
+    def seek(self, frame):
+        """
+        Delivers the given frame next even if the playback is stopped.
+        """
+        with self._lock:
+            self._seek = min(max(int(frame), 0), self.num_frames - 1)
+
+    def _restart_clock(self, frame):
+        self._clock_origin = time.perf_counter()
+        self._time_origin = self._times[frame] if self._times.size else 0.
+
+    def _next_frame(self):
+        num_frames = self.num_frames
+        if num_frames == 0:
+            return None
+
+        #
+        with self._lock:
+            if self._seek is not None:
+                frame, self._seek = self._seek, None
+                self._restart_clock(frame)
+                return frame
+            if not self._is_acquiring:
+                return None
+
+            #
+            last = num_frames - 1
+            if self._pacing == pacing_as_fast_as_possible:
+                frame = self._position + 1
+            else:
+                elapsed = (time.perf_counter() - self._clock_origin) * \
+                    self._speed
+                frame = int(np.searchsorted(
+                    self._times, self._time_origin + elapsed, side='right'
+                )) - 1
+                if frame <= self._position:
+                    if self._position < last or \
+                            self._time_origin + elapsed <= \
+                            self._times[last] + self._interval:
+                        return None
+                    frame = last + 1
+
+            #
+            if frame > last:
+                if not self._loop:
+                    self._is_acquiring = False
+                    return None
+                frame = 0
+                self._restart_clock(frame)
+            return frame
+
+    def try_fetch(self, timeout=0):
+        """
+        Returns the frame that is due, otherwise None; it never waits.
+        """
+        frame = self._next_frame()
+        if frame is None:
+            return None
+
+        #
+        self._position = frame
+        self._wake_up.set()
+        return PlaybackBuffer(
+            frame, self._recording.get_data(frame),
+            self._recording.index[frame]
+        )
+
+    def fetch(self, timeout=0):
+        """
+        Waits for the next frame; TimeoutException is raised if no frame
+        is due within the timeout. It waits forever if the timeout is 0.
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            buffer = self.try_fetch()
+            if buffer:
+                return buffer
+            if timeout > 0 and time.perf_counter() > deadline:
+                raise TimeoutException
+            time.sleep(0.0005)
+
+    def _run_read_ahead(self):
+        set_cpu_affinity(None)
+        while True:
+            self._wake_up.wait()
+            self._wake_up.clear()
+            if not self._is_reading_ahead:
+                return
+
+            # Touch a byte of every page so that the pages are in memory
+            # before they're needed:
+            start = self._position + 1
+            for frame in range(start, start + self._read_ahead):
+                if frame >= self.num_frames or not self._is_reading_ahead:
+                    break
+                data = self._recording.get_stored_data(frame)
+                int(data[::mmap.PAGESIZE].sum())
+
+    def destroy(self):
+        self._is_acquiring = False
+        self._is_reading_ahead = False
+        self._wake_up.set()
+        self._thread.join()
+        self._recording.close()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+
+# Related third party imports
+
+# Local application/library specific imports
+
+
+# The layouts that the fragment shader understands; the mosaic is a
+# monochrome image of 2x2 cells while the other one carries the four
+# angles in every pixel:
+layout_none = 0
+layout_mosaic = 1
+layout_angles = 2
+
+# Name: (layout, bits per pixel); the mosaic formats are custom formats
+# so they are identified by the names that the device gives them:
+_polarized_formats = {
+    'PolarizeMono8': (layout_mosaic, 8),
+    'PolarizeMono12': (layout_mosaic, 12),
+    'PolarizeMono16': (layout_mosaic, 16),
+    'PolarizedAngles_0d_45d_90d_135d_Mono8': (layout_angles, 8),
+    'PolarizedAngles_0d_45d_90d_135d_Mono10': (layout_angles, 10),
+    'PolarizedAngles_0d_45d_90d_135d_Mono12': (layout_angles, 12),
+    'PolarizedAngles_0d_45d_90d_135d_Mono16': (layout_angles, 16),
+}
+
+# The index of each view is passed to the fragment shader:
+polarization_views = [
+    'Raw', 'Angle 0', 'Angle 45', 'Angle 90', 'Angle 135',
+    'Intensity', 'DoLP', 'AoLP',
+]
+
+
+def get_polarization_layout(data_format):
+    return _polarized_formats.get(data_format, (layout_none, None))[0]
+
+
+def get_polarized_bits_per_pixel(data_format):
+    return _polarized_formats.get(data_format, (layout_none, None))[1]
@@ -232,6 +232,12 @@ class AttributeController(QMainWindow):
     def collapse_all(self):
         self._view.collapseAll()
 
+    def update_values(self):
+        # The model reads the values from the node map when the view paints
+        # them so repainting the view is enough; we do not have to re-layout
+        # the whole tree every time the application writes a feature:
+        self._view.viewport().update()
+
     def resize_column_width(self):
         for i in range(self._model.columnCount()):
             self._view.resizeColumnToContents(i)
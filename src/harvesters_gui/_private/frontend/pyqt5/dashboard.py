@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import datetime
+
+# Related third party imports
+import numpy as np
+
+from PyQt5.QtCore import Qt, QPointF, QTimer
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import QGridLayout, QLabel, QWidget
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.pyqt5.helper import get_system_font
+from harvesters_gui._private.frontend.statistics_history import \
+    metric_dropped, metric_fps, metric_latency, metric_temperature, \
+    metric_throughput
+
+
+# Metric, title, format of the value:
+_rows = [
+    (metric_fps, 'Frame rate', '{0:.1f} fps'),
+    (metric_throughput, 'Throughput', '{0:.1f} MB/s'),
+    (metric_dropped, 'Dropped', '{0:.1f} /s'),
+    (metric_latency, 'Latency', '{0:.1f} ms'),
+    (metric_temperature, 'Temperature', '{0:.1f} °C'),
+]
+
+
+class _Sparkline(QWidget):
+    def __init__(self, parent=None):
+        #
+        super().__init__(parent)
+        self.setMinimumSize(160, 32)
+
+        #
+        self._lows = np.zeros(0)
+        self._highs = np.zeros(0)
+
+    def set_envelope(self, lows, highs):
+        self._lows = lows
+        self._highs = highs
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(32, 32, 32))
+        finite = np.isfinite(self._highs)
+        if not finite.any():
+            return
+
+        # Widen a flat range so that its line is drawn in the middle:
+        bottom = float(np.nanmin(self._lows))
+        top = float(np.nanmax(self._highs))
+        if top - bottom < 1e-9:
+            bottom, top = bottom - 1., top + 1.
+        width, height = self.width(), self.height()
+        scale_y = (height - 4) / (top - bottom)
+        step_x = width / max(self._highs.size - 1, 1)
+
+        # Every column spans the lowest to the highest sample of its part
+        # of the history:
+        painter.setPen(QPen(QColor(96, 192, 96), 1.))
+        line = QPolygonF()
+        for i in np.flatnonzero(finite):
+            x = i * step_x
+            low = height - 2 - (self._lows[i] - bottom) * scale_y
+            high = height - 2 - (self._highs[i] - bottom) * scale_y
+            if high < low - 1.:
+                painter.drawLine(QPointF(x, low), QPointF(x, high))
+            line.append(QPointF(x, (low + high) / 2.))
+        painter.drawPolyline(line)
+
+
+class Dashboard(QWidget):
+    """
+    Shows the history of every metric that a StatisticsHistory object
+    keeps as a sparkline with its latest value and range.
+    """
+    def __init__(self, history, parent=None, *, update_cycle_ms=2000):
+        #
+        super().__init__(parent)
+        self.setFont(get_system_font())
+
+        #
+        self._history = history
+        self._sparklines = {}
+        self._values = {}
+
+        #
+        layout = QGridLayout()
+        for row, (metric, title, _) in enumerate(_rows):
+            label = QLabel(title, self)
+            label.setFont(get_system_font())
+            value = QLabel(self)
+            value.setFont(get_system_font())
+            value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            sparkline = _Sparkline(self)
+            layout.addWidget(label, row, 0)
+            layout.addWidget(sparkline, row, 1)
+            layout.addWidget(value, row, 2)
+            self._sparklines[metric] = sparkline
+            self._values[metric] = value
+        self._span = QLabel(self)
+        self._span.setFont(get_system_font())
+        layout.addWidget(self._span, len(_rows), 0, 1, 3)
+        layout.setColumnStretch(1, 1)
+        self.setLayout(layout)
+
+        #
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._update_view)
+        self._timer.start(update_cycle_ms)
+
+    def _update_view(self):
+        if not self.isVisible():
+            return
+
+        #
+        for metric, _, form in _rows:
+            sparkline = self._sparklines[metric]
+            lows, highs = self._history.get_envelope(
+                metric, max(sparkline.width(), 2)
+            )
+            sparkline.set_envelope(lows, highs)
+
+            # Tell the latest value that is known:
+            _, values = self._history.get(metric)
+            values = values[np.isfinite(values)]
+            if values.size == 0:
+                self._values[metric].setText('n/a')
+                continue
+            self._values[metric].setText('{0}\n{1} - {2}'.format(
+                form.format(values[-1]), form.format(values.min()),
+                form.format(values.max())
+            ))
+
+        #
+        times, _ = self._history.get(metric_fps)
+        if times.size:
+            self._span.setText('The last {0}, a sample every {1:g} s'.format(
+                datetime.timedelta(seconds=int(times[-1] - times[0])),
+                self._history.interval_s
+            ))
+        else:
+            self._span.setText('No samples have been taken yet.')
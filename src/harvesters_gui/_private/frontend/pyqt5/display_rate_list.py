@@ -45,4 +45,5 @@ class ComboBoxDisplayRateList(QComboBox):
         else:
             display_rate = 60.
         self.parent().parent().canvas.display_rate = display_rate
+        self.parent().parent().point_cloud_canvas.display_rate = display_rate
 
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import os
+import threading
+
+# Related third party imports
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QCheckBox, QComboBox, QDialog, QFileDialog, \
+    QFormLayout, QHBoxLayout, QLineEdit, QProgressBar, QPushButton, \
+    QSpinBox, QVBoxLayout
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.export import export_extensions, \
+    export_recording
+from harvesters_gui._private.frontend.pyqt5.helper import get_system_font
+
+
+class ExportDialog(QDialog):
+    """
+    Exports a recording as a sequence of images. The export runs on a
+    thread that drives a pool of processes so the GUI keeps responding.
+    """
+    _signal_progress = pyqtSignal(int, int)
+    _signal_finished = pyqtSignal(str)
+
+    def __init__(self, parent=None, file_path=''):
+        #
+        super().__init__(parent)
+        self.setWindowTitle('Export Recording')
+        self.setFont(get_system_font())
+
+        #
+        self._thread = None
+        self._is_cancelled = False
+
+        #
+        self._recording = QLineEdit(file_path, self)
+        button_recording = QPushButton('...', self)
+        button_recording.clicked.connect(self._browse_recording)
+        layout_recording = QHBoxLayout()
+        layout_recording.addWidget(self._recording)
+        layout_recording.addWidget(button_recording)
+
+        #
+        self._directory = QLineEdit(self)
+        button_directory = QPushButton('...', self)
+        button_directory.clicked.connect(self._browse_directory)
+        layout_directory = QHBoxLayout()
+        layout_directory.addWidget(self._directory)
+        layout_directory.addWidget(button_directory)
+
+        #
+        self._formats = QComboBox(self)
+        for extension in export_extensions:
+            self._formats.addItem(extension[1:].upper(), extension)
+        self._debayer = QCheckBox('Save Bayer images as RGB images', self)
+        self._processes = QSpinBox(self)
+        self._processes.setRange(1, max(os.cpu_count() or 1, 1))
+        self._processes.setValue(self._processes.maximum())
+
+        #
+        layout_form = QFormLayout()
+        layout_form.addRow('Recording', layout_recording)
+        layout_form.addRow('Directory', layout_directory)
+        layout_form.addRow('Format', self._formats)
+        layout_form.addRow('', self._debayer)
+        layout_form.addRow('Processes', self._processes)
+
+        #
+        self._progress = QProgressBar(self)
+        self._button_export = QPushButton('Export', self)
+        self._button_export.clicked.connect(self._export)
+        self._button_cancel = QPushButton('Cancel', self)
+        self._button_cancel.clicked.connect(self._cancel)
+        layout_buttons = QHBoxLayout()
+        layout_buttons.addStretch()
+        layout_buttons.addWidget(self._button_export)
+        layout_buttons.addWidget(self._button_cancel)
+
+        #
+        layout_main = QVBoxLayout()
+        layout_main.addLayout(layout_form)
+        layout_main.addWidget(self._progress)
+        layout_main.addLayout(layout_buttons)
+        self.setLayout(layout_main)
+
+        #
+        self._signal_progress.connect(self._update_progress)
+        self._signal_finished.connect(self._finish)
+        self.set_recording(file_path)
+
+    def set_recording(self, file_path):
+        """
+        Offers the recording unless an export is running.
+        """
+        if self.is_exporting() or not file_path:
+            return
+        self._recording.setText(file_path)
+        self._directory.setText(os.path.splitext(file_path)[0])
+
+    def is_exporting(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _browse_recording(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, 'Select a recording', self._recording.text(),
+            'Recordings (*.hrv)'
+        )
+        if file_path:
+            self._recording.setText(file_path)
+            if not self._directory.text():
+                self._directory.setText(os.path.splitext(file_path)[0])
+
+    def _browse_directory(self):
+        directory = QFileDialog.getExistingDirectory(
+            self, 'Select a directory', self._directory.text()
+        )
+        if directory:
+            self._directory.setText(directory)
+
+    def _export(self):
+        if self.is_exporting():
+            return
+        if not self._recording.text() or not self._directory.text():
+            return
+
+        #
+        self._is_cancelled = False
+        self._button_export.setEnabled(False)
+        self._progress.setValue(0)
+        self._progress.setFormat('%p%')
+        self._thread = threading.Thread(
+            target=self._run, name='Export', daemon=True, args=(
+                self._recording.text(), self._directory.text(),
+                self._formats.currentData(), self._debayer.isChecked(),
+                self._processes.value()
+            )
+        )
+        self._thread.start()
+
+    def _run(self, file_path, directory, extension, debayer, processes):
+        message = ''
+        try:
+            export_recording(
+                file_path, directory, extension=extension, debayer=debayer,
+                processes=processes, on_progress=self._signal_progress.emit,
+                is_cancelled=lambda: self._is_cancelled
+            )
+        except Exception as e:
+            # The dialog must be told that it's over anyway:
+            message = str(e) or type(e).__name__
+        self._signal_finished.emit(message)
+
+    def _update_progress(self, done, total):
+        self._progress.setMaximum(max(total, 1))
+        self._progress.setValue(done)
+
+    def _finish(self, message):
+        self._button_export.setEnabled(True)
+        self._progress.setFormat(message if message else '%v / %m')
+
+    def _cancel(self):
+        if self.is_exporting():
+            self._is_cancelled = True
+        else:
+            self.reject()
+
+    def closeEvent(self, event):
+        self._is_cancelled = True
+        super().closeEvent(event)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+
+# Related third party imports
+import numpy as np
+
+from PyQt5.QtCore import Qt, QRectF, QTimer
+from PyQt5.QtGui import QColor, QPainter, QPen
+from PyQt5.QtWidgets import QComboBox, QLabel, QVBoxLayout, QWidget
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.latency import stage_display, stages
+from harvesters_gui._private.frontend.pyqt5.helper import get_system_font
+
+
+class _Histogram(QWidget):
+    def __init__(self, parent=None):
+        #
+        super().__init__(parent)
+        self.setMinimumSize(240, 120)
+
+        #
+        self._counts = np.zeros(0)
+        self._edges = np.zeros(1)
+        self._limit_ms = None
+
+    def set_histogram(self, counts, edges, limit_ms):
+        self._counts = counts
+        self._edges = edges
+        self._limit_ms = limit_ms
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(32, 32, 32))
+        if self._counts.size == 0 or self._edges[-1] <= 0.:
+            return
+
+        #
+        width, height = self.width(), self.height()
+        scale_x = width / self._edges[-1]
+        peak = max(int(self._counts.max()), 1)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(96, 192, 96))
+        for count, start, end in zip(
+                self._counts, self._edges[:-1], self._edges[1:]):
+            bar = height * count / peak
+            painter.drawRect(QRectF(
+                start * scale_x, height - bar,
+                max((end - start) * scale_x - 1., 1.), bar
+            ))
+
+        #
+        if self._limit_ms is not None:
+            painter.setPen(QPen(QColor(224, 64, 64), 1., Qt.DashLine))
+            x = self._limit_ms * scale_x
+            painter.drawLine(int(x), 0, int(x), height)
+
+
+class LatencyView(QWidget):
+    """
+    Shows the histogram of the latencies that a LatencyMonitor object has
+    measured for a stage and how many of them are below the limit.
+    """
+    def __init__(
+            self, monitor, parent=None, *, limit_ms=50., max_ms=100.,
+            update_cycle_ms=500
+    ):
+        #
+        super().__init__(parent)
+        self.setFont(get_system_font())
+
+        #
+        self._monitor = monitor
+        self._limit_ms = limit_ms
+        self._max_ms = max_ms
+
+        #
+        self._stages = QComboBox(self)
+        self._stages.setFont(get_system_font())
+        for stage in stages:
+            self._stages.addItem(stage.capitalize(), stage)
+        self._stages.setCurrentIndex(stages.index(stage_display))
+        self._stages.setToolTip(
+            'Select the stage that the latency is measured to'
+        )
+        self._histogram = _Histogram(self)
+        self._label = QLabel(self)
+        self._label.setFont(get_system_font())
+
+        #
+        layout = QVBoxLayout()
+        layout.addWidget(self._stages)
+        layout.addWidget(self._histogram)
+        layout.addWidget(self._label)
+        self.setLayout(layout)
+
+        #
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._update_view)
+        self._timer.start(update_cycle_ms)
+
+    def _update_view(self):
+        if not self.isVisible():
+            return
+
+        #
+        stage = self._stages.currentData()
+        counts, edges = self._monitor.get_histogram(
+            stage, max_ms=self._max_ms
+        )
+        self._histogram.set_histogram(counts, edges, self._limit_ms)
+
+        #
+        p50, p99 = self._monitor.get_percentiles(stage)
+        ratio = self._monitor.get_ratio_below(self._limit_ms, stage)
+        if np.isnan(p50):
+            self._label.setText('No frames have been measured yet.')
+            return
+        self._label.setText(
+            'p50 {0:.1f} ms, p99 {1:.1f} ms, {2:.1%} below {3:.0f} ms\n'
+            '0 - {4:.0f} ms, {5}'.format(
+                p50, p99, ratio, self._limit_ms, self._max_ms,
+                'device clock latched' if self._monitor.is_latching else
+                'from the fastest delivery'
+            )
+        )
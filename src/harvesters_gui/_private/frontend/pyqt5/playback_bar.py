@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+
+# Related third party imports
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QAction, QComboBox, QLabel, QSlider, QToolBar
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.playback import pacings
+from harvesters_gui._private.frontend.pyqt5.helper import get_system_font
+from harvesters_gui._private.frontend.pyqt5.icon import Icon
+
+
+class PlaybackToolBar(QToolBar):
+    """
+    Controls a PlaybackAcquirer object: play/pause, the pacing and a
+    timeline to scrub through the recording.
+    """
+    def __init__(self, parent=None, update_cycle_ms=100):
+        #
+        super().__init__('Playback', parent)
+        self.setFont(get_system_font())
+
+        #
+        self._acquirer = None
+
+        #
+        self._action_play = QAction(Icon('start_acquisition.png'), 'Play', self)
+        self._action_play.setCheckable(True)
+        self._action_play.setToolTip('Play/Pause the recording')
+        self._action_play.triggered.connect(self._play)
+        self.addAction(self._action_play)
+
+        #
+        self._pacings = QComboBox(self)
+        self._pacings.setFont(get_system_font())
+        for pacing in pacings:
+            self._pacings.addItem(pacing)
+        self._pacings.setToolTip('Select how fast the frames are delivered')
+        self._pacings.currentTextChanged.connect(self._set_pacing)
+        self.addWidget(self._pacings)
+
+        #
+        self._timeline = QSlider(Qt.Horizontal, self)
+        self._timeline.setToolTip('Drag to jump to a frame')
+        self._timeline.sliderMoved.connect(self._seek)
+        self.addWidget(self._timeline)
+
+        #
+        self._label = QLabel(self)
+        self._label.setFont(get_system_font())
+        self.addWidget(self._label)
+
+        # Follow the position while it's playing:
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._update_position)
+        self._timer.start(update_cycle_ms)
+
+        #
+        self.set_acquirer(None)
+
+    def set_acquirer(self, acquirer):
+        self._acquirer = acquirer
+        enable = True if acquirer else False
+        for widget in [self._action_play, self._pacings, self._timeline]:
+            widget.setEnabled(enable)
+
+        #
+        if acquirer:
+            self._timeline.setRange(0, max(acquirer.num_frames - 1, 0))
+            self._pacings.setCurrentText(acquirer.pacing)
+        self._update_position()
+
+    def _play(self, checked):
+        if not self._acquirer:
+            return
+        if checked:
+            self._acquirer.start()
+        else:
+            self._acquirer.stop()
+
+    def _set_pacing(self, value):
+        if self._acquirer:
+            self._acquirer.pacing = value
+
+    def _seek(self, value):
+        if self._acquirer:
+            self._acquirer.seek(value)
+
+    def _update_position(self):
+        if not self._acquirer:
+            self._label.setText('')
+            self._action_play.setChecked(False)
+            return
+
+        #
+        position = max(self._acquirer.position, 0)
+        if not self._timeline.isSliderDown():
+            self._timeline.setValue(position)
+        self._label.setText(
+            ' {0} / {1} '.format(position + 1, self._acquirer.num_frames)
+        )
+        self._action_play.setChecked(self._acquirer.is_acquiring())
@@ -19,23 +19,128 @@
 
 
 # Standard library imports
+import threading
+import time
 
 # Related third party imports
-from PyQt5.QtCore import QMutexLocker, QThread
+from PyQt5.QtCore import QMutex, QThread
 
 # Local application/library specific imports
 from harvesters.core import ThreadBase
+from harvesters_gui._private.frontend.scheduling import set_cpu_affinity
 
+try:
+    from harvesters.core import Callback
+except ImportError:
+    # Older versions of Harvester do not call back anything:
+    Callback = object
+
+
+# Tells the code that a worker calls which _ThreadImpl object runs it:
+_local = threading.local()
+
+# The first wait of a backoff; a shorter one hardly saves anything:
+_min_backoff_us = 50
+
+
+def report_activity():
+    """
+    Tells the thread that runs the calling worker that the worker has had
+    something to do so that the thread does not back off; it does nothing
+    on other threads.
+    """
+    thread = getattr(_local, 'thread', None)
+    if thread:
+        thread.has_been_active = True
+
+
+class LockStatistics:
+    """
+    Tells how often and how long the threads have waited for the mutex of
+    a thread; it's only updated while the mutex is held.
+    """
+    __slots__ = ('num_acquired', 'num_contended', 'wait_s', 'max_wait_s')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.num_acquired = 0
+        self.num_contended = 0
+        self.wait_s = 0.
+        self.max_wait_s = 0.
+
+    @property
+    def contention_rate(self):
+        return self.num_contended / self.num_acquired \
+            if self.num_acquired else 0.
+
+    def __str__(self):
+        return '{0} acquired, {1} contended ({2:.2%}), waited {3:.3f} ms ' \
+               'in total and {4:.3f} ms at most'.format(
+                    self.num_acquired, self.num_contended,
+                    self.contention_rate, self.wait_s * 1e3,
+                    self.max_wait_s * 1e3
+                )
+
+
+class _MeasuredMutexLocker:
+    """
+    Locks the mutex like QMutexLocker does; if another thread holds it,
+    the time until it has been released is added to the statistics.
+    """
+    def __init__(self, mutex, statistics):
+        #
+        if not mutex.tryLock():
+            started = time.perf_counter()
+            mutex.lock()
+            waited = time.perf_counter() - started
+            statistics.num_contended += 1
+            statistics.wait_s += waited
+            if waited > statistics.max_wait_s:
+                statistics.max_wait_s = waited
+        statistics.num_acquired += 1
 
-class _PyQtThread(ThreadBase):
-    def __init__(self, parent=None, mutex=None, worker=None, update_cycle_us=1):
         #
-        super().__init__(mutex=mutex)
+        self._mutex = mutex
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.unlock()
+
+    def __del__(self):
+        self.unlock()
+
+    def unlock(self):
+        mutex, self._mutex = self._mutex, None
+        if mutex:
+            mutex.unlock()
+
+
+class ActivityCallback(Callback):
+    """
+    Reports activity to the thread that Harvester calls it back on, e.g.
+    on NEW_BUFFER_AVAILABLE.
+    """
+    def emit(self, context=None):
+        report_activity()
+
+
+class _PyQtThread(ThreadBase):
+    def __init__(
+            self, parent=None, mutex=None, worker=None, update_cycle_us=1,
+            max_backoff_us=None, settings=None
+    ):
+        # Every thread has its own mutex unless it's told to share one:
+        super().__init__(mutex=mutex or QMutex())
 
         #
         self._thread = _ThreadImpl(
             parent=parent, base=self, worker=worker,
-            update_cycle_us=update_cycle_us
+            update_cycle_us=update_cycle_us, max_backoff_us=max_backoff_us,
+            settings=settings
         )
 
     def acquire(self):
@@ -60,6 +165,22 @@ class _PyQtThread(ThreadBase):
     def id_(self):
         return self._thread.id_
 
+    @property
+    def lock_statistics(self):
+        return self._thread.lock_statistics
+
+    @property
+    def max_backoff_us(self):
+        return self._thread.max_backoff_us
+
+    @max_backoff_us.setter
+    def max_backoff_us(self, value):
+        self._thread.max_backoff_us = value
+
+    @property
+    def settings(self):
+        return self._thread.settings
+
     def is_running(self) -> bool:
         return self._is_running
 
@@ -77,8 +198,21 @@ class _PyQtThread(ThreadBase):
 
 
 class _ThreadImpl(QThread):
+    """
+    Calls the worker over and over and waits update_cycle_us in between;
+    a stop request ends the wait at once. Workers that block by themselves,
+    such as the ones that wait for a buffer, can run with no wait at all.
+
+    If max_backoff_us is given, the wait is doubled up to it every time
+    the worker has not reported activity, see report_activity, and goes
+    back to update_cycle_us once it has, so a worker that returns at once
+    while there's nothing to do does not keep a core busy.
+
+    The priority and the CPU affinity of the given ThreadSettings object
+    are applied every time the thread starts.
+    """
     def __init__(self, parent=None, base=None, worker=None,
-                 update_cycle_us=1):
+                 update_cycle_us=1, max_backoff_us=None, settings=None):
         #
         super().__init__(parent)
 
@@ -86,23 +220,83 @@ class _ThreadImpl(QThread):
         self._worker = worker
         self._base = base
         self._update_cycle_us = update_cycle_us
+        self._max_backoff_us = max_backoff_us
+        self._settings = settings
+        self._stop_event = threading.Event()
+        self.has_been_active = False
+
+        # The locker that holds the mutex; there's one at most:
+        self._locker = None
+        self._lock_statistics = LockStatistics()
+
+    @property
+    def lock_statistics(self):
+        return self._lock_statistics
+
+    @property
+    def max_backoff_us(self):
+        return self._max_backoff_us
+
+    @max_backoff_us.setter
+    def max_backoff_us(self, value):
+        self._max_backoff_us = value
+
+    @property
+    def settings(self):
+        return self._settings
+
+    def start(self, priority=None):
+        self._stop_event.clear()
+        if priority is None and self._settings:
+            priority = self._settings.priority
+        super().start(
+            QThread.InheritPriority if priority is None else priority
+        )
 
     def stop(self):
-        with QMutexLocker(self._base.mutex):
+        with _MeasuredMutexLocker(self._base.mutex, self._lock_statistics):
             self._base._is_running = False
+        self._stop_event.set()
 
     def run(self):
+        _local.thread = self
+        # A thread with no settings must not keep the CPUs of the thread
+        # that has started it:
+        set_cpu_affinity(self._settings.cpus if self._settings else None)
+        wait_us = self._update_cycle_us
         while self._base.is_running():
-            if self._worker:
-                self._worker()
-                # Force the current thread to sleep for some microseconds:
-                self.usleep(self._update_cycle_us)
+            worker = self._worker
+            if not worker:
+                # There's nothing to do until a worker is given:
+                self._stop_event.wait(0.01)
+                continue
+
+            #
+            self.has_been_active = False
+            worker()
+
+            #
+            max_backoff_us = self._max_backoff_us
+            if max_backoff_us is None or self.has_been_active:
+                wait_us = self._update_cycle_us
+            else:
+                wait_us = min(
+                    max(wait_us * 2, _min_backoff_us), max_backoff_us
+                )
+            if wait_us > 0:
+                self._stop_event.wait(wait_us / 1e6)
 
     def acquire(self):
-        return QMutexLocker(self._base.mutex)
+        locker = _MeasuredMutexLocker(
+            self._base.mutex, self._lock_statistics
+        )
+        self._locker = locker
+        return locker
 
     def release(self):
-        pass
+        locker, self._locker = self._locker, None
+        if locker:
+            locker.unlock()
 
     @property
     def worker(self):
@@ -115,4 +309,3 @@ class _ThreadImpl(QThread):
     @property
     def id_(self):
         return int(self.currentThreadId())
-
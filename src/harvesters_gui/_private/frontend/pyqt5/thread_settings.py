@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+
+# Related third party imports
+from PyQt5.QtCore import QThread
+from PyQt5.QtWidgets import QComboBox, QDialog, QDialogButtonBox, \
+    QFormLayout, QLabel, QLineEdit, QVBoxLayout
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.pyqt5.helper import get_system_font
+from harvesters_gui._private.frontend.scheduling import format_cpu_list, \
+    get_available_cpus, is_affinity_supported, parse_cpu_list
+
+
+_priorities = [
+    ('Inherit', None),
+    ('Idle', QThread.IdlePriority),
+    ('Lowest', QThread.LowestPriority),
+    ('Low', QThread.LowPriority),
+    ('Normal', QThread.NormalPriority),
+    ('High', QThread.HighPriority),
+    ('Highest', QThread.HighestPriority),
+    ('Time critical', QThread.TimeCriticalPriority),
+]
+
+
+class ThreadSettingsDialog(QDialog):
+    """
+    Edits the ThreadSettings objects of the acquisition threads and of the
+    display thread; the objects are only updated once it's accepted.
+    """
+    def __init__(self, acquisition, display, parent=None):
+        #
+        super().__init__(parent)
+        self.setWindowTitle('Thread Settings')
+        self.setFont(get_system_font())
+
+        #
+        self._settings = [acquisition, display]
+        self._priorities = []
+        self._cpus = []
+
+        #
+        available = format_cpu_list(get_available_cpus())
+        layout_form = QFormLayout()
+        for title, settings in zip(['Acquisition', 'Display'], self._settings):
+            priorities = QComboBox(self)
+            for name, priority in _priorities:
+                priorities.addItem(name, priority)
+            if settings.priority is not None:
+                priorities.setCurrentIndex(max(
+                    priorities.findData(settings.priority), 0
+                ))
+            cpus = QLineEdit(format_cpu_list(settings.cpus), self)
+            cpus.setPlaceholderText('Any of ' + available)
+            cpus.setEnabled(is_affinity_supported())
+            layout_form.addRow(title + ' priority', priorities)
+            layout_form.addRow(title + ' CPUs', cpus)
+            self._priorities.append(priorities)
+            self._cpus.append(cpus)
+
+        #
+        note = QLabel(
+            'The acquisition threads are the ones that fetch the buffers; '
+            'they take the settings when image acquisition starts. The '
+            'display thread is the GUI thread. The other threads, such as '
+            'the ones that record or export, run on any CPU.', self
+        )
+        note.setWordWrap(True)
+        self._error = QLabel(self)
+
+        #
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel, parent=self
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        #
+        layout_main = QVBoxLayout()
+        layout_main.addLayout(layout_form)
+        layout_main.addWidget(note)
+        layout_main.addWidget(self._error)
+        layout_main.addWidget(buttons)
+        self.setLayout(layout_main)
+
+    def accept(self):
+        # Check every list before any setting is changed:
+        available = set(get_available_cpus())
+        cpu_lists = []
+        for edit in self._cpus:
+            try:
+                cpus = parse_cpu_list(edit.text())
+                if cpus and not set(cpus) <= available:
+                    raise ValueError('{0} is not available.'.format(
+                        format_cpu_list(sorted(set(cpus) - available))
+                    ))
+            except ValueError as e:
+                self._error.setText(str(e))
+                edit.setFocus()
+                return
+            cpu_lists.append(cpus)
+
+        #
+        for settings, priorities, cpus in zip(
+                self._settings, self._priorities, cpu_lists):
+            settings.priority = priorities.currentData()
+            settings.cpus = cpus
+        super().accept()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+import threading
+import time
+
+# Related third party imports
+import numpy as np
+
+# Local application/library specific imports
+from harvesters.util.logging import get_logger
+from harvesters_gui._private.frontend.compression import get_codec
+from harvesters_gui._private.frontend.recording import compress, describe, \
+    get_first_component, RecordingWriter
+from harvesters_gui._private.frontend.scheduling import set_cpu_affinity, \
+    unpinned
+
+
+class Recorder:
+    """
+    Appends every frame that it's given to a file. A frame is copied into
+    one of the slots of a preallocated block so that the buffer can be
+    queued right away; a writer thread writes the slots to the file in
+    large batches. A frame is dropped if every slot is in use, e.g. the
+    storage can't keep up with the device.
+
+    If a codec is given, the frames are compressed one by one on a thread
+    pool before they reach the writer thread. The frames are written as
+    they are while more than half of the slots are in use, i.e.,
+    compression can't keep up.
+    """
+    def __init__(
+            self, file_path, *,
+            memory_budget=512 * 2 ** 20, min_slots=4,
+            batch_size=64 * 2 ** 20, codec=None, num_compressors=None,
+            custom_data_formats=None, logger=None
+    ):
+        #
+        self._logger = logger or get_logger(name='harvesters')
+
+        #
+        self._file_path = file_path
+        self._memory_budget = memory_budget
+        self._min_slots = min_slots
+        self._batch_size = batch_size
+        self._custom_data_formats = custom_data_formats or {}
+
+        #
+        self._codec = get_codec(codec) if codec else None
+        self._num_compressors = num_compressors or \
+            max(1, (os.cpu_count() or 1) // 2)
+        self._compressors = None
+
+        # The slots are allocated once the size of the frames is known:
+        self._block = None
+        self._free_slots = None
+        self._queue = None
+
+        #
+        self._writer = None
+        self._thread = None
+        self._num_written = 0
+        self._num_dropped = 0
+        self._bytes_written = 0
+        self._bytes_stored = 0
+        self._num_uncompressed = 0
+        self._start_time = 0.
+        self._error = None
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    @property
+    def num_slots(self):
+        return 0 if self._block is None else self._block.shape[0]
+
+    @property
+    def queue_depth(self):
+        return 0 if self._queue is None else self._queue.qsize()
+
+    @property
+    def num_written(self):
+        return self._num_written
+
+    @property
+    def num_dropped(self):
+        return self._num_dropped
+
+    @property
+    def bytes_written(self):
+        # The size of the frames before compression:
+        return self._bytes_written
+
+    @property
+    def bytes_stored(self):
+        return self._bytes_stored
+
+    @property
+    def num_uncompressed(self):
+        """
+        The number of frames that have been written as they are because
+        compression could not keep up.
+        """
+        return self._num_uncompressed
+
+    @property
+    def compression_ratio(self):
+        return self._bytes_written / self._bytes_stored \
+            if self._bytes_stored else 1.
+
+    @property
+    def throughput(self):
+        """
+        The number of bytes per second that have been written before
+        compression.
+        """
+        elapsed = time.perf_counter() - self._start_time
+        return self._bytes_written / elapsed if elapsed > 0. else 0.
+
+    @property
+    def codec(self):
+        return self._codec
+
+    @property
+    def error(self):
+        return self._error
+
+    def is_recording(self):
+        return self._writer is not None
+
+    def start(self):
+        self._writer = RecordingWriter(self._file_path)
+        self._start_time = time.perf_counter()
+        if self._codec:
+            self._compressors = ThreadPoolExecutor(
+                max_workers=self._num_compressors
+            )
+
+    def _allocate(self, size):
+        num_slots = max(self._min_slots, self._memory_budget // size)
+        self._block = np.empty((num_slots, size), dtype=np.uint8)
+        self._free_slots = queue.Queue()
+        for slot in range(num_slots):
+            self._free_slots.put(slot)
+        self._queue = queue.Queue(maxsize=num_slots + 1)
+        self._thread = threading.Thread(
+            target=self._run, name='Recorder', daemon=True
+        )
+        self._thread.start()
+
+    def write(self, buffer):
+        """
+        Copies the first component of the buffer; it's called on the fetch
+        thread so it never blocks. A buffer without one, such as a JPEG
+        payload, is dropped.
+        """
+        if self._writer is None or self._error:
+            return
+
+        #
+        component = get_first_component(buffer)
+        if component is None:
+            self._num_dropped += 1
+            return
+        data = component.data
+        size = data.nbytes
+        if self._block is None:
+            self._allocate(size)
+        if size > self._block.shape[1]:
+            # The size of the frames has grown while recording:
+            self._num_dropped += 1
+            return
+
+        #
+        try:
+            slot = self._free_slots.get_nowait()
+        except queue.Empty:
+            self._num_dropped += 1
+            return
+        np.copyto(
+            self._block[slot, :size], data.reshape(-1).view(np.uint8)
+        )
+        header = describe(buffer, self._custom_data_formats)
+
+        # The frames are queued in order even if they're compressed in
+        # parallel; the writer thread waits for each of them:
+        future = None
+        if self._compressors:
+            if self._free_slots.qsize() >= self.num_slots // 2:
+                future = self._compressors.submit(
+                    unpinned(compress), header, self._block[slot, :size],
+                    self._codec
+                )
+            else:
+                self._num_uncompressed += 1
+        self._queue.put_nowait((slot, size, header, future))
+
+    def _run(self):
+        set_cpu_affinity(None, self._logger)
+
+        #
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            # Take what has been queued so far to write it at once:
+            batch = [item]
+            batch_size = item[1]
+            stop = False
+            while batch_size < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+                batch_size += item[1]
+
+            #
+            frames = [
+                self._get_frame(slot, size, header, future)
+                for slot, size, header, future in batch
+            ]
+            if not self._error:
+                try:
+                    self._writer.write(frames)
+                except OSError as e:
+                    # Keep draining the queue but stop taking new frames:
+                    self._logger.error(e, exc_info=True)
+                    self._error = e
+                else:
+                    self._num_written += len(batch)
+                    self._bytes_written += batch_size
+                    self._bytes_stored += sum(
+                        int(header['size'][0]) for header, _ in frames
+                    )
+
+            #
+            for slot, _, _, _ in batch:
+                self._free_slots.put(slot)
+            if stop:
+                return
+
+    def _get_frame(self, slot, size, header, future):
+        if future:
+            try:
+                return future.result()
+            except Exception as e:
+                # Store the frame as it is rather than losing it:
+                self._logger.error(e, exc_info=True)
+                self._num_uncompressed += 1
+        return header, self._block[slot, :size]
+
+    def stop(self):
+        """
+        Writes the frames that are still queued and closes the file; it
+        may take a while so it should not be called on the GUI thread.
+        """
+        if self._writer is None:
+            return
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._compressors:
+            self._compressors.shutdown()
+            self._compressors = None
+
+        #
+        try:
+            self._writer.close()
+        except OSError as e:
+            # The frames can still be recovered from their headers:
+            self._logger.error(e, exc_info=True)
+        finally:
+            self._writer = None
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import os
+
+# Related third party imports
+import numpy as np
+
+from genicam.gentl import GenericException
+
+# Local application/library specific imports
+from harvesters.util.pfnc import get_bits_per_pixel
+from harvesters_gui._private.frontend.color import get_planar_bits_per_pixel
+from harvesters_gui._private.frontend.compression import get_codec
+from harvesters_gui._private.frontend.depth import is_float_format
+from harvesters_gui._private.frontend.polarization import \
+    get_polarized_bits_per_pixel
+
+
+# A recording starts with a file header and every frame is written as a
+# frame header that is immediately followed by the image data. The index
+# of the frames is appended once the recording is closed; the frame
+# headers are only read to recover a recording that was not closed:
+magic = b'HRVREC\x00\x01'
+version = 2
+
+file_header_dtype = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('header_size', '<u4'),
+    ('index_offset', '<u8'),
+    ('num_frames', '<u8'),
+    ('reserved', '<u8', (4,)),
+])
+
+# The size is the number of bytes that the frame takes up in the file; if
+# the frame has been compressed, the codec tells how to decompress it and
+# the raw size is the size of the frame before compression:
+_frame_header_descr_v1 = [
+    ('frame_id', '<i8'),
+    ('timestamp_ns', '<u8'),
+    ('data_format_value', '<u4'),
+    ('width', '<u4'),
+    ('height', '<u4'),
+    ('size', '<u8'),
+    ('data_format', 'S48'),
+]
+frame_header_dtype = np.dtype(_frame_header_descr_v1 + [
+    ('raw_size', '<u8'),
+    ('codec', 'S8'),
+])
+
+# The offset tells where the image data of the frame starts in the file:
+index_dtype = np.dtype(
+    frame_header_dtype.descr + [('offset', '<u8')]
+)
+
+# Version: (frame header, index entry):
+_dtypes = {
+    1: (
+        np.dtype(_frame_header_descr_v1),
+        np.dtype(_frame_header_descr_v1 + [('offset', '<u8')])
+    ),
+    2: (frame_header_dtype, index_dtype),
+}
+
+# The frame ID is -1 if the device does not deliver it:
+unknown_frame_id = -1
+
+
+def get_frame_id(buffer):
+    try:
+        # Harvester has renamed the GenTL buffer that it wraps:
+        raw_buffer = getattr(buffer, 'module', None) or buffer._buffer
+        return int(raw_buffer.frame_id)
+    except (AttributeError, GenericException):
+        return unknown_frame_id
+
+
+def get_timestamp_ns(buffer):
+    try:
+        return int(buffer.timestamp_ns)
+    except (AttributeError, GenericException):
+        return 0
+
+
+def get_first_component(buffer):
+    """
+    Returns the first component of the buffer or None if it has none;
+    Harvester does not wrap compressed payloads such as JPEG in components.
+    """
+    payload = buffer.payload
+    components = payload.components if payload else None
+    return components[0] if components else None
+
+
+def describe(buffer, custom_data_formats=None):
+    """
+    Returns the frame header of the first component of the buffer; the
+    names of custom pixel formats are looked up in the given dictionary.
+    """
+    header = np.zeros(1, dtype=frame_header_dtype)
+    describe_into(header, buffer, custom_data_formats)
+    return header
+
+
+def describe_into(header, buffer, custom_data_formats=None):
+    """
+    Does what describe does but fills in the given frame header, e.g. a
+    slot of a preallocated array, rather than allocating a new one; every
+    field is overwritten.
+    """
+    component = get_first_component(buffer)
+    if component is None:
+        raise ValueError('The buffer does not have an image component.')
+    data_format_value = component.data_format_value
+    data_format = (custom_data_formats or {}).get(data_format_value) or \
+        component.data_format or ''
+
+    #
+    header['frame_id'] = get_frame_id(buffer)
+    header['timestamp_ns'] = get_timestamp_ns(buffer)
+    header['data_format_value'] = data_format_value
+    header['width'] = component.width
+    header['height'] = component.height
+    header['size'] = component.data.nbytes
+    header['data_format'] = data_format.encode()
+    header['raw_size'] = component.data.nbytes
+    header['codec'] = b''
+
+
+def compress(header, data, codec):
+    """
+    Returns (frame header, data) of the frame compressed with the codec;
+    the frame is kept as it is if compression does not make it smaller.
+    """
+    compressed = codec.compress(data)
+    if len(compressed) >= data.nbytes:
+        return header, data
+    header = header.copy()
+    header['size'] = len(compressed)
+    header['codec'] = codec.name.encode()
+    return header, compressed
+
+
+def get_data_type(data_format):
+    """
+    Returns the type of the pixels of a recorded frame; a recording only
+    keeps the bytes.
+    """
+    if is_float_format(data_format):
+        return np.float32
+    bpp = get_polarized_bits_per_pixel(data_format) or \
+        get_planar_bits_per_pixel(data_format) or \
+        get_bits_per_pixel(data_format)
+    return np.uint16 if bpp and bpp > 8 else np.uint8
+
+
+def make_file_header(index_offset=0, num_frames=0):
+    header = np.zeros(1, dtype=file_header_dtype)
+    header['magic'] = magic
+    header['version'] = version
+    header['header_size'] = file_header_dtype.itemsize
+    header['index_offset'] = index_offset
+    header['num_frames'] = num_frames
+    return header
+
+
+# The number of chunks that a single system call can write:
+_max_chunks_per_write = 512
+
+
+def write_all(fd, chunks):
+    # Gather the chunks into as few system calls as possible; writev may
+    # write less than it's given so go on from where it stopped:
+    if not hasattr(os, 'writev'):
+        for chunk in chunks:
+            view = memoryview(chunk).cast('B')
+            while view:
+                view = view[os.write(fd, view):]
+        return
+
+    #
+    chunks = [memoryview(c).cast('B') for c in chunks]
+    chunks = [c for c in chunks if len(c)]
+    while chunks:
+        written = os.writev(fd, chunks[:_max_chunks_per_write])
+        while chunks and written >= len(chunks[0]):
+            written -= len(chunks.pop(0))
+        if written:
+            chunks[0] = chunks[0][written:]
+
+
+class RecordingWriter:
+    """
+    Writes a recording; the frames are given in batches so that each
+    batch goes to the file with as few system calls as possible.
+    """
+    def __init__(self, file_path):
+        #
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | \
+            getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(file_path, flags, 0o644)
+        header = make_file_header().tobytes()
+        write_all(self._fd, [header])
+
+        # The index is written when the recording is closed:
+        self._position = len(header)
+        self._index = []
+
+    def write(self, frames):
+        """
+        Appends the frames; each frame is given as (frame header, data).
+        If it fails, the frames that have been written so far are kept.
+        """
+        chunks = []
+        records = []
+        position = self._position
+        for header, data in frames:
+            chunks.append(header.tobytes())
+            chunks.append(data)
+            position += header.itemsize
+            record = np.zeros(1, dtype=index_dtype)
+            for name in frame_header_dtype.names:
+                record[name] = header[name]
+            record['offset'] = position
+            records.append(record)
+            position += memoryview(data).nbytes
+
+        #
+        write_all(self._fd, chunks)
+        self._position = position
+        self._index.extend(records)
+
+    def close(self):
+        # Append the index right after the last frame that has been
+        # written and let the file header point to it:
+        try:
+            index = np.concatenate(self._index) if self._index else \
+                np.zeros(0, dtype=index_dtype)
+            os.lseek(self._fd, self._position, os.SEEK_SET)
+            write_all(self._fd, [index.tobytes()])
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            write_all(self._fd, [
+                make_file_header(self._position, index.size).tobytes()
+            ])
+        finally:
+            os.close(self._fd)
+
+
+def _scan_frame_headers(file, start, file_size, header_dtype, record_dtype):
+    # Walk through the frame headers; a frame that was being written when
+    # the recording was interrupted is ignored:
+    records = []
+    position = start
+    while position + header_dtype.itemsize <= file_size:
+        file.seek(position)
+        header = np.frombuffer(
+            file.read(header_dtype.itemsize), dtype=header_dtype
+        )
+        offset = position + header_dtype.itemsize
+        if offset + int(header['size'][0]) > file_size:
+            break
+        record = np.zeros(1, dtype=record_dtype)
+        for name in header_dtype.names:
+            record[name] = header[name]
+        record['offset'] = offset
+        records.append(record)
+        position = offset + int(header['size'][0])
+    if not records:
+        return np.zeros(0, dtype=record_dtype)
+    return np.concatenate(records)
+
+
+def _upgrade_index(records):
+    # The frames of the older versions are never compressed:
+    index = np.zeros(records.size, dtype=index_dtype)
+    for name in records.dtype.names:
+        index[name] = records[name]
+    index['raw_size'] = records['size']
+    return index
+
+
+class Recording:
+    """
+    Opens a recording for random access. Only the index is read; the
+    image data is mapped into memory so a frame is read from the file
+    when it's touched for the first time.
+    """
+    def __init__(self, file_path):
+        #
+        self._file_path = file_path
+        file_size = os.path.getsize(file_path)
+
+        #
+        with open(file_path, 'rb') as file:
+            header = np.frombuffer(
+                file.read(file_header_dtype.itemsize), dtype=file_header_dtype
+            )
+            if header.size != 1 or header['magic'][0] != magic:
+                raise ValueError(
+                    '{0} is not a recording.'.format(file_path)
+                )
+            if int(header['version'][0]) not in _dtypes:
+                raise ValueError(
+                    '{0} has been recorded by a newer version.'.format(
+                        file_path
+                    )
+                )
+            header_dtype, record_dtype = _dtypes[int(header['version'][0])]
+            index_offset = int(header['index_offset'][0])
+            num_frames = int(header['num_frames'][0])
+            if index_offset:
+                file.seek(index_offset)
+                index = np.fromfile(
+                    file, dtype=record_dtype, count=num_frames
+                )
+            else:
+                index = _scan_frame_headers(
+                    file, int(header['header_size'][0]), file_size,
+                    header_dtype, record_dtype
+                )
+            self._index = index if record_dtype == index_dtype else \
+                _upgrade_index(index)
+
+        #
+        self._data = np.memmap(file_path, dtype=np.uint8, mode='r') \
+            if file_size else np.zeros(0, dtype=np.uint8)
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    @property
+    def index(self):
+        return self._index
+
+    def __len__(self):
+        return self._index.size
+
+    def get_stored_data(self, frame):
+        """
+        Returns the bytes of the frame as they are in the file.
+        """
+        record = self._index[frame]
+        offset = int(record['offset'])
+        return self._data[offset:offset + int(record['size'])]
+
+    def get_data(self, frame):
+        """
+        Returns the image data of the frame as a uint8 array; it's a view
+        of the file so nothing is copied unless the frame is compressed.
+        """
+        data = self.get_stored_data(frame)
+        codec = self._index['codec'][frame]
+        if codec:
+            data = np.frombuffer(
+                get_codec(codec.decode()).decompress(data), dtype=np.uint8
+            )
+        return data
+
+    def close(self):
+        # The mapping is closed once every view of it has gone:
+        self._data = None
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import threading
+
+# Related third party imports
+import numpy as np
+
+# Local application/library specific imports
+from harvesters.util.logging import get_logger
+from harvesters_gui._private.frontend.recording import describe_into, \
+    frame_header_dtype, get_first_component, RecordingWriter
+from harvesters_gui._private.frontend.scheduling import set_cpu_affinity
+
+
+class PreTriggerRing:
+    """
+    Keeps the latest frames in memory so that they can be saved once
+    something interesting has happened. The frames are copied into the
+    slots of a single block that is allocated when the first frame
+    arrives; nothing is allocated after that.
+
+    While the frames are being saved, the slots that have not been saved
+    yet are not overwritten; the new frames are dropped instead until the
+    slots have been saved. Acquisition goes on meanwhile.
+    """
+    def __init__(
+            self, *, max_frames=None, max_bytes=1024 * 2 ** 20,
+            batch_size=64 * 2 ** 20, custom_data_formats=None, logger=None
+    ):
+        #
+        self._logger = logger or get_logger(name='harvesters')
+
+        #
+        self._max_frames = max_frames
+        self._max_bytes = max_bytes
+        self._batch_size = batch_size
+        self._custom_data_formats = custom_data_formats or {}
+
+        #
+        self._block = None
+        self._headers = None
+        self._sizes = None
+
+        # The sequence number of the next frame; the slot of a frame is
+        # its sequence number modulo the number of slots:
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._num_dropped = 0
+
+        # The frames in [cursor, end) are being saved:
+        self._flush_cursor = 0
+        self._flush_end = 0
+        self._thread = None
+
+    @property
+    def capacity(self):
+        return 0 if self._block is None else self._block.shape[0]
+
+    @property
+    def num_frames(self):
+        return min(self._sequence, self.capacity)
+
+    @property
+    def num_dropped(self):
+        return self._num_dropped
+
+    def is_flushing(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _allocate(self, size):
+        num_slots = max(1, self._max_bytes // size)
+        if self._max_frames:
+            num_slots = min(num_slots, self._max_frames)
+        self._block = np.empty((num_slots, size), dtype=np.uint8)
+        self._headers = np.zeros(num_slots, dtype=frame_header_dtype)
+        self._sizes = np.zeros(num_slots, dtype=np.int64)
+
+    def write(self, buffer):
+        """
+        Copies the first component of the buffer into the next slot; it's
+        called on the fetch thread. A buffer without one, such as a JPEG
+        payload, is dropped.
+        """
+        component = get_first_component(buffer)
+        if component is None:
+            self._num_dropped += 1
+            return
+        data = component.data
+        size = data.nbytes
+        if self._block is None:
+            self._allocate(size)
+        if size > self._block.shape[1]:
+            self._num_dropped += 1
+            return
+
+        # Hold the lock while copying so that the slot is not saved
+        # while it's half overwritten:
+        num_slots = self._block.shape[0]
+        with self._lock:
+            sequence = self._sequence
+            overwritten = sequence - num_slots
+            if self._flush_cursor <= overwritten < self._flush_end:
+                self._num_dropped += 1
+                return
+
+            #
+            slot = sequence % num_slots
+            np.copyto(
+                self._block[slot, :size], data.reshape(-1).view(np.uint8)
+            )
+            describe_into(
+                self._headers[slot:slot + 1], buffer,
+                self._custom_data_formats
+            )
+            self._sizes[slot] = size
+            self._sequence = sequence + 1
+
+    def trigger(self, file_path, seconds=None):
+        """
+        Saves the frames that are kept now on a background thread; if
+        seconds is given, only the frames of the last seconds are saved.
+        Returns False if the previous frames are still being saved.
+        """
+        if self._block is None or self.is_flushing():
+            return False
+
+        #
+        with self._lock:
+            end = self._sequence
+            start = max(0, end - self._block.shape[0])
+            if seconds is not None and end > start:
+                # The timestamps are ordered in the sequence:
+                slots = np.arange(start, end) % self._block.shape[0]
+                timestamps = self._headers['timestamp_ns'][slots]
+                start += int(np.searchsorted(
+                    timestamps, timestamps[-1] - seconds * 1e9
+                ))
+            self._flush_cursor = start
+            self._flush_end = end
+
+        #
+        self._thread = threading.Thread(
+            target=self._flush, args=(file_path, start, end),
+            name='PreTriggerRing', daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _flush(self, file_path, start, end):
+        set_cpu_affinity(None, self._logger)
+        num_slots = self._block.shape[0]
+        try:
+            writer = RecordingWriter(file_path)
+        except OSError as e:
+            self._logger.error(e, exc_info=True)
+            with self._lock:
+                self._flush_cursor = self._flush_end = 0
+            return
+
+        #
+        try:
+            sequence = start
+            while sequence < end:
+                # Give the slots back to the ring batch by batch:
+                frames = []
+                batch_size = 0
+                while sequence < end and batch_size < self._batch_size:
+                    slot = sequence % num_slots
+                    size = int(self._sizes[slot])
+                    frames.append(
+                        (self._headers[slot:slot + 1],
+                         self._block[slot, :size])
+                    )
+                    batch_size += size
+                    sequence += 1
+                writer.write(frames)
+                with self._lock:
+                    self._flush_cursor = sequence
+        except OSError as e:
+            self._logger.error(e, exc_info=True)
+        finally:
+            with self._lock:
+                self._flush_cursor = self._flush_end = 0
+            try:
+                writer.close()
+            except OSError as e:
+                self._logger.error(e, exc_info=True)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import functools
+import os
+import threading
+
+# Related third party imports
+
+# Local application/library specific imports
+from harvesters.util.logging import get_logger
+
+
+# The CPUs that the process has been started on, e.g. through taskset;
+# a thread goes back to them once it's not pinned anymore:
+_default_cpus = sorted(os.sched_getaffinity(0)) \
+    if hasattr(os, 'sched_getaffinity') else None
+
+# Tells if unpinned has let the calling thread go back to them:
+_local = threading.local()
+
+
+class ThreadSettings:
+    """
+    Tells how a group of threads should be scheduled. The priority is a
+    QThread.Priority value and cpus is a list of the CPUs that the threads
+    may run on; None means the inherited priority and the CPUs that the
+    process has been started on. The threads read the settings every time
+    they start so a change takes effect on the next start.
+    """
+    def __init__(self, priority=None, cpus=None):
+        #
+        self.priority = priority
+        self.cpus = cpus
+
+
+def is_affinity_supported():
+    # It's only available on Linux:
+    return hasattr(os, 'sched_setaffinity')
+
+
+def get_default_cpus():
+    """
+    Returns the CPUs that the process has been started on; a process that
+    it starts can be given them so it does not keep the CPUs of the thread
+    that has started it.
+    """
+    return list(_default_cpus) if _default_cpus else None
+
+
+def get_available_cpus():
+    # Not the affinity of the calling thread, which may have been pinned:
+    return list(range(os.cpu_count() or 1))
+
+
+def parse_cpu_list(text):
+    """
+    Returns the CPUs of a list such as '0-3,8'; it's None for an empty
+    list, which means any CPU.
+    """
+    cpus = set()
+    for part in text.replace(' ', '').split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        try:
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise ValueError('{0} is not a CPU or a range.'.format(part))
+        if first < 0 or last < first:
+            raise ValueError('{0} is not a valid range.'.format(part))
+        cpus.update(range(first, last + 1))
+    return sorted(cpus) if cpus else None
+
+
+def format_cpu_list(cpus):
+    """
+    Does the opposite of parse_cpu_list.
+    """
+    if not cpus:
+        return ''
+    ranges = []
+    cpus = sorted(cpus)
+    first = last = cpus[0]
+    for cpu in cpus[1:] + [None]:
+        if cpu is not None and cpu == last + 1:
+            last = cpu
+            continue
+        ranges.append(
+            str(first) if first == last else '{0}-{1}'.format(first, last)
+        )
+        first = last = cpu
+    return ','.join(ranges)
+
+
+def set_cpu_affinity(cpus, logger=None):
+    """
+    Restricts the calling thread to the CPUs, or to the ones that the
+    process has been started on if cpus is None; the threads that it
+    starts later inherit them. Returns False if it has failed.
+    """
+    cpus = cpus or _default_cpus
+    if not cpus or not is_affinity_supported():
+        return False
+    try:
+        # On Linux, 0 is the calling thread rather than the process:
+        os.sched_setaffinity(0, cpus)
+    except OSError as e:
+        (logger or get_logger(name='harvesters')).warning(
+            'failed to set the CPU affinity {0}: {1}'.format(
+                format_cpu_list(cpus), e
+            )
+        )
+        return False
+    return True
+
+
+def unpinned(function):
+    """
+    Wraps a thread target or a job of a thread pool so that the thread
+    that runs it goes back to the CPUs that the process has been started
+    on; a thread inherits the CPUs of the one that starts it, e.g. the
+    pinned GUI thread. A thread is unpinned only once since nothing pins
+    it again.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not getattr(_local, 'is_unpinned', False):
+            _local.is_unpinned = True
+            set_cpu_affinity(None)
+        return function(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import os
+import struct
+import zlib
+
+# Related third party imports
+import numpy as np
+
+from harvesters.util.pfnc import get_bits_per_pixel
+
+# Local application/library specific imports
+from harvesters_gui._private.frontend.color import get_planar_bits_per_pixel
+from harvesters_gui._private.frontend.polarization import \
+    get_polarized_bits_per_pixel
+
+
+png_extensions = ['.png']
+tiff_extensions = ['.tif', '.tiff']
+
+# The rows of a TIFF image are split into strips of about this size:
+_tiff_strip_size = 2 ** 20
+
+
+def get_significant_bits(data_format):
+    return get_polarized_bits_per_pixel(data_format) or \
+        get_planar_bits_per_pixel(data_format) or \
+        get_bits_per_pixel(data_format)
+
+
+def _get_channels(image):
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    if channels not in [1, 3, 4]:
+        raise ValueError(
+            'Images of {0} channels are not supported.'.format(channels)
+        )
+    return channels
+
+
+def _png_chunk(tag, data):
+    chunk = tag + data
+    return struct.pack('>I', len(data)) + chunk + \
+        struct.pack('>I', zlib.crc32(chunk) & 0xffffffff)
+
+
+def encode_png(image, significant_bits=None, compress_level=6):
+    """
+    Returns the PNG file of an 8 or 16 bit image as bytes; the number of
+    significant bits is stored so that readers can tell 12 bit data from
+    16 bit one.
+    """
+    if image.dtype not in [np.uint8, np.uint16]:
+        raise ValueError('PNG only supports 8 or 16 bit integer images.')
+    channels = _get_channels(image)
+    height, width = image.shape[:2]
+    bit_depth = image.dtype.itemsize * 8
+
+    # Every row starts with the filter type; PNG is big endian:
+    rows = np.ascontiguousarray(image, dtype=image.dtype.newbyteorder('>'))
+    raw = np.zeros((height, 1 + rows[0].nbytes), dtype=np.uint8)
+    raw[:, 1:] = rows.reshape(height, -1).view(np.uint8)
+
+    #
+    color_type = {1: 0, 3: 2, 4: 6}[channels]
+    chunks = [
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack(
+            '>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0
+        )),
+    ]
+    if significant_bits and significant_bits < bit_depth:
+        chunks.append(
+            _png_chunk(b'sBIT', bytes([significant_bits] * channels))
+        )
+    chunks.append(_png_chunk(b'IDAT', zlib.compress(raw, compress_level)))
+    chunks.append(_png_chunk(b'IEND', b''))
+    return b''.join(chunks)
+
+
+def write_tiff(file, image):
+    """
+    Writes a baseline uncompressed TIFF file of an 8 or 16 bit integer
+    or a 32 bit float image; the image is written as it is.
+    """
+    if image.dtype not in [np.uint8, np.uint16, np.float32]:
+        raise ValueError(
+            'TIFF only supports 8 or 16 bit integer or 32 bit float images.'
+        )
+    channels = _get_channels(image)
+    height, width = image.shape[:2]
+    image = np.ascontiguousarray(image, dtype=image.dtype.newbyteorder('<'))
+
+    #
+    row_size = image[0].nbytes
+    rows_per_strip = max(1, _tiff_strip_size // row_size)
+    num_strips = (height + rows_per_strip - 1) // rows_per_strip
+    offsets = [8 + i * rows_per_strip * row_size for i in range(num_strips)]
+    counts = [
+        min(rows_per_strip, height - i * rows_per_strip) * row_size
+        for i in range(num_strips)
+    ]
+
+    # The image data comes first and the IFD follows it; the values that
+    # don't fit in a tag follow the IFD:
+    ifd_offset = 8 + image.nbytes + (image.nbytes & 1)
+    tags = [
+        (256, 4, [width]),
+        (257, 4, [height]),
+        (258, 3, [image.dtype.itemsize * 8] * channels),
+        (259, 3, [1]),
+        (262, 3, [1 if channels == 1 else 2]),
+        (273, 4, offsets),
+        (277, 3, [channels]),
+        (278, 4, [rows_per_strip]),
+        (279, 4, counts),
+        (284, 3, [1]),
+    ]
+    if channels == 4:
+        # Unassociated alpha:
+        tags.append((338, 3, [2]))
+    tags.append((339, 3, [3 if image.dtype == np.float32 else 1]))
+
+    #
+    formats = {3: 'H', 4: 'I'}
+    extra_offset = ifd_offset + 2 + len(tags) * 12 + 4
+    entries = b''
+    extra = b''
+    for tag, type_, values in tags:
+        data = struct.pack(
+            '<{0}{1}'.format(len(values), formats[type_]), *values
+        )
+        if len(data) <= 4:
+            entries += struct.pack('<HHI', tag, type_, len(values)) + \
+                data.ljust(4, b'\x00')
+        else:
+            entries += struct.pack(
+                '<HHII', tag, type_, len(values), extra_offset + len(extra)
+            )
+            extra += data
+
+    #
+    file.write(struct.pack('<2sHI', b'II', 42, ifd_offset))
+    file.write(image.reshape(-1).view(np.uint8).data)
+    if image.nbytes & 1:
+        file.write(b'\x00')
+    file.write(struct.pack('<H', len(tags)) + entries + b'\x00' * 4)
+    file.write(extra)
+
+
+def save_image(file_path, image, significant_bits=None):
+    """
+    Saves the image as PNG or TIFF depending on the extension of the file
+    path; it may take a while for large images.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in png_extensions:
+        data = encode_png(image, significant_bits)
+        with open(file_path, 'wb') as file:
+            file.write(data)
+    elif extension in tiff_extensions:
+        with open(file_path, 'wb') as file:
+            write_tiff(file, image)
+    else:
+        raise ValueError(
+            '{0} is not a supported extension.'.format(extension)
+        )
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# ----------------------------------------------------------------------------
+#
+# Copyright 2018 EMVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# ----------------------------------------------------------------------------
+
+
+# Standard library imports
+import threading
+import time
+
+# Related third party imports
+import numpy as np
+
+# Local application/library specific imports
+
+
+# The metrics that a StatisticsHistory object keeps; a value is NaN if it
+# has not been known when the sample was taken:
+metric_fps = 'fps'
+metric_throughput = 'throughput'  # MB/s
+metric_dropped = 'dropped'  # Frames per second
+metric_latency = 'latency'  # Median display latency in ms
+metric_temperature = 'temperature'  # Device temperature in degC
+metrics = [
+    metric_fps, metric_throughput, metric_dropped, metric_latency,
+    metric_temperature
+]
+
+
+class StatisticsHistory:
+    """
+    Keeps the latest samples of every metric in fixed-size ring buffers so
+    that a long run can be looked back on; at a sample per second, the
+    default capacity covers four hours.
+
+    The samples are appended on a single thread and read on another; a
+    reader always gets whole samples.
+    """
+    def __init__(self, *, capacity=14400, interval_s=1.):
+        #
+        self._capacity = capacity
+        self._interval_s = interval_s
+
+        #
+        self._lock = threading.Lock()
+        self._times = np.full(capacity, np.nan)
+        self._values = np.full((len(metrics), capacity), np.nan)
+        self._num_samples = 0
+
+        #
+        self._origin = time.perf_counter()
+        self._last_time = None
+        self._last_bytes = 0
+        self._last_dropped = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def interval_s(self):
+        return self._interval_s
+
+    @property
+    def num_samples(self):
+        return min(self._num_samples, self._capacity)
+
+    def reset(self):
+        with self._lock:
+            self._times.fill(np.nan)
+            self._values.fill(np.nan)
+            self._num_samples = 0
+            self._origin = time.perf_counter()
+            self._last_time = None
+            self._last_bytes = 0
+            self._last_dropped = 0
+
+    def is_due(self):
+        return self._last_time is None or \
+            time.perf_counter() - self._last_time >= self._interval_s
+
+    def append(
+            self, *, fps=np.nan, num_bytes=0, num_dropped=0,
+            latency_ms=np.nan, temperature=np.nan
+    ):
+        """
+        Takes a sample; num_bytes and num_dropped are the totals since the
+        reset and are turned into rates over the time since the previous
+        sample.
+        """
+        now = time.perf_counter()
+        throughput = dropped = np.nan
+        if self._last_time is not None and now > self._last_time:
+            elapsed = now - self._last_time
+            throughput = (num_bytes - self._last_bytes) / elapsed / 2 ** 20
+            dropped = (num_dropped - self._last_dropped) / elapsed
+        self._last_time = now
+        self._last_bytes = num_bytes
+        self._last_dropped = num_dropped
+
+        #
+        values = {
+            metric_fps: fps, metric_throughput: throughput,
+            metric_dropped: dropped, metric_latency: latency_ms,
+            metric_temperature: temperature,
+        }
+        with self._lock:
+            slot = self._num_samples % self._capacity
+            self._times[slot] = now - self._origin
+            for i, metric in enumerate(metrics):
+                self._values[i, slot] = values[metric]
+            self._num_samples += 1
+
+    def get(self, metric):
+        """
+        Returns (times, values) of the metric in the order that they have
+        been taken; the times are seconds since the reset.
+        """
+        index = metrics.index(metric)
+        with self._lock:
+            n = self._num_samples
+            if n <= self._capacity:
+                return self._times[:n].copy(), self._values[index, :n].copy()
+            slot = n % self._capacity
+            return np.roll(self._times, -slot), \
+                np.roll(self._values[index], -slot)
+
+    def get_envelope(self, metric, num_bins):
+        """
+        Returns (lows, highs) of the metric over num_bins equal parts of
+        the history so that a short dip does not disappear when thousands
+        of samples are drawn on a few hundred pixels.
+        """
+        _, values = self.get(metric)
+        if values.size <= num_bins:
+            return values, values
+        starts = np.linspace(
+            0, values.size, num_bins, endpoint=False
+        ).astype(np.intp)
+        # They ignore NaN unless a whole part is NaN:
+        return np.fmin.reduceat(values, starts), \
+            np.fmax.reduceat(values, starts)
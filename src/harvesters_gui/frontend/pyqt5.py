@@ -19,34 +19,75 @@
 
 
 # Standard library imports
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import os
+import signal
 import sys
+import threading
 import time
 
 # Related third party imports
-from PyQt5.QtCore import QMutexLocker, QMutex, pyqtSignal, QThread
+import numpy as np
+
+from PyQt5.QtCore import Qt, QMutexLocker, QMutex, pyqtSignal, QThread, \
+    QTimer
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import QMainWindow, QAction, QComboBox, \
-    QDesktopWidget, QFileDialog, QDialog, QShortcut, QApplication
+    QDesktopWidget, QFileDialog, QDialog, QShortcut, QApplication, \
+    QStackedWidget, QDockWidget
 
 from genicam.gentl import NotInitializedException, InvalidHandleException, \
     InvalidIdException, ResourceInUseException, \
     InvalidParameterException, NotImplementedException, \
     AccessDeniedException
+from genicam.genapi import LogicalErrorException, RuntimeException, \
+    AccessException, OutOfRangeException, InvalidArgumentException
 
 # Local application/library specific imports
 from harvesters.core import Harvester as HarvesterCore, ParameterSet, ParameterKey
-from harvesters_gui._private.frontend.canvas import Canvas2D
+from harvesters_gui._private.frontend.canvas import Canvas2D, \
+    CanvasPointCloud
+from harvesters_gui._private.frontend.color import compute_white_balance, \
+    sample_region
+from harvesters_gui._private.frontend.compression import get_codec_names
+from harvesters_gui._private.frontend.dispatcher import Dispatcher
+from harvesters_gui._private.frontend.device import has_features, \
+    is_writable, roi_feature_names, restore_full_frame, set_roi, \
+    FeatureCache, ReducedResolutionPreview
 from harvesters_gui._private.frontend.helper import compose_tooltip
+from harvesters_gui._private.frontend.latency import LatencyMonitor
+from harvesters_gui._private.frontend.loss import FrameLossCounter, \
+    IncompleteBufferCallback
+from harvesters_gui._private.frontend.metadata import MetadataTable
+from harvesters_gui._private.frontend.playback import PlaybackAcquirer
 from harvesters_gui._private.frontend.pyqt5.about import About
 from harvesters_gui._private.frontend.pyqt5.action import Action
 from harvesters_gui._private.frontend.pyqt5.attribute_controller import AttributeController
+from harvesters_gui._private.frontend.pyqt5.colormap_list import ComboBoxColormapList
+from harvesters_gui._private.frontend.pyqt5.dashboard import Dashboard
 from harvesters_gui._private.frontend.pyqt5.device_list import ComboBoxDeviceList
 from harvesters_gui._private.frontend.pyqt5.display_rate_list import ComboBoxDisplayRateList
+from harvesters_gui._private.frontend.pyqt5.export_dialog import ExportDialog
 from harvesters_gui._private.frontend.pyqt5.helper import get_system_font
 from harvesters_gui._private.frontend.pyqt5.icon import Icon
+from harvesters_gui._private.frontend.pyqt5.latency_view import LatencyView
+from harvesters_gui._private.frontend.pyqt5.orientation_list import ComboBoxOrientationList
+from harvesters_gui._private.frontend.pyqt5.playback_bar import PlaybackToolBar
+from harvesters_gui._private.frontend.pyqt5.polarization_view_list import ComboBoxPolarizationViewList
 from harvesters_gui._private.frontend.pyqt5.thread import _PyQtThread
+from harvesters_gui._private.frontend.pyqt5.thread_settings import \
+    ThreadSettingsDialog
+from harvesters_gui._private.frontend.recorder import Recorder
+from harvesters_gui._private.frontend.recording import Recording
+from harvesters_gui._private.frontend.ring_buffer import PreTriggerRing
+from harvesters_gui._private.frontend.scheduling import ThreadSettings, \
+    set_cpu_affinity, unpinned
+from harvesters_gui._private.frontend.snapshot import get_significant_bits, \
+    save_image
+from harvesters_gui._private.frontend.statistics_history import \
+    StatisticsHistory
+from harvesters.util.pfnc import is_custom
 from harvesters.util.logging import get_logger
 
 
@@ -54,6 +95,8 @@ class Harvester(QMainWindow):
     #
     _signal_update_statistics = pyqtSignal(str)
     _signal_stop_image_acquisition = pyqtSignal()
+    _signal_update_white_balance = pyqtSignal(object)
+    _signal_trigger_ring = pyqtSignal()
 
     def __init__(self, *, vsync=True, logger=None):
         #
@@ -62,22 +105,63 @@ class Harvester(QMainWindow):
         #
         super().__init__()
 
-        #
-        self._mutex = QMutex()
+        # The statistics thread has a lock of its own so that it never
+        # holds up the acquisition threads; see action_on_connect:
+        self._mutex_statistics = QMutex()
+        self._acquisition_threads = []
+
+        # How the threads that fetch the buffers and the GUI thread, which
+        # draws them, are scheduled:
+        self._acquisition_settings = ThreadSettings()
+        self._display_settings = ThreadSettings()
 
         profile = True if 'HARVESTER_PROFILE' in os.environ else False
         self._harvester_core = HarvesterCore(
             profile=profile, logger=self._logger
         )
         self._ia = None  # Image Acquirer
+        self._dispatcher = None
+        self._recorder = None
+        self._playback = None
+        self._ring = None
+        self._ring_directory = None
+        self._metadata_table = None
+        self._frame_loss = FrameLossCounter()
+        self._latency = LatencyMonitor(logger=self._logger)
+        self._history = StatisticsHistory()
+        # The number of the first latency that the next sample takes:
+        self._latency_sampled = 0
+        self._preview = ReducedResolutionPreview()
+        self._feature_cache = None
+        # The statistics thread only takes the value that it holds so that
+        # the device is not asked on every sample:
+        self._temperature_cache = None
+        self._timer_temperature = QTimer(self)
+        self._timer_temperature.setInterval(5000)
+        self._timer_temperature.timeout.connect(self._refresh_temperature)
 
         #
         self._widget_canvas = Canvas2D(vsync=vsync)
         self._widget_canvas.create_native()
         self._widget_canvas.native.setParent(self)
 
+        # Only one of the canvases fetches images at a time:
+        self._widget_point_cloud = CanvasPointCloud(vsync=vsync)
+        self._widget_point_cloud.create_native()
+        self._widget_point_cloud.native.setParent(self)
+        self._widget_canvases = QStackedWidget(self)
+        self._widget_canvases.addWidget(self._widget_canvas.native)
+        self._widget_canvases.addWidget(self._widget_point_cloud.native)
+
         #
+        self._action_start_image_acquisition = None
         self._action_stop_image_acquisition = None
+        self._action_select_roi = None
+        self._action_toggle_preview = None
+        self._action_white_balance = None
+        self._action_record = None
+        self._action_arm_ring = None
+        self._action_log_metadata = None
 
         #
         self._observer_widgets = []
@@ -87,15 +171,32 @@ class Harvester(QMainWindow):
         self._widget_status_bar = None
         self._widget_main = None
         self._widget_about = None
+        self._widget_export = None
         self._widget_attribute_controller = None
+        self._widget_playback = None
+        self._widget_latency = None
+        self._widget_dashboard = None
 
         #
         self._signal_update_statistics.connect(self.update_statistics)
         self._signal_stop_image_acquisition.connect(self._stop_image_acquisition)
+        self._signal_update_white_balance.connect(self._update_white_balance)
+        self._signal_trigger_ring.connect(self.save_ring)
+
+        # Other applications can save the pre-trigger buffer by sending
+        # SIGUSR1; the handler runs on the GUI thread:
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(
+                signal.SIGUSR1,
+                lambda signum, frame: self._signal_trigger_ring.emit()
+            )
+
+        # Runs the jobs that are too heavy for the GUI thread:
+        self._thread_pool = ThreadPoolExecutor(max_workers=1)
         self._thread_statistics_measurement = _PyQtThread(
-            parent=self, mutex=self._mutex,
+            parent=self, mutex=self._mutex_statistics,
             worker=self._worker_update_statistics,
-            update_cycle_us=250000
+            update_cycle_us=100000
         )
 
         #
@@ -116,6 +217,19 @@ class Harvester(QMainWindow):
         if self._widget_attribute_controller:
             self._widget_attribute_controller.close()
 
+        # Flush the frames that have not been written yet:
+        if self._recorder:
+            self._stop_recording(wait=True)
+        if self._metadata_table:
+            self._stop_logging_metadata(wait=True)
+        if self._playback:
+            self._close_recording()
+
+        #
+        self._thread_pool.shutdown(wait=False)
+        if self.canvas.decoder:
+            self.canvas.decoder.shutdown()
+
         #
         if self._harvester_core:
             self._harvester_core.reset()
@@ -130,6 +244,75 @@ class Harvester(QMainWindow):
     def canvas(self):
         return self._widget_canvas
 
+    @property
+    def point_cloud_canvas(self):
+        return self._widget_point_cloud
+
+    @property
+    def active_canvas(self):
+        if self._widget_canvases.currentIndex() == 1:
+            return self._widget_point_cloud
+        return self._widget_canvas
+
+    @property
+    def dispatcher(self):
+        return self._dispatcher
+
+    @property
+    def recorder(self):
+        return self._recorder
+
+    @property
+    def playback(self):
+        return self._playback
+
+    @property
+    def ring(self):
+        return self._ring
+
+    @property
+    def metadata_table(self):
+        return self._metadata_table
+
+    @property
+    def latency_monitor(self):
+        return self._latency
+
+    @property
+    def latency_view(self):
+        return self._widget_latency
+
+    @property
+    def lock_statistics(self):
+        """
+        Returns the LockStatistics of the statistics thread and of every
+        acquisition thread.
+        """
+        return [self._thread_statistics_measurement.lock_statistics] + [
+            thread.lock_statistics for thread in self._acquisition_threads
+        ]
+
+    @property
+    def acquisition_settings(self):
+        return self._acquisition_settings
+
+    @property
+    def display_settings(self):
+        return self._display_settings
+
+    @property
+    def statistics_history(self):
+        return self._history
+
+    @property
+    def dashboard(self):
+        return self._widget_dashboard
+
+    @property
+    def image_source(self):
+        # It's what the canvas takes the images from:
+        return self._playback or self._dispatcher
+
     @property
     def attribute_controller(self):
         return self._widget_attribute_controller
@@ -142,6 +325,10 @@ class Harvester(QMainWindow):
     def version(self):
         return self.harvester_core.version
 
+    @property
+    def preview(self):
+        return self._preview
+
     @property
     def device_list(self):
         return self._widget_device_list
@@ -166,11 +353,35 @@ class Harvester(QMainWindow):
         self.statusBar().showMessage('')
         self.statusBar().setFont(get_system_font())
 
+        #
+        self._widget_latency = QDockWidget('Latency', self)
+        self._widget_latency.setFont(get_system_font())
+        self._widget_latency.setWidget(
+            LatencyView(self._latency, self._widget_latency)
+        )
+        self.addDockWidget(Qt.RightDockWidgetArea, self._widget_latency)
+        self._widget_latency.hide()
+        self._widget_latency.visibilityChanged.connect(
+            self._update_latency_monitor
+        )
+
+        #
+        self._widget_dashboard = QDockWidget('Statistics', self)
+        self._widget_dashboard.setFont(get_system_font())
+        self._widget_dashboard.setWidget(
+            Dashboard(self._history, self._widget_dashboard)
+        )
+        self.addDockWidget(Qt.RightDockWidgetArea, self._widget_dashboard)
+        self._widget_dashboard.hide()
+        self._widget_dashboard.visibilityChanged.connect(
+            self._update_latency_monitor
+        )
+
         #
         self._initialize_gui_toolbar(self._observer_widgets)
 
         #
-        self.setCentralWidget(self.canvas.native)
+        self.setCentralWidget(self._widget_canvases)
 
         #
         self.resize(800, 600)
@@ -189,6 +400,12 @@ class Harvester(QMainWindow):
         group_display = self.addToolBar('Display')
         group_help = self.addToolBar('Help')
 
+        #
+        self._widget_playback = PlaybackToolBar(self)
+        self.addToolBarBreak()
+        self.addToolBar(self._widget_playback)
+        self._widget_playback.hide()
+
         # Create buttons:
 
         #
@@ -205,6 +422,35 @@ class Harvester(QMainWindow):
         button_select_file.toggle()
         observers.append(button_select_file)
 
+        #
+        button_open_recording = ActionOpenRecording(
+            icon='open_recording.png', title='Open Recording', parent=self,
+            action=self.action_on_open_recording,
+            is_enabled=self.is_enabled_on_open_recording
+        )
+        shortcut_key = 'Ctrl+Shift+e'
+        button_open_recording.setToolTip(
+            compose_tooltip('Open/Close a recording to replay', shortcut_key)
+        )
+        button_open_recording.setShortcut(shortcut_key)
+        button_open_recording.toggle()
+        observers.append(button_open_recording)
+
+        #
+        button_export = ActionExportRecording(
+            icon='export.png', title='Export Recording', parent=self,
+            action=self.action_on_export_recording
+        )
+        shortcut_key = 'Ctrl+Shift+x'
+        button_export.setToolTip(
+            compose_tooltip(
+                'Export a recording as a sequence of images', shortcut_key
+            )
+        )
+        button_export.setShortcut(shortcut_key)
+        button_export.toggle()
+        observers.append(button_export)
+
         #
         button_update = ActionUpdateList(
             icon='update.png', title='Update device list', parent=self,
@@ -266,6 +512,7 @@ class Harvester(QMainWindow):
         button_start_image_acquisition.setShortcut(shortcut_key)
         button_start_image_acquisition.toggle()
         observers.append(button_start_image_acquisition)
+        self._action_start_image_acquisition = button_start_image_acquisition
 
         #
         button_toggle_drawing = ActionToggleDrawing(
@@ -296,6 +543,92 @@ class Harvester(QMainWindow):
         observers.append(button_stop_image_acquisition)
         self._action_stop_image_acquisition = button_stop_image_acquisition
 
+        #
+        button_record = ActionRecord(
+            icon='record.png', title='Record', parent=self,
+            action=self.action_on_record,
+            is_enabled=self.is_enabled_on_record
+        )
+        shortcut_key = 'Ctrl+e'
+        button_record.setToolTip(
+            compose_tooltip('Start/Stop recording to a file', shortcut_key)
+        )
+        button_record.setShortcut(shortcut_key)
+        button_record.toggle()
+        observers.append(button_record)
+        self._action_record = button_record
+
+        #
+        button_snapshot = ActionSnapshot(
+            icon='snapshot.png', title='Snapshot', parent=self,
+            action=self.action_on_snapshot,
+            is_enabled=self.is_enabled_on_snapshot
+        )
+        shortcut_key = 'Ctrl+s'
+        button_snapshot.setToolTip(
+            compose_tooltip(
+                'Save the displayed image at its full bit depth',
+                shortcut_key
+            )
+        )
+        button_snapshot.setShortcut(shortcut_key)
+        button_snapshot.toggle()
+        observers.append(button_snapshot)
+
+        #
+        button_arm_ring = ActionArmRing(
+            icon='pre_trigger.png', title='Pre-Trigger Buffer', parent=self,
+            action=self.action_on_arm_ring,
+            is_enabled=self.is_enabled_on_arm_ring
+        )
+        shortcut_key = 'Ctrl+Shift+t'
+        button_arm_ring.setToolTip(
+            compose_tooltip(
+                'Keep the latest frames in memory to save them on demand',
+                shortcut_key
+            )
+        )
+        button_arm_ring.setShortcut(shortcut_key)
+        button_arm_ring.toggle()
+        observers.append(button_arm_ring)
+        self._action_arm_ring = button_arm_ring
+
+        #
+        button_save_ring = ActionSaveRing(
+            icon='save_pre_trigger.png', title='Save Pre-Trigger Frames',
+            parent=self, action=self.save_ring,
+            is_enabled=self.is_enabled_on_save_ring
+        )
+        shortcut_key = 'Ctrl+t'
+        button_save_ring.setToolTip(
+            compose_tooltip(
+                'Save the frames in the pre-trigger buffer; other '
+                'applications can send SIGUSR1 instead', shortcut_key
+            )
+        )
+        button_save_ring.setShortcut(shortcut_key)
+        button_save_ring.toggle()
+        observers.append(button_save_ring)
+        button_arm_ring.add_observer(button_save_ring)
+
+        #
+        button_log_metadata = ActionLogMetadata(
+            icon='metadata.png', title='Log Metadata', parent=self,
+            action=self.action_on_log_metadata,
+            is_enabled=self.is_enabled_on_log_metadata
+        )
+        shortcut_key = 'Ctrl+Shift+l'
+        button_log_metadata.setToolTip(
+            compose_tooltip(
+                'Log the frame ID, the timestamps and the chunk values of '
+                'every buffer to a CSV or NPZ file', shortcut_key
+            )
+        )
+        button_log_metadata.setShortcut(shortcut_key)
+        button_log_metadata.toggle()
+        observers.append(button_log_metadata)
+        self._action_log_metadata = button_log_metadata
+
         #
         button_dev_attribute = ActionShowAttributeController(
             icon='device_attribute.png', title='Device Attribute', parent=self,
@@ -310,6 +643,75 @@ class Harvester(QMainWindow):
         button_dev_attribute.toggle()
         observers.append(button_dev_attribute)
 
+        #
+        button_select_roi = ActionSelectRoi(
+            icon='select_roi.png', title='Select ROI', parent=self,
+            action=self.action_on_select_roi,
+            is_enabled=self.is_enabled_on_select_roi
+        )
+        shortcut_key = 'Ctrl+r'
+        button_select_roi.setToolTip(
+            compose_tooltip(
+                'Drag a rectangle on the canvas to set the ROI of the device',
+                shortcut_key
+            )
+        )
+        button_select_roi.setShortcut(shortcut_key)
+        button_select_roi.toggle()
+        observers.append(button_select_roi)
+        self._action_select_roi = button_select_roi
+
+        #
+        button_restore_full_frame = ActionRestoreFullFrame(
+            icon='full_frame.png', title='Restore Full Frame', parent=self,
+            action=self.action_on_restore_full_frame,
+            is_enabled=self.is_enabled_on_select_roi
+        )
+        shortcut_key = 'Ctrl+Shift+f'
+        button_restore_full_frame.setToolTip(
+            compose_tooltip('Restore the full frame', shortcut_key)
+        )
+        button_restore_full_frame.setShortcut(shortcut_key)
+        button_restore_full_frame.toggle()
+        observers.append(button_restore_full_frame)
+
+        #
+        button_toggle_preview = ActionTogglePreview(
+            icon='preview.png', title='Reduced Resolution Preview',
+            parent=self,
+            action=self.action_on_toggle_preview,
+            is_enabled=self.is_enabled_on_toggle_preview
+        )
+        shortcut_key = 'Ctrl+b'
+        button_toggle_preview.setToolTip(
+            compose_tooltip(
+                'Preview with binning or decimation to reduce the load',
+                shortcut_key
+            )
+        )
+        button_toggle_preview.setShortcut(shortcut_key)
+        button_toggle_preview.toggle()
+        observers.append(button_toggle_preview)
+        self._action_toggle_preview = button_toggle_preview
+
+        #
+        button_white_balance = ActionWhiteBalance(
+            icon='white_balance.png', title='White Balance', parent=self,
+            action=self.action_on_white_balance,
+            is_enabled=self.is_enabled_on_white_balance
+        )
+        shortcut_key = 'Ctrl+w'
+        button_white_balance.setToolTip(
+            compose_tooltip(
+                'Drag a rectangle on a gray card to balance the colors',
+                shortcut_key
+            )
+        )
+        button_white_balance.setShortcut(shortcut_key)
+        button_white_balance.toggle()
+        observers.append(button_white_balance)
+        self._action_white_balance = button_white_balance
+
         # Create widgets to add:
 
         #
@@ -352,6 +754,154 @@ class Harvester(QMainWindow):
         self._widget_display_rates.setEnabled(True)
         group_display.addWidget(self._widget_display_rates)
         observers.append(self._widget_display_rates)
+        group_display.addAction(button_white_balance)
+
+        #
+        self._widget_colormaps = ComboBoxColormapList(self)
+        self._widget_colormaps.setSizeAdjustPolicy(
+            QComboBox.AdjustToContents
+        )
+        shortcut_key = 'Ctrl+Shift+m'
+        shortcut = QShortcut(QKeySequence(shortcut_key), self)
+
+        def show_popup():
+            self._widget_colormaps.showPopup()
+
+        shortcut.activated.connect(show_popup)
+        self._widget_colormaps.setToolTip(
+            compose_tooltip('Select a colormap for mono images', shortcut_key)
+        )
+        self._widget_colormaps.setEnabled(True)
+        group_display.addWidget(self._widget_colormaps)
+
+        #
+        button_highlight_clipping = ActionHighlightClipping(
+            icon='highlight_clipping.png', title='Highlight Clipping',
+            parent=self,
+            action=self.action_on_highlight_clipping
+        )
+        shortcut_key = 'Ctrl+h'
+        button_highlight_clipping.setToolTip(
+            compose_tooltip(
+                'Tint clipped pixels in red and under-exposed pixels in blue',
+                shortcut_key
+            )
+        )
+        button_highlight_clipping.setShortcut(shortcut_key)
+        button_highlight_clipping.toggle()
+        observers.append(button_highlight_clipping)
+        group_display.addAction(button_highlight_clipping)
+
+        #
+        button_toggle_point_cloud = ActionTogglePointCloud(
+            icon='point_cloud.png', title='Point Cloud', parent=self,
+            action=self.action_on_toggle_point_cloud
+        )
+        shortcut_key = 'Ctrl+3'
+        button_toggle_point_cloud.setToolTip(
+            compose_tooltip(
+                'Show Coord3D_ABC images as a point cloud', shortcut_key
+            )
+        )
+        button_toggle_point_cloud.setShortcut(shortcut_key)
+        button_toggle_point_cloud.toggle()
+        observers.append(button_toggle_point_cloud)
+        group_display.addAction(button_toggle_point_cloud)
+
+        #
+        self._widget_orientations = ComboBoxOrientationList(self)
+        self._widget_orientations.setSizeAdjustPolicy(
+            QComboBox.AdjustToContents
+        )
+        shortcut_key = 'Ctrl+Shift+o'
+        shortcut = QShortcut(QKeySequence(shortcut_key), self)
+
+        def show_popup():
+            self._widget_orientations.showPopup()
+
+        shortcut.activated.connect(show_popup)
+        self._widget_orientations.setToolTip(
+            compose_tooltip('Rotate or flip the displayed image', shortcut_key)
+        )
+        self._widget_orientations.setEnabled(True)
+        group_display.addWidget(self._widget_orientations)
+
+        #
+        self._widget_polarization_views = ComboBoxPolarizationViewList(self)
+        self._widget_polarization_views.setSizeAdjustPolicy(
+            QComboBox.AdjustToContents
+        )
+        shortcut_key = 'Ctrl+Shift+p'
+        shortcut = QShortcut(QKeySequence(shortcut_key), self)
+
+        def show_popup():
+            self._widget_polarization_views.showPopup()
+
+        shortcut.activated.connect(show_popup)
+        self._widget_polarization_views.setToolTip(
+            compose_tooltip(
+                'Select what to display for polarized images', shortcut_key
+            )
+        )
+        self._widget_polarization_views.setEnabled(True)
+        group_display.addWidget(self._widget_polarization_views)
+
+        #
+        button_show_latency = ActionShowLatency(
+            icon='latency.png', title='Latency', parent=self,
+            action=self.action_on_show_latency
+        )
+        shortcut_key = 'Ctrl+Shift+y'
+        button_show_latency.setToolTip(
+            compose_tooltip(
+                'Show/Hide the latency from the device timestamp to the '
+                'screen', shortcut_key
+            )
+        )
+        button_show_latency.setShortcut(shortcut_key)
+        button_show_latency.toggle()
+        observers.append(button_show_latency)
+        self._widget_latency.visibilityChanged.connect(
+            button_show_latency.setChecked
+        )
+        group_display.addAction(button_show_latency)
+
+        #
+        button_show_dashboard = ActionShowDashboard(
+            icon='dashboard.png', title='Statistics', parent=self,
+            action=self.action_on_show_dashboard
+        )
+        shortcut_key = 'Ctrl+Shift+b'
+        button_show_dashboard.setToolTip(
+            compose_tooltip(
+                'Show/Hide the history of the frame rate, throughput, '
+                'dropped frames, latency and device temperature',
+                shortcut_key
+            )
+        )
+        button_show_dashboard.setShortcut(shortcut_key)
+        button_show_dashboard.toggle()
+        observers.append(button_show_dashboard)
+        self._widget_dashboard.visibilityChanged.connect(
+            button_show_dashboard.setChecked
+        )
+        group_display.addAction(button_show_dashboard)
+
+        #
+        button_thread_settings = ActionEditThreadSettings(
+            icon='thread_settings.png', title='Thread Settings', parent=self,
+            action=self.action_on_edit_thread_settings
+        )
+        shortcut_key = 'Ctrl+Shift+g'
+        button_thread_settings.setToolTip(
+            compose_tooltip(
+                'Edit the priority and the CPU affinity of the acquisition '
+                'and display threads', shortcut_key
+            )
+        )
+        button_thread_settings.setShortcut(shortcut_key)
+        button_thread_settings.toggle()
+        observers.append(button_thread_settings)
 
         #
         self._widget_about = About(self)
@@ -375,35 +925,75 @@ class Harvester(QMainWindow):
         button_select_file.add_observer(button_start_image_acquisition)
         button_select_file.add_observer(button_toggle_drawing)
         button_select_file.add_observer(button_stop_image_acquisition)
+        button_select_file.add_observer(button_record)
+        button_select_file.add_observer(button_snapshot)
+        button_select_file.add_observer(button_arm_ring)
+        button_select_file.add_observer(button_save_ring)
+        button_select_file.add_observer(button_log_metadata)
+        button_select_file.add_observer(button_select_roi)
+        button_select_file.add_observer(button_restore_full_frame)
+        button_select_file.add_observer(button_toggle_preview)
+        button_select_file.add_observer(button_white_balance)
         button_select_file.add_observer(self._widget_device_list)
 
         #
         button_update.add_observer(self._widget_device_list)
         button_update.add_observer(button_connect)
 
+        #
+        button_open_recording.add_observer(button_connect)
+        button_open_recording.add_observer(button_select_file)
+        button_open_recording.add_observer(button_snapshot)
+
         #
         button_connect.add_observer(button_select_file)
+        button_connect.add_observer(button_open_recording)
         button_connect.add_observer(button_update)
         button_connect.add_observer(button_disconnect)
         button_connect.add_observer(button_dev_attribute)
         button_connect.add_observer(button_start_image_acquisition)
         button_connect.add_observer(button_toggle_drawing)
         button_connect.add_observer(button_stop_image_acquisition)
+        button_connect.add_observer(button_record)
+        button_connect.add_observer(button_snapshot)
+        button_connect.add_observer(button_arm_ring)
+        button_connect.add_observer(button_save_ring)
+        button_connect.add_observer(button_log_metadata)
+        button_connect.add_observer(button_select_roi)
+        button_connect.add_observer(button_restore_full_frame)
+        button_connect.add_observer(button_toggle_preview)
+        button_connect.add_observer(button_white_balance)
         button_connect.add_observer(self._widget_device_list)
 
         #
         button_disconnect.add_observer(button_select_file)
+        button_disconnect.add_observer(button_open_recording)
         button_disconnect.add_observer(button_update)
         button_disconnect.add_observer(button_connect)
         button_disconnect.add_observer(button_dev_attribute)
         button_disconnect.add_observer(button_start_image_acquisition)
         button_disconnect.add_observer(button_toggle_drawing)
         button_disconnect.add_observer(button_stop_image_acquisition)
+        button_disconnect.add_observer(button_record)
+        button_disconnect.add_observer(button_snapshot)
+        button_disconnect.add_observer(button_arm_ring)
+        button_disconnect.add_observer(button_save_ring)
+        button_disconnect.add_observer(button_log_metadata)
+        button_disconnect.add_observer(button_select_roi)
+        button_disconnect.add_observer(button_restore_full_frame)
+        button_disconnect.add_observer(button_toggle_preview)
+        button_disconnect.add_observer(button_white_balance)
         button_disconnect.add_observer(self._widget_device_list)
 
         #
         button_start_image_acquisition.add_observer(button_toggle_drawing)
         button_start_image_acquisition.add_observer(button_stop_image_acquisition)
+        button_start_image_acquisition.add_observer(button_record)
+        button_start_image_acquisition.add_observer(button_snapshot)
+        button_start_image_acquisition.add_observer(button_arm_ring)
+        button_start_image_acquisition.add_observer(button_save_ring)
+        button_start_image_acquisition.add_observer(button_log_metadata)
+        button_start_image_acquisition.add_observer(button_white_balance)
 
         #
         button_toggle_drawing.add_observer(button_start_image_acquisition)
@@ -412,12 +1002,24 @@ class Harvester(QMainWindow):
         #
         button_stop_image_acquisition.add_observer(button_start_image_acquisition)
         button_stop_image_acquisition.add_observer(button_toggle_drawing)
+        button_stop_image_acquisition.add_observer(button_record)
+        button_stop_image_acquisition.add_observer(button_snapshot)
+        button_stop_image_acquisition.add_observer(button_arm_ring)
+        button_stop_image_acquisition.add_observer(button_save_ring)
+        button_stop_image_acquisition.add_observer(button_log_metadata)
+        button_stop_image_acquisition.add_observer(button_white_balance)
+
+        #
+        button_toggle_preview.add_observer(button_select_roi)
+        button_toggle_preview.add_observer(button_restore_full_frame)
 
         # Add buttons to groups:
 
         #
         group_gentl_info.addAction(button_select_file)
         group_gentl_info.addAction(button_update)
+        group_gentl_info.addAction(button_open_recording)
+        group_gentl_info.addAction(button_export)
 
         #
         group_connection.addAction(button_connect)
@@ -427,9 +1029,18 @@ class Harvester(QMainWindow):
         group_device.addAction(button_start_image_acquisition)
         group_device.addAction(button_toggle_drawing)
         group_device.addAction(button_stop_image_acquisition)
+        group_device.addAction(button_record)
+        group_device.addAction(button_snapshot)
+        group_device.addAction(button_arm_ring)
+        group_device.addAction(button_save_ring)
+        group_device.addAction(button_log_metadata)
         group_device.addAction(button_dev_attribute)
+        group_device.addAction(button_select_roi)
+        group_device.addAction(button_restore_full_frame)
+        group_device.addAction(button_toggle_preview)
 
         #
+        group_help.addAction(button_thread_settings)
         group_help.addAction(button_about)
 
         # Connect handler functions:
@@ -455,6 +1066,10 @@ class Harvester(QMainWindow):
     def on_button_clicked_action(action):
         action.execute()
 
+    @property
+    def action_start_image_acquisition(self):
+        return self._action_start_image_acquisition
+
     @property
     def action_stop_image_acquisition(self):
         return self._action_stop_image_acquisition
@@ -468,16 +1083,40 @@ class Harvester(QMainWindow):
         self._ia = value
 
     def action_on_connect(self):
-        #
-        config = ParameterSet({
-            ParameterKey.THREAD_FACTORY_METHOD: lambda: _PyQtThread(
-                parent=self, mutex=self._mutex),
-        })
+        # The workers block while they wait for a buffer or an event so
+        # the threads call them again at once; a backoff would only hold
+        # back the buffers that come after a pause. Every thread gets a
+        # mutex of its own, which Harvester takes to hand over the buffers
+        # of the thread:
+        threads = []
+        self._acquisition_threads = threads
+
+        def create_thread():
+            thread = _PyQtThread(
+                parent=self, update_cycle_us=0,
+                settings=self._acquisition_settings
+            )
+            threads.append(thread)
+            return thread
+
+        parameters = {ParameterKey.THREAD_FACTORY_METHOD: create_thread}
+        key = getattr(
+            ParameterKey, 'THREAD_FACTORY_METHOD_FOR_EVENT_MODULE', None
+        )
+        if key is not None:
+            parameters[key] = create_thread
+        # Harvester waits 1 ms for an event by default, which wakes the
+        # thread up 1000 times a second while there's no buffer; an event
+        # ends the wait at once so a longer one only delays stopping the
+        # acquisition by up to that long:
+        parameters[ParameterKey.TIMEOUT_PERIOD_ON_UPDATE_EVENT_DATA_CALL] = 50
+        config = ParameterSet(parameters)
         try:
             self._ia = self.harvester_core.create(
                 self.device_list.currentIndex(), config=config)
-            # We want to hold one buffer to keep the chunk data alive:
-            self._ia.num_buffers += 1
+            # We want to hold one buffer to keep the chunk data alive and
+            # the dispatcher holds the latest one for the canvas:
+            self._ia.num_buffers += 2
         except (
             NotInitializedException, InvalidHandleException,
             InvalidIdException, ResourceInUseException,
@@ -502,18 +1141,76 @@ class Harvester(QMainWindow):
         except AttributeError:
             pass
 
+        # The statistics thread reads the image format from here rather
+        # than from the device:
+        self._feature_cache = FeatureCache(self.ia.remote_device.node_map)
+        self._temperature_cache = FeatureCache(
+            self.ia.remote_device.node_map, ['DeviceTemperature']
+        )
+        self._refresh_temperature()
+        self._timer_temperature.start()
+
+        # Let the canvas know the names of the custom pixel formats such as
+        # the polarized mosaics because GenTL only delivers their values:
+        try:
+            self.canvas.custom_data_formats = {
+                entry.value: entry.symbolic for entry in
+                self.ia.remote_device.node_map.PixelFormat.entries
+            }
+        except AttributeError:
+            pass
+
         #
-        self.canvas.ia = self.ia
+        self._dispatcher = Dispatcher(
+            self.ia, settings=self._acquisition_settings, logger=self._logger
+        )
+        self._dispatcher.add_sink(self._frame_loss.write)
+        self._dispatcher.add_sink(self._latency.write)
+        self.active_canvas.ia = self.image_source
+
+        # Harvester discards incomplete buffers before they're fetched:
+        try:
+            self.ia.add_callback(
+                self.ia.Events.INCOMPLETE_BUFFER,
+                IncompleteBufferCallback(self._frame_loss)
+            )
+        except AttributeError:
+            pass
 
     def is_enabled_on_connect(self):
         enable = False
         if self.cti_files:
             if self.harvester_core.device_info_list:
-                if self.ia is None:
+                if self.ia is None and self._playback is None:
                     enable = True
         return enable
 
     def action_on_disconnect(self):
+        self.canvas.cancel_selection()
+        if self.ia:
+            self.restore_full_resolution()
+        if self._recorder:
+            self._stop_recording()
+        if self._ring:
+            self._disarm_ring()
+        if self._metadata_table:
+            self._stop_logging_metadata()
+        if self._dispatcher:
+            self._dispatcher.stop()
+        self._latency.stop_latching()
+        self.active_canvas.release_buffers()
+        if self.canvas.decoder:
+            self.canvas.decoder.reset()
+        self.active_canvas.ia = None
+        self._dispatcher = None
+        if self._feature_cache:
+            self._feature_cache.destroy()
+            self._feature_cache = None
+        self._timer_temperature.stop()
+        if self._temperature_cache:
+            self._temperature_cache.destroy()
+            self._temperature_cache = None
+
         if self.attribute_controller:
             if self.attribute_controller.isVisible():
                 self.attribute_controller.close()
@@ -571,21 +1268,30 @@ class Harvester(QMainWindow):
         if self.ia.is_acquiring():
             # If it's pausing drawing images, just resume it and
             # immediately return this method.
-            if self.canvas.is_pausing():
-                self.canvas.resume_drawing()
+            if self.active_canvas.is_pausing():
+                self.active_canvas.resume_drawing()
         else:
             # Start statistics measurement:
             self.ia.statistics.reset()
+            self._frame_loss.reset()
+            self._latency.reset()
+            self._history.reset()
+            self._latency_sampled = 0
+            self._feature_cache.refresh()
+            for statistics in self.lock_statistics:
+                statistics.reset()
+            self._latency.start_latching(self.ia.remote_device.node_map)
             self._thread_statistics_measurement.start()
 
             self.ia.start()
+            self._dispatcher.start()
 
     def is_enabled_on_start_image_acquisition(self):
         enable = False
         if self.cti_files:
             if self.ia:
                 if not self.ia.is_acquiring() or \
-                        self.canvas.is_pausing():
+                        self.active_canvas.is_pausing():
                     enable = True
         return enable
 
@@ -593,16 +1299,34 @@ class Harvester(QMainWindow):
         # Stop statistics measurement:
         self._thread_statistics_measurement.stop()
 
+        # Stop feeding the recorder and stop fetching buffers; the
+        # dispatcher queues the buffer that it has kept for the canvas:
+        if self._recorder:
+            self._stop_recording()
+        if self._ring:
+            self._disarm_ring()
+        if self._metadata_table:
+            self._stop_logging_metadata()
+        self._dispatcher.stop()
+        self._latency.stop_latching()
+
         # Release the preserved buffers, which the we kept chunk data alive,
         # before stopping image acquisition. Otherwise the preserved buffers
         # will be dangling after stopping image acquisition:
-        self.canvas.release_buffers()
+        self.active_canvas.release_buffers()
+        if self.canvas.decoder:
+            # Don't let the last image of this run show up on the next:
+            self.canvas.decoder.reset()
 
         # Then we stop image acquisition:
         self.ia.stop()
 
+        # Tell how long the threads have waited for each other's locks:
+        for statistics in self.lock_statistics:
+            self._logger.info('lock contention: {0}'.format(statistics))
+
         # Initialize the drawing state:
-        self.canvas.pause_drawing(False)
+        self.active_canvas.pause_drawing(False)
 
     def is_enabled_on_stop_image_acquisition(self):
         enable = False
@@ -625,7 +1349,7 @@ class Harvester(QMainWindow):
         return enable
 
     def action_on_toggle_drawing(self):
-        self.canvas.toggle_drawing()
+        self.active_canvas.toggle_drawing()
 
     def is_enabled_on_toggle_drawing(self):
         enable = False
@@ -635,37 +1359,643 @@ class Harvester(QMainWindow):
                     enable = True
         return enable
 
-    def action_on_show_about(self):
-        self.about.setModal(False)
-        self.about.show()
+    def configure_device(self, names, method):
+        """
+        Calls method(node_map) to write the given features. If the device
+        does not accept them while it is streaming, image acquisition is
+        stopped before writing them and is restarted afterwards.
+        """
+        node_map = self.ia.remote_device.node_map
+        restart = False
+        if self.ia.is_acquiring() and not is_writable(node_map, names):
+            self.action_stop_image_acquisition.execute()
+            restart = True
+
+        result = None
+        try:
+            result = method(node_map)
+        except (
+            LogicalErrorException, RuntimeException, AccessException,
+            OutOfRangeException, InvalidArgumentException,
+        ) as e:
+            self._logger.error(e, exc_info=True)
+        finally:
+            # Starting image acquisition refreshes it anyway:
+            if restart:
+                self.action_start_image_acquisition.execute()
+            else:
+                self._feature_cache.refresh()
 
-    def _worker_update_statistics(self):
         #
-        if self.ia is None:
+        if self.attribute_controller:
+            self.attribute_controller.update_values()
+
+        return result
+
+    def _apply_roi(self, x, y, width, height):
+        # The selected rectangle is relative to the current ROI:
+        node_map = self.ia.remote_device.node_map
+        x += node_map.OffsetX.value
+        y += node_map.OffsetY.value
+        self.configure_device(
+            roi_feature_names,
+            lambda n: set_roi(n, x, y, width, height)
+        )
+        self._action_select_roi.update()
+
+    def _toggle_selection(self, handler):
+        if self.canvas.selection_handler == handler:
+            self.canvas.cancel_selection()
+        else:
+            self.canvas.begin_selection(handler)
+
+        # Only one of them can be waiting for a selection:
+        self._action_select_roi.update()
+        self._action_white_balance.update()
+
+    def action_on_select_roi(self):
+        self._toggle_selection(self._apply_roi)
+
+    def is_enabled_on_select_roi(self):
+        enable = False
+        if self.cti_files:
+            if self.ia:
+                try:
+                    node_map = self.ia.remote_device.node_map
+                except AttributeError:
+                    pass
+                else:
+                    if has_features(node_map, roi_feature_names) and \
+                            not self._preview.is_active() and \
+                            not self.is_point_cloud_visible():
+                        enable = True
+        return enable
+
+    def action_on_restore_full_frame(self):
+        self.configure_device(roi_feature_names, restore_full_frame)
+
+    def action_on_toggle_preview(self):
+        if self._preview.is_active():
+            self.restore_full_resolution()
+        else:
+            node_map = self.ia.remote_device.node_map
+            names = self._preview.get_feature_names(node_map)
+            factors = self.configure_device(
+                names + roi_feature_names, self._preview.enter
+            )
+            if factors:
+                # Stretch the image so that it keeps its size on the canvas:
+                self.canvas.display_scale = factors
+
+    def is_enabled_on_toggle_preview(self):
+        enable = False
+        if self.cti_files:
+            if self.ia:
+                try:
+                    node_map = self.ia.remote_device.node_map
+                except AttributeError:
+                    pass
+                else:
+                    if self._preview.get_feature_names(node_map):
+                        enable = True
+        return enable
+
+    def restore_full_resolution(self):
+        """
+        Restores the settings that the reduced resolution preview has
+        overwritten; call it before capturing images that must have the
+        full resolution.
+        """
+        if not self._preview.is_active():
             return
 
         #
-        message_config = 'W: {0} x H: {1}, {2}, '.format(
-            self.ia.remote_device.node_map.Width.value,
-            self.ia.remote_device.node_map.Height.value,
-            self.ia.remote_device.node_map.PixelFormat.value
-        )
+        node_map = self.ia.remote_device.node_map
+        names = self._preview.get_feature_names(node_map)
+        self.configure_device(names + roi_feature_names, self._preview.leave)
+        self.canvas.display_scale = (1., 1.)
+
         #
-        message_statistics = '{0:.1f} fps, elapsed {1}, {2} images'.format(
-            self.ia.statistics.fps,
-            str(datetime.timedelta(
-                seconds=int(self.ia.statistics.elapsed_time_s)
-            )),
-            self.ia.statistics.num_images
-        )
+        self._action_toggle_preview.update()
+        self._action_toggle_preview.update_observers()
+
+    def _measure_white_balance(self, x, y, width, height):
+        self._action_white_balance.update()
+
+        # Copy the region on the GUI thread because the buffer will be
+        # queued again; the copy is decimated so it's cheap:
+        content, data_format = self.canvas.get_latest_content()
+        if content is None:
+            return
+        sample = sample_region(content, data_format, x, y, width, height)
+        if sample is None:
+            return
+
         #
-        self._signal_update_statistics.emit(
-            message_config + message_statistics
+        future = self._thread_pool.submit(
+            unpinned(compute_white_balance), sample, data_format
         )
 
+        def emit(f):
+            try:
+                gains = f.result()
+            except Exception as e:  # We know it's too broad:
+                self._logger.error(e, exc_info=True)
+            else:
+                self._signal_update_white_balance.emit(gains)
 
-class ActionSelectFile(Action):
-    def __init__(
+        future.add_done_callback(emit)
+
+    def _update_white_balance(self, gains):
+        self.canvas.white_balance_gains = gains
+
+    def action_on_white_balance(self):
+        self._toggle_selection(self._measure_white_balance)
+
+    def is_enabled_on_white_balance(self):
+        enable = False
+        if self.cti_files:
+            if self.ia:
+                if self.ia.is_acquiring() and \
+                        not self.is_point_cloud_visible():
+                    enable = True
+        return enable
+
+    def action_on_highlight_clipping(self):
+        self.canvas.highlight_clipping = not self.canvas.highlight_clipping
+
+    def action_on_record(self):
+        if self._recorder:
+            self._stop_recording()
+            return
+
+        # The filter tells how the frames should be compressed:
+        filters = {'Recordings (*.hrv)': None}
+        for name in get_codec_names():
+            filters['Recordings compressed with {0} (*.hrv)'.format(name)] = \
+                name
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, 'Record to', datetime.datetime.now().strftime(
+                'recording_%Y%m%d_%H%M%S.hrv'
+            ), ';;'.join(filters.keys())
+        )
+        if not file_path:
+            return
+
+        # Record what the device can deliver rather than the preview:
+        self.restore_full_resolution()
+        if not self.ia.is_acquiring():
+            return
+
+        #
+        recorder = Recorder(
+            file_path, codec=filters.get(selected_filter),
+            custom_data_formats=self.canvas.custom_data_formats,
+            logger=self._logger
+        )
+        try:
+            recorder.start()
+        except OSError as e:
+            self._logger.error(e, exc_info=True)
+            return
+        self._recorder = recorder
+        self._dispatcher.add_sink(recorder.write)
+
+    def _stop_recording(self, wait=False):
+        recorder, self._recorder = self._recorder, None
+        self._dispatcher.remove_sink(recorder.write)
+
+        # The writer thread may have a lot to flush; it gets a thread of
+        # its own so that it does not hold up the jobs of the thread pool
+        # and the interpreter waits for it on exit:
+        if wait:
+            recorder.stop()
+        else:
+            threading.Thread(
+                target=unpinned(recorder.stop), name='Flush'
+            ).start()
+        self._action_record.update()
+
+    def is_enabled_on_record(self):
+        enable = False
+        if self.cti_files:
+            if self.ia:
+                if self.ia.is_acquiring():
+                    enable = True
+        return enable
+
+    def action_on_arm_ring(self):
+        if self._ring:
+            self._disarm_ring()
+            return
+
+        # The frames are saved here without asking when it's triggered:
+        directory = QFileDialog.getExistingDirectory(
+            self, 'Save the pre-trigger frames to',
+            self._ring_directory or ''
+        )
+        if not directory:
+            return
+        self._ring_directory = directory
+
+        #
+        self.restore_full_resolution()
+        if not self.ia.is_acquiring():
+            return
+        self._ring = PreTriggerRing(
+            custom_data_formats=self.canvas.custom_data_formats,
+            logger=self._logger
+        )
+        self._dispatcher.add_sink(self._ring.write)
+
+    def _disarm_ring(self):
+        # The frames that are being saved are saved anyway:
+        ring, self._ring = self._ring, None
+        self._dispatcher.remove_sink(ring.write)
+        self._action_arm_ring.update()
+        self._action_arm_ring.update_observers()
+
+    def is_enabled_on_arm_ring(self):
+        enable = False
+        if self.cti_files:
+            if self.ia:
+                if self.ia.is_acquiring():
+                    enable = True
+        return enable
+
+    def save_ring(self):
+        if not self._ring:
+            return
+        file_path = os.path.join(
+            self._ring_directory, datetime.datetime.now().strftime(
+                'pre_trigger_%Y%m%d_%H%M%S_%f.hrv'
+            )
+        )
+        if not self._ring.trigger(file_path):
+            self._logger.warning(
+                'The previous pre-trigger frames are still being saved.'
+            )
+
+    def is_enabled_on_save_ring(self):
+        return True if self._ring else False
+
+    def action_on_log_metadata(self):
+        if self._metadata_table:
+            self._stop_logging_metadata()
+            return
+
+        #
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, 'Log metadata to', datetime.datetime.now().strftime(
+                'metadata_%Y%m%d_%H%M%S.csv'
+            ), 'CSV (*.csv);;NumPy (*.npz)'
+        )
+        if not file_path:
+            return
+        if not self.ia.is_acquiring():
+            return
+
+        # The chunk values are read from the node map right after the
+        # image acquirer has updated it for each buffer:
+        try:
+            self._metadata_table = MetadataTable(
+                file_path, node_map=self.ia.remote_device.node_map,
+                logger=self._logger
+            )
+        except (OSError, ValueError) as e:
+            self._logger.error(e, exc_info=True)
+            return
+        self._dispatcher.add_sink(self._metadata_table.write)
+
+    def _stop_logging_metadata(self, wait=False):
+        table, self._metadata_table = self._metadata_table, None
+        if self._dispatcher:
+            self._dispatcher.remove_sink(table.write)
+        if wait:
+            table.close()
+        else:
+            threading.Thread(
+                target=unpinned(table.close), name='Flush'
+            ).start()
+        self._action_log_metadata.update()
+
+    def is_enabled_on_log_metadata(self):
+        enable = False
+        if self.cti_files:
+            if self.ia:
+                if self.ia.is_acquiring():
+                    enable = True
+        return enable
+
+    def action_on_snapshot(self):
+        # A binned or decimated preview is not what the device can
+        # deliver; take the first frame at the full resolution instead:
+        if self.ia and not self._playback and self._preview.is_active():
+            content, _ = self.active_canvas.get_latest_content()
+            self.restore_full_resolution()
+            self._take_full_resolution_snapshot(
+                np.shape(content) if content is not None else None,
+                time.perf_counter() + 2.
+            )
+            return
+        self._take_snapshot()
+
+    def _take_full_resolution_snapshot(self, preview_shape, deadline):
+        content, _ = self.active_canvas.get_latest_content()
+        if content is not None and np.shape(content) != preview_shape:
+            self._take_snapshot()
+        elif time.perf_counter() > deadline:
+            self._logger.warning(
+                'No frame at the full resolution has arrived; the snapshot '
+                'has not been taken.'
+            )
+        else:
+            QTimer.singleShot(50, lambda: self._take_full_resolution_snapshot(
+                preview_shape, deadline
+            ))
+
+    def _take_snapshot(self):
+        # Copy the image once while the canvas still holds the buffer; the
+        # copy keeps the full bit depth of the image:
+        content, data_format = self.active_canvas.get_latest_content()
+        if content is None:
+            return
+        image = np.array(content)
+        significant_bits = get_significant_bits(data_format) \
+            if data_format else None
+
+        #
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, 'Save the snapshot', datetime.datetime.now().strftime(
+                'snapshot_%Y%m%d_%H%M%S.tiff'
+            ), 'TIFF files (*.tif *.tiff);;PNG files (*.png)'
+        )
+        if not file_path:
+            return
+
+        # Encoding a large image takes seconds:
+        future = self._thread_pool.submit(
+            unpinned(save_image), file_path, image, significant_bits
+        )
+        future.add_done_callback(self._report_snapshot)
+
+    def _report_snapshot(self, future):
+        try:
+            future.result()
+        except Exception as e:
+            # Nobody else is going to see it:
+            self._logger.error(e, exc_info=True)
+
+    def is_enabled_on_snapshot(self):
+        enable = False
+        if self._playback:
+            enable = True
+        elif self.cti_files:
+            if self.ia:
+                if self.ia.is_acquiring():
+                    enable = True
+        return enable
+
+    def action_on_open_recording(self):
+        if self._playback:
+            self._close_recording()
+            return
+
+        #
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, 'Open a recording', '', 'Recordings (*.hrv)'
+        )
+        if not file_path:
+            return
+        try:
+            recording = Recording(file_path)
+        except (OSError, ValueError) as e:
+            self._logger.error(e, exc_info=True)
+            return
+
+        # The custom pixel formats have been recorded with their names:
+        values, indices = np.unique(
+            recording.index['data_format_value'], return_index=True
+        )
+        self.canvas.custom_data_formats = {
+            int(v): recording.index['data_format'][i].decode()
+            for v, i in zip(values, indices) if is_custom(int(v))
+        }
+
+        #
+        self._playback = PlaybackAcquirer(recording)
+        self.active_canvas.ia = self._playback
+        self._widget_playback.set_acquirer(self._playback)
+        self._widget_playback.show()
+        self._playback.start()
+
+    def _close_recording(self):
+        playback, self._playback = self._playback, None
+        self._widget_playback.set_acquirer(None)
+        self._widget_playback.hide()
+        self.active_canvas.release_buffers()
+        self.active_canvas.ia = None
+        playback.destroy()
+
+    def is_enabled_on_open_recording(self):
+        enable = False
+        if self.ia is None:
+            enable = True
+        return enable
+
+    def action_on_export_recording(self):
+        # Offer the recording that is being replayed:
+        if not self._widget_export:
+            self._widget_export = ExportDialog(self)
+        if self._playback:
+            self._widget_export.set_recording(
+                self._playback.recording.file_path
+            )
+        self._widget_export.show()
+
+    def action_on_toggle_point_cloud(self):
+        # Hand the image acquirer over to the other canvas; the buffers
+        # that the current one holds must be queued before it lets go:
+        previous = self.active_canvas
+        self.canvas.cancel_selection()
+        previous.release_buffers()
+        previous.ia = None
+        self._widget_canvases.setCurrentIndex(
+            0 if previous is self._widget_point_cloud else 1
+        )
+        self.active_canvas.pause_drawing(previous.is_pausing())
+        self.active_canvas.ia = self.image_source
+
+    def is_point_cloud_visible(self):
+        return self.active_canvas is self._widget_point_cloud
+
+    def action_on_show_latency(self):
+        self._widget_latency.setVisible(
+            not self._widget_latency.isVisible()
+        )
+
+    def action_on_show_dashboard(self):
+        self._widget_dashboard.setVisible(
+            not self._widget_dashboard.isVisible()
+        )
+
+    def _update_latency_monitor(self, visible=None):
+        # The canvases only measure the latency while a view shows it
+        # because measuring flushes the commands on every frame:
+        is_shown = self._widget_latency.isVisible() or \
+            self._widget_dashboard.isVisible()
+        monitor = self._latency if is_shown else None
+        self._widget_canvas.latency_monitor = monitor
+        self._widget_point_cloud.latency_monitor = monitor
+
+    def action_on_edit_thread_settings(self):
+        dialog = ThreadSettingsDialog(
+            self._acquisition_settings, self._display_settings, self
+        )
+        if dialog.exec_() != QDialog.Accepted:
+            return
+
+        # The acquisition threads take theirs when they start again:
+        self._apply_display_settings()
+
+    def _apply_display_settings(self):
+        # The GUI thread uploads and draws the images:
+        settings = self._display_settings
+        QThread.currentThread().setPriority(
+            QThread.NormalPriority if settings.priority is None
+            else settings.priority
+        )
+        set_cpu_affinity(settings.cpus, self._logger)
+
+    def action_on_show_about(self):
+        self.about.setModal(False)
+        self.about.show()
+
+    def _worker_update_statistics(self):
+        #
+        if self.ia is None:
+            return
+
+        # They're read from the device only once they have changed:
+        feature_cache = self._feature_cache
+        if feature_cache is None:
+            return
+        message_config = 'W: {0} x H: {1}, {2}, '.format(
+            feature_cache.get('Width'), feature_cache.get('Height'),
+            feature_cache.get('PixelFormat')
+        )
+        #
+        message_statistics = '{0:.1f} fps, elapsed {1}, {2} images'.format(
+            self.ia.statistics.fps,
+            str(datetime.timedelta(
+                seconds=int(self.ia.statistics.elapsed_time_s)
+            )),
+            self.ia.statistics.num_images
+        )
+        # Tell the frames that the transport layer has lost from the ones
+        # that the canvas has skipped:
+        loss_rate = self._frame_loss.sample_loss_rate()
+        loss = self._frame_loss.snapshot()
+        message_statistics += \
+            ', lost {0:.1f}/s, longest burst {1}, {2:.3%} dropped'.format(
+                loss_rate, loss.longest_burst, loss.drop_rate
+            )
+        if loss.num_resent:
+            message_statistics += ', {0} resent'.format(loss.num_resent)
+        dispatcher = self._dispatcher
+        if dispatcher:
+            message_statistics += ', {0} not displayed'.format(
+                dispatcher.num_skipped
+            )
+        #
+        message_recording = ''
+        recorder = self._recorder
+        if recorder:
+            message_recording = ', REC {0}/{1} queued, {2} dropped'.format(
+                recorder.queue_depth, recorder.num_slots,
+                recorder.num_dropped
+            )
+            if recorder.codec:
+                message_recording += \
+                    ', {0:.1f} MB/s, {1:.2f}:1 {2}, {3} raw'.format(
+                        recorder.throughput / 2 ** 20,
+                        recorder.compression_ratio, recorder.codec.name,
+                        recorder.num_uncompressed
+                    )
+        ring = self._ring
+        if ring:
+            message_recording += ', RING {0}/{1}{2}'.format(
+                ring.num_frames, ring.capacity,
+                ' saving' if ring.is_flushing() else ''
+            )
+        table = self._metadata_table
+        if table:
+            message_recording += ', META {0} rows, {1} dropped'.format(
+                table.num_written, table.num_dropped
+            )
+        #
+        self._signal_update_statistics.emit(
+            message_config + message_statistics + message_recording
+        )
+
+        # Keep the history at a lower rate so that it covers long runs:
+        if self._history.is_due():
+            self._sample_statistics()
+
+    def _refresh_temperature(self):
+        # It's read on the GUI thread once in a while:
+        if self._temperature_cache:
+            self._temperature_cache.refresh()
+
+    def _sample_statistics(self):
+        # Only the frames that have been displayed since the previous
+        # sample count:
+        num_latencies = self._latency.num_samples
+        latency_ms, = self._latency.get_percentiles(
+            q=(50.,), start=self._latency_sampled, stop=num_latencies
+        )
+        self._latency_sampled = num_latencies
+        loss = self._frame_loss.snapshot()
+        cache = self._temperature_cache
+        try:
+            temperature = float(cache.peek('DeviceTemperature'))
+        except (AttributeError, TypeError, ValueError):
+            temperature = np.nan
+        self._history.append(
+            fps=self.ia.statistics.fps, num_bytes=loss.num_bytes,
+            num_dropped=loss.num_missing, latency_ms=latency_ms,
+            temperature=temperature
+        )
+
+
+class ActionSelectFile(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled
+        )
+
+
+class ActionOpenRecording(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().playback else False
+        self.setChecked(checked)
+
+
+class ActionExportRecording(Action):
+    def __init__(
             self, icon=None, title=None, parent=None, action=None, is_enabled=None
     ):
         #
@@ -726,10 +2056,78 @@ class ActionToggleDrawing(Action):
 
     def _update(self):
         #
-        checked = True if self.parent().canvas.is_pausing() else False
+        checked = True if self.parent().active_canvas.is_pausing() else False
+        self.setChecked(checked)
+
+
+class ActionRecord(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().recorder else False
+        self.setChecked(checked)
+
+
+class ActionSnapshot(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled
+        )
+
+
+class ActionArmRing(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().ring else False
         self.setChecked(checked)
 
 
+class ActionLogMetadata(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().metadata_table else False
+        self.setChecked(checked)
+
+
+class ActionSaveRing(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled
+        )
+
+
 class ActionStopImageAcquisition(Action):
     def __init__(
             self, icon=None, title=None, parent=None, action=None, is_enabled=None
@@ -750,6 +2148,142 @@ class ActionShowAttributeController(Action):
         )
 
 
+class ActionSelectRoi(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        parent = self.parent()
+        checked = True if parent.canvas.selection_handler == \
+            parent._apply_roi else False
+        self.setChecked(checked)
+
+
+class ActionTogglePreview(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().preview.is_active() else False
+        self.setChecked(checked)
+
+
+class ActionWhiteBalance(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        parent = self.parent()
+        checked = True if parent.canvas.selection_handler == \
+            parent._measure_white_balance else False
+        self.setChecked(checked)
+
+
+class ActionHighlightClipping(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().canvas.highlight_clipping else False
+        self.setChecked(checked)
+
+
+class ActionTogglePointCloud(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().is_point_cloud_visible() else False
+        self.setChecked(checked)
+
+
+class ActionRestoreFullFrame(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled
+        )
+
+
+class ActionShowLatency(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().latency_view.isVisible() else False
+        self.setChecked(checked)
+
+
+class ActionShowDashboard(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled,
+            checkable=True
+        )
+
+    def _update(self):
+        #
+        checked = True if self.parent().dashboard.isVisible() else False
+        self.setChecked(checked)
+
+
+class ActionEditThreadSettings(Action):
+    def __init__(
+            self, icon=None, title=None, parent=None, action=None, is_enabled=None
+    ):
+        #
+        super().__init__(
+            icon=icon, title=title, parent=parent, action=action, is_enabled=is_enabled
+        )
+
+
 class ActionShowAbout(Action):
     def __init__(
             self, icon=None, title=None, parent=None, action=None, is_enabled=None